@@ -0,0 +1,214 @@
+from backend.app import db
+from backend.cache import MemoryCache
+from backend.models.daily_summary import DailySummary
+from backend.models.progress import ProgressEntry
+from backend.versions import current_versions
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import select
+import numpy as np
+
+ROLLING_WINDOWS = (7, 30)
+DEFAULT_RANGE_DAYS = 90
+MAX_RANGE_DAYS = 3660
+PERIODS = ('week', 'month')
+SOURCE_RESOURCES = ('workouts', 'nutrition', 'progress')
+
+# DailySummary column -> response field
+DAILY_COLUMNS = {
+    'calories_consumed': 'caloriesConsumed',
+    'calories_burned': 'caloriesBurned',
+    'workout_count': 'workouts',
+    'steps': 'steps',
+    'active_minutes': 'activeMinutes',
+}
+
+_results = MemoryCache(max_size=1000)
+
+class AnalyticsError(ValueError):
+    pass
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise AnalyticsError(f"Invalid '{name}' date, expected YYYY-MM-DD")
+
+def parse_range(args, today=None):
+    """(start, end) from the `from` / `to` query arguments; the last 90 days by default."""
+    end = _parse_date(args['to'], 'to') if args.get('to') else (today or date.today())
+    start = _parse_date(args['from'], 'from') if args.get('from') else end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise AnalyticsError("'from' must not be after 'to'")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise AnalyticsError(f'Ranges are limited to {MAX_RANGE_DAYS} days')
+    return start, end
+
+def _day_index(dates, base):
+    return np.fromiter((day.toordinal() - base for day in dates), dtype=np.int64, count=len(dates))
+
+def load_daily_arrays(user_id, first, last):
+    """One float array per DAILY_COLUMNS field plus 'weight' (NaN on days without a weigh-in), first..last inclusive.
+
+    Reads plain columns from daily_summary and progress_entries; days without
+    a summary row are zero.
+    """
+    days = (last - first).days + 1
+    base = first.toordinal()
+    arrays = {field: np.zeros(days) for field in DAILY_COLUMNS.values()}
+
+    columns = [getattr(DailySummary, name) for name in DAILY_COLUMNS]
+    rows = db.session.execute(
+        select(DailySummary.date, *columns).where(
+            DailySummary.user_id == user_id, DailySummary.date >= first, DailySummary.date <= last
+        )
+    ).all()
+    if rows:
+        dates, *values = zip(*rows)
+        index = _day_index(dates, base)
+        for field, column in zip(DAILY_COLUMNS.values(), values):
+            arrays[field][index] = np.asarray(column, dtype=float)
+
+    weights = db.session.execute(
+        select(ProgressEntry.date, ProgressEntry.weight).where(
+            ProgressEntry.user_id == user_id, ProgressEntry.date >= first, ProgressEntry.date <= last,
+            ProgressEntry.weight.isnot(None)
+        )
+    ).all()
+    arrays['weight'] = np.full(days, np.nan)
+    if weights:
+        dates, values = zip(*weights)
+        index = _day_index(dates, base)
+        totals = np.bincount(index, weights=np.asarray(values, dtype=float), minlength=days)
+        counts = np.bincount(index, minlength=days)
+        measured = counts > 0
+        arrays['weight'][measured] = totals[measured] / counts[measured]
+    return arrays
+
+def rolling_mean(values, window):
+    """Trailing `window`-day mean ending on each day; NaNs are skipped, all-NaN windows stay NaN."""
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = window_sums / window_counts
+    return np.concatenate((np.full(window - 1, np.nan), np.where(window_counts > 0, means, np.nan)))
+
+def _bucket_keys(start, end, period):
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    if period == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    # 1970-01-01 was a Thursday, so +3 makes weeks start on Monday
+    offsets = days.astype(np.int64)
+    return days - ((offsets + 3) % 7)
+
+def buckets(arrays, start, end, period):
+    keys, inverse = np.unique(_bucket_keys(start, end, period), return_inverse=True)
+    totals = {field: np.bincount(inverse, weights=arrays[field], minlength=len(keys)) for field in DAILY_COLUMNS.values()}
+    days = np.bincount(inverse, minlength=len(keys))
+
+    weight = arrays['weight']
+    measured = ~np.isnan(weight)
+    weight_sums = np.bincount(inverse, weights=np.where(measured, weight, 0.0), minlength=len(keys))
+    weight_counts = np.bincount(inverse, weights=measured.astype(float), minlength=len(keys))
+
+    balance = totals['caloriesConsumed'] - totals['caloriesBurned']
+    result = []
+    for i, key in enumerate(keys):
+        result.append({
+            'start': str(key),
+            'days': int(days[i]),
+            **{field: _number(totals[field][i]) for field in DAILY_COLUMNS.values()},
+            'calorieBalance': _number(balance[i]),
+            'averageDailyBalance': _number(balance[i] / days[i]),
+            'averageWeight': _number(weight_sums[i] / weight_counts[i]) if weight_counts[i] else None,
+        })
+    return result
+
+def weight_trend(weight, start):
+    """Least-squares line through the daily weights."""
+    measured = ~np.isnan(weight)
+    points = int(measured.sum())
+    if points < 2:
+        return {'points': points, 'slopePerDay': None, 'slopePerWeek': None, 'start': None, 'end': None}
+    x = np.flatnonzero(measured).astype(float)
+    slope, intercept = np.polyfit(x, weight[measured], 1)
+    last = len(weight) - 1
+    return {
+        'points': points,
+        'slopePerDay': _number(slope, 4),
+        'slopePerWeek': _number(slope * 7, 3),
+        'start': {'date': start.isoformat(), 'weight': _number(intercept)},
+        'end': {'date': (start + timedelta(days=last)).isoformat(), 'weight': _number(intercept + slope * last)},
+    }
+
+def calorie_balance(arrays):
+    consumed = arrays['caloriesConsumed']
+    burned = arrays['caloriesBurned']
+    logged = (consumed > 0) | (burned > 0)
+    balance = consumed - burned
+    return {
+        'consumed': _number(consumed.sum()),
+        'burned': _number(burned.sum()),
+        'balance': _number(balance.sum()),
+        'averageDailyBalance': _number(balance.mean()),
+        'loggedDays': int(logged.sum()),
+        'averageLoggedDayBalance': _number(balance[logged].mean()) if logged.any() else None,
+    }
+
+def trends(arrays, offset, start, end):
+    """Daily rows for start..end; `arrays` begin `offset` days earlier so the rolling windows are full."""
+    rolling = {}
+    for field in ('caloriesConsumed', 'caloriesBurned', 'steps', 'weight'):
+        for window in ROLLING_WINDOWS:
+            rolling[f'{field}Avg{window}'] = rolling_mean(arrays[field], window)[offset:]
+    balance = arrays['caloriesConsumed'] - arrays['caloriesBurned']
+    for window in ROLLING_WINDOWS:
+        rolling[f'calorieBalanceAvg{window}'] = rolling_mean(balance, window)[offset:]
+
+    series = {field: values[offset:] for field, values in arrays.items()}
+    series['calorieBalance'] = balance[offset:]
+    series.update(rolling)
+    columns = {field: _numbers(values) for field, values in series.items()}
+
+    result = []
+    day = start
+    for i in range((end - start).days + 1):
+        result.append({'date': day.isoformat(), **{field: values[i] for field, values in columns.items()}})
+        day += timedelta(days=1)
+    return result
+
+def compute_analytics(user_id, start, end):
+    """Every analytics section for start..end, memoized until the user's entries change."""
+    versions, _ = current_versions(user_id, SOURCE_RESOURCES)
+    key = (user_id, start, end, tuple(versions[resource] for resource in SOURCE_RESOURCES))
+    cached = _results.get(key)
+    if cached is not None:
+        return cached
+
+    lookback = max(ROLLING_WINDOWS) - 1
+    arrays = load_daily_arrays(user_id, start - timedelta(days=lookback), end)
+    in_range = {field: values[lookback:] for field, values in arrays.items()}
+    result = {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'trends': trends(arrays, lookback, start, end),
+        'buckets': {period: buckets(in_range, start, end, period) for period in PERIODS},
+        'weightTrend': weight_trend(in_range['weight'], start),
+        'calorieBalance': calorie_balance(in_range),
+    }
+    _results.set(key, result, current_app.config.get('ANALYTICS_CACHE_TTL', 300))
+    return result
+
+def clear_cache():
+    _results.clear()
+
+def _number(value, digits=2):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+def _numbers(values, digits=2):
+    rounded = np.round(values.astype(float), digits)
+    return [None if value != value else value for value in rounded.tolist()]
@@ -3,23 +3,89 @@ from flask_cors import CORS
 from datetime import timedelta
 import os
 
-from backend.extensions import db, jwt
+from backend.extensions import db, jwt, dashboard_cache, user_cache
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
 
     # Keep your original config
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'fitness-tracker-secret-key-change-in-production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///fitness_tracker.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # SQLite connection pragmas and server database pool settings (see backend/database.py)
+    app.config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+    app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', -64000))
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 10))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'yes')
+    # Comma-separated read replica URLs (see backend/replicas.py)
+    app.config['DATABASE_REPLICA_URLS'] = [url for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url]
+    app.config['REPLICA_READ_YOUR_WRITES'] = float(os.getenv('REPLICA_READ_YOUR_WRITES', 5))
+    app.config['REPLICA_SIMULATED_LAG'] = float(os.getenv('REPLICA_SIMULATED_LAG', 0))
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-string-change-in-production')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
     app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
+    app.config['DASHBOARD_CACHE_TTL'] = int(os.getenv('DASHBOARD_CACHE_TTL', 60))
+    app.config['DASHBOARD_CACHE_SIZE'] = int(os.getenv('DASHBOARD_CACHE_SIZE', 10000))
+    app.config['DASHBOARD_CACHE_BACKEND'] = os.getenv('DASHBOARD_CACHE_BACKEND')
+    app.config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', 30))
+    app.config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', 10000))
+    # Adds the user's name and email to access tokens (see backend/identity.py)
+    app.config['JWT_EMBED_USER_CLAIMS'] = os.getenv('JWT_EMBED_USER_CLAIMS', '0').lower() in ('1', 'true', 'yes')
+    # 'auto' uses orjson when it is installed
+    app.config['JSON_PROVIDER'] = os.getenv('JSON_PROVIDER', 'auto')
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+    app.config['METRICS_SLOW_QUERY_MS'] = float(os.getenv('METRICS_SLOW_QUERY_MS', 200))
+    app.config['METRICS_N_PLUS_ONE_THRESHOLD'] = int(os.getenv('METRICS_N_PLUS_ONE_THRESHOLD', 10))
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
+    app.config['PROFILER_ENABLED'] = os.getenv('PROFILER_ENABLED', '0').lower() in ('1', 'true', 'yes')
+    app.config['PROFILER_INTERVAL_MS'] = float(os.getenv('PROFILER_INTERVAL_MS', 5))
+    app.config['PROFILER_COOLDOWN'] = int(os.getenv('PROFILER_COOLDOWN', 60))
+    app.config['PROFILER_MAX_SECONDS'] = int(os.getenv('PROFILER_MAX_SECONDS', 30))
+    # Background jobs (see backend/jobs.py); 0 workers leaves them to `flask run-jobs`
+    app.config['JOBS_WORKERS'] = int(os.getenv('JOBS_WORKERS', 2))
+    app.config['JOBS_MODE'] = os.getenv('JOBS_MODE', 'thread')
+    app.config['JOBS_POLL_INTERVAL'] = float(os.getenv('JOBS_POLL_INTERVAL', 1.0))
+    app.config['JOBS_RETRY_DELAY'] = float(os.getenv('JOBS_RETRY_DELAY', 5))
+    app.config['JOBS_LEASE_SECONDS'] = int(os.getenv('JOBS_LEASE_SECONDS', 300))
+    app.config['JOBS_SHUTDOWN_TIMEOUT'] = float(os.getenv('JOBS_SHUTDOWN_TIMEOUT', 30))
+    if os.getenv('JOBS_RESULT_DIR'):
+        app.config['JOBS_RESULT_DIR'] = os.getenv('JOBS_RESULT_DIR')
+    # Coalesce concurrent single-entry inserts into shared transactions (see backend/group_commit.py)
+    app.config['GROUP_COMMIT_ENABLED'] = os.getenv('GROUP_COMMIT_ENABLED', '0').lower() in ('1', 'true', 'yes')
+    app.config['GROUP_COMMIT_WINDOW_MS'] = float(os.getenv('GROUP_COMMIT_WINDOW_MS', 2))
+    app.config['GROUP_COMMIT_MAX_BATCH'] = int(os.getenv('GROUP_COMMIT_MAX_BATCH', 64))
+    app.config['GROUP_COMMIT_TIMEOUT'] = float(os.getenv('GROUP_COMMIT_TIMEOUT', 10))
+    app.config['ANALYTICS_CACHE_TTL'] = int(os.getenv('ANALYTICS_CACHE_TTL', 300))
+    app.config['FOOD_SEARCH_REFRESH_SECONDS'] = int(os.getenv('FOOD_SEARCH_REFRESH_SECONDS', 30))
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2')
+    app.config['PASSWORD_HASH_ROUNDS'] = int(os.getenv('PASSWORD_HASH_ROUNDS', 0)) or None
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+    app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+    # Schema setup and seeding normally run once via `flask init-db`; this is for local development
+    app.config['AUTO_INIT_DB'] = os.getenv('AUTO_INIT_DB', '0').lower() in ('1', 'true', 'yes')
+
+    if config:
+        app.config.update(config)
+
+    from backend.json_provider import init_json
+    init_json(app)
 
     # Initialize extensions
-    db.init_app(app)
+    from backend.replicas import replica_router
+    from backend.database import configure_engine
+    replica_router.init_app(app)
+    configure_engine(app, db)
     jwt.init_app(app)
-    CORS(app)
+    dashboard_cache.init_app(app)
+    user_cache.init_app(app)
+    CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag', 'Last-Modified', 'Location'])
 
     # Register blueprints (keep all your original ones)
     from backend.routes.auth import auth_bp
@@ -29,6 +95,10 @@ def create_app():
     from backend.routes.goals import goals_bp
     from backend.routes.progress import progress_bp
     from backend.routes.dashboard import dashboard_bp
+    from backend.routes.analytics import analytics_bp
+    from backend.routes.jobs import jobs_bp
+    from backend.routes.sync import sync_bp
+    from backend.routes.admin import admin_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(user_bp, url_prefix='/api/user')
@@ -37,16 +107,45 @@ def create_app():
     app.register_blueprint(goals_bp, url_prefix='/api/goals')
     app.register_blueprint(progress_bp, url_prefix='/api/progress')
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+
+    # Registered before compression so its after_request hook runs last and times it too
+    from backend.instrumentation import instrumentation
+    instrumentation.init_app(app)
+
+    from backend.compression import compressor
+    compressor.init_app(app)
+
+    from backend.profiler import profiler
+    profiler.init_app(app)
+
+    from backend.food_search import food_index
+    food_index.init_app(app)
+
+    from backend.passwords import password_hasher
+    password_hasher.init_app(app)
+
+    from backend.jobs import job_queue
+    job_queue.init_app(app)
+
+    from backend.group_commit import group_committer
+    group_committer.init_app(app)
+
+    from backend.commands import register_commands
+    register_commands(app)
 
-    # Create tables & seed your original data
-    with app.app_context():
-        db.create_all()
-        from backend.seed_data import seed_sample_data
-        seed_sample_data()
+    if app.config['AUTO_INIT_DB']:
+        from backend.migrations import init_database
+        with app.app_context():
+            init_database()
 
     return app
 
 if __name__ == '__main__':
+    os.environ.setdefault('AUTO_INIT_DB', '1')
     app = create_app()
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
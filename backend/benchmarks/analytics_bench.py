@@ -0,0 +1,52 @@
+"""Analytics latency over multi-year ranges, computed versus memoized.
+
+    python -m backend.benchmarks.analytics_bench --years 5 --entries 20000
+
+"cold" clears the range memo before every request so each one reads the
+daily columns and recomputes every section; "memoized" repeats the same range.
+"""
+import argparse
+from datetime import date, timedelta
+
+from backend.benchmarks.common import make_app, create_user, seed_history, measure, summarize
+
+def run(years, entries, repeat):
+    from backend.analytics import clear_cache
+
+    app = make_app()
+    client = app.test_client()
+    user_id, headers = create_user(app)
+    days = years * 365
+    seed_history(app, user_id, entries, days=days)
+
+    start = (date.today() - timedelta(days=days - 1)).isoformat()
+    url = f'/api/analytics?from={start}'
+
+    for name, clear in (('cold', True), ('memoized', False)):
+        def hit():
+            if clear:
+                clear_cache()
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        stats = summarize(measure(hit, repeat=repeat, warmup=2))
+        print(f'{name:>9}: {days} days  mean={stats["mean_ms"]:.2f}ms  '
+              f'p50={stats["p50_ms"]:.2f}ms  p95={stats["p95_ms"]:.2f}ms')
+
+    for path in ('/api/analytics/weight-trend', '/api/analytics/buckets?period=month'):
+        separator = '&' if '?' in path else '?'
+        def section():
+            clear_cache()
+            response = client.get(f'{path}{separator}from={start}', headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        stats = summarize(measure(section, repeat=repeat, warmup=2))
+        print(f'{path:>40}: cold mean={stats["mean_ms"]:.2f}ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--entries', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(args.years, args.entries, args.repeat)
@@ -0,0 +1,73 @@
+"""Login throughput versus latency of other endpoints under mixed load.
+
+    python -m backend.benchmarks.auth_bench --workers 0 2 4 --seconds 5
+
+Login threads hash passwords continuously while reader threads hit
+GET /api/user/profile; compare inline hashing (--workers 0) with the
+process pool.
+"""
+import argparse
+import os
+import threading
+import time
+
+from backend.benchmarks.common import make_app, create_user, summarize
+
+def run_once(workers, seconds, login_threads, reader_threads, rounds):
+    from backend.passwords import password_hasher
+
+    os.environ['PASSWORD_HASH_WORKERS'] = str(workers)
+    os.environ['PASSWORD_HASH_ROUNDS'] = str(rounds)
+    app = make_app()
+    client = app.test_client()
+    _, headers = create_user(app, email='reader@bench.local')
+    create_user(app, email='login@bench.local')  # create_user sets password 'benchmark'
+
+    stop = threading.Event()
+    logins = []
+    latencies = []
+    errors = []
+
+    def login():
+        while not stop.is_set():
+            response = client.post('/api/auth/login', json={'email': 'login@bench.local', 'password': 'benchmark'})
+            if response.status_code == 200:
+                logins.append(1)
+            elif response.status_code != 503:
+                errors.append(response.status_code)
+
+    def read():
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/user/profile', headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Start the pool before measuring
+    if workers:
+        password_hasher.verify('warmup', password_hasher.hash('warmup'))
+
+    threads = [threading.Thread(target=login) for _ in range(login_threads)]
+    threads += [threading.Thread(target=read) for _ in range(reader_threads)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    password_hasher.shutdown()
+
+    stats = summarize(latencies)
+    print(f'workers={workers}: {len(logins) / seconds:6.1f} logins/s   profile p50={stats["p50_ms"]:.2f}ms '
+          f'p99={stats["p99_ms"]:.2f}ms ({len(latencies) / seconds:.0f} req/s)'
+          + (f'  errors={errors[:5]}' if errors else ''))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--login-threads', type=int, default=8)
+    parser.add_argument('--reader-threads', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=200000, help='pbkdf2 iterations')
+    args = parser.parse_args()
+    for count in args.workers:
+        run_once(count, args.seconds, args.login_threads, args.reader_threads, args.rounds)
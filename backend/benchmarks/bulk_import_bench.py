@@ -0,0 +1,49 @@
+"""Bulk import throughput versus one POST per entry.
+
+    python -m backend.benchmarks.bulk_import_bench --entries 2000
+"""
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from backend.benchmarks.common import make_app, create_user
+
+def _workout(i):
+    return {
+        'exerciseName': 'Running', 'exerciseType': 'cardio', 'duration': 30,
+        'caloriesBurned': 250 + i % 50, 'date': (date.today() - timedelta(days=i % 365)).isoformat()
+    }
+
+def run(entries):
+    app = make_app()
+    client = app.test_client()
+    items = [_workout(i) for i in range(entries)]
+
+    _, headers = create_user(app)
+    start = time.perf_counter()
+    for item in items:
+        assert client.post('/api/workouts', json=item, headers=headers).status_code == 201
+    single = time.perf_counter() - start
+
+    _, headers = create_user(app)
+    start = time.perf_counter()
+    response = client.post('/api/workouts/bulk', json=items, headers=headers)
+    bulk_json = time.perf_counter() - start
+    assert response.json['created'] == entries, response.json
+
+    _, headers = create_user(app)
+    body = '\n'.join(json.dumps(item) for item in items)
+    start = time.perf_counter()
+    response = client.post('/api/workouts/bulk', data=body, headers={**headers, 'Content-Type': 'application/x-ndjson'})
+    bulk_ndjson = time.perf_counter() - start
+    assert response.json['created'] == entries, response.json
+
+    for label, elapsed in (('single POSTs', single), ('bulk JSON', bulk_json), ('bulk NDJSON', bulk_ndjson)):
+        print(f'{label:>13}: {elapsed:7.3f}s  {entries / elapsed:10.0f} entries/s')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.entries)
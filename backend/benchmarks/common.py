@@ -0,0 +1,109 @@
+import atexit
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+def make_app(db_path=None):
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix='fitness_bench_', suffix='.db')
+        os.close(fd)
+        atexit.register(_remove, db_path)
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from backend.app import create_app
+    from backend.migrations import upgrade
+
+    app = create_app()
+    with app.app_context():
+        upgrade()
+    return app
+
+def _remove(path):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def create_user(app, email=None):
+    from backend.app import db
+    from backend.models.user import User
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        user = User(email=email or f'{uuid.uuid4().hex}@bench.local', name='Bench User')
+        user.set_password('benchmark')
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=user.id)
+        return user.id, {'Authorization': f'Bearer {token}'}
+
+def seed_history(app, user_id, entries, days=None, seed=0):
+    """Insert `entries` workouts, nutrition and progress rows spread over `days` days."""
+    from backend.app import db
+    from backend.models.workout import Workout
+    from backend.models.nutrition import NutritionEntry
+    from backend.models.progress import ProgressEntry
+
+    rng = random.Random(seed)
+    days = days or max(min(entries, 5 * 365), 1)
+    today = date.today()
+    now = datetime.utcnow()
+
+    def day():
+        return today - timedelta(days=rng.randrange(days))
+
+    workouts = [{
+        'id': str(uuid.uuid4()), 'user_id': user_id, 'exercise_name': 'Running',
+        'exercise_type': 'cardio', 'sets': 1, 'reps': 1, 'duration': rng.randint(10, 90),
+        'calories_burned': rng.randint(50, 900), 'date': day(), 'notes': '', 'created_at': now
+    } for _ in range(entries)]
+    nutrition = [{
+        'id': str(uuid.uuid4()), 'user_id': user_id, 'food_name': 'Oats',
+        'calories': rng.randint(50, 900), 'protein': 10.0, 'carbs': 30.0, 'fats': 5.0,
+        'serving': 1.0, 'date': day(), 'meal_type': 'breakfast', 'created_at': now
+    } for _ in range(entries)]
+    progress = [{
+        'id': str(uuid.uuid4()), 'user_id': user_id, 'date': day(),
+        'weight': round(rng.uniform(60, 90), 1), 'steps': rng.randint(0, 20000),
+        'distance': round(rng.uniform(0, 15), 2), 'active_minutes': rng.randint(0, 120),
+        'notes': '', 'created_at': now
+    } for _ in range(entries)]
+
+    with app.app_context():
+        from backend.rollups import rebuild_daily_summaries
+        from backend.changes import mark_changed
+        for model, rows in ((Workout, workouts), (NutritionEntry, nutrition), (ProgressEntry, progress)):
+            if rows:
+                db.session.execute(model.__table__.insert(), rows)
+        for resource in ('workouts', 'nutrition', 'progress'):
+            mark_changed(user_id, resource)
+        db.session.commit()
+        rebuild_daily_summaries(user_id)
+
+def measure(fn, repeat=50, warmup=5):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(samples):
+    return {
+        'mean_ms': round(statistics.mean(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3)
+    }
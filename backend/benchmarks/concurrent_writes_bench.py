@@ -0,0 +1,82 @@
+"""Concurrent writers against SQLite with and without the tuned pragmas.
+
+    python -m backend.benchmarks.concurrent_writes_bench --writers 8 --readers 4 --seconds 5
+
+Writer threads POST workouts (each commit also updates the daily rollup)
+while reader threads page through GET /api/workouts. The 'legacy' profile
+reproduces the previous defaults: rollback journal, synchronous=FULL and the
+driver's 5s lock timeout.
+"""
+import argparse
+import os
+import threading
+import time
+
+from backend.benchmarks.common import make_app, create_user, seed_history, summarize
+
+PROFILES = {
+    'legacy': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+               'SQLITE_MMAP_SIZE': '0', 'SQLITE_CACHE_SIZE': '-2000'},
+    'tuned': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL',
+              'SQLITE_MMAP_SIZE': str(256 * 1024 * 1024), 'SQLITE_CACHE_SIZE': '-64000'},
+}
+
+def run_once(profile, seconds, writers, readers, history):
+    os.environ.update(PROFILES[profile])
+    app = make_app()
+    client = app.test_client()
+    accounts = [create_user(app) for _ in range(writers)]
+    for user_id, _ in accounts:
+        seed_history(app, user_id, history)
+
+    stop = threading.Event()
+    write_latencies = []
+    read_latencies = []
+    errors = []
+
+    def write(headers):
+        payload = {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 30,
+                   'caloriesBurned': 300, 'date': '2024-01-01'}
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.post('/api/workouts', json=payload, headers=headers)
+            if response.status_code == 201:
+                write_latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors.append(response.get_json().get('error', response.status_code))
+
+    def read(headers):
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.get('/api/workouts?limit=50', headers=headers)
+            if response.status_code == 200:
+                read_latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors.append(response.get_json().get('error', response.status_code))
+
+    threads = [threading.Thread(target=write, args=(headers,)) for _, headers in accounts]
+    threads += [threading.Thread(target=read, args=(accounts[i % writers][1],)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    writes = summarize(write_latencies or [0])
+    reads = summarize(read_latencies or [0])
+    print(f'{profile:>6}: {len(write_latencies) / seconds:7.1f} writes/s  p50={writes["p50_ms"]:.2f}ms '
+          f'p99={writes["p99_ms"]:.2f}ms | {len(read_latencies) / seconds:7.1f} reads/s  '
+          f'p99={reads["p99_ms"]:.2f}ms | errors={len(errors)}'
+          + (f' e.g. {errors[0]!r}' if errors else ''))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=['legacy', 'tuned'])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--history', type=int, default=1000, help='seeded entries per writer')
+    args = parser.parse_args()
+    for name in args.profiles:
+        run_once(name, args.seconds, args.writers, args.readers, args.history)
@@ -0,0 +1,41 @@
+"""Dashboard latency as history grows.
+
+    python -m backend.benchmarks.dashboard_bench --sizes 100 1000 10000 50000
+
+The stats cache is cleared before every request unless --cached is given.
+"""
+import argparse
+
+from backend.benchmarks.common import make_app, create_user, seed_history, measure, summarize
+
+def run(sizes, repeat, cached=False):
+    from backend.extensions import dashboard_cache
+
+    app = make_app()
+    client = app.test_client()
+    results = []
+
+    for size in sizes:
+        user_id, headers = create_user(app)
+        seed_history(app, user_id, size)
+
+        def hit():
+            if not cached:
+                dashboard_cache.clear()
+            response = client.get('/api/dashboard/stats', headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        stats = summarize(measure(hit, repeat=repeat))
+        results.append((size, stats))
+        print(f"{size:>8} entries/table  mean={stats['mean_ms']:.2f}ms  "
+              f"p50={stats['p50_ms']:.2f}ms  p95={stats['p95_ms']:.2f}ms")
+
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--cached', action='store_true', help='measure cache hits instead of recomputation')
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.cached)
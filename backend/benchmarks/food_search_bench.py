@@ -0,0 +1,65 @@
+"""Food search latency over a large synthetic food database.
+
+    python -m backend.benchmarks.food_search_bench --foods 100000
+"""
+import argparse
+import itertools
+import random
+import time
+
+from backend.benchmarks.common import make_app, measure, summarize
+
+ADJECTIVES = ['grilled', 'roasted', 'raw', 'baked', 'steamed', 'fried', 'smoked', 'organic', 'low fat',
+              'whole', 'frozen', 'canned', 'dried', 'fresh', 'spicy', 'sweet', 'salted', 'unsalted']
+BASES = ['chicken breast', 'brown rice', 'broccoli', 'salmon', 'avocado', 'quinoa', 'greek yogurt',
+         'spinach', 'sweet potato', 'almonds', 'banana', 'oats', 'eggs', 'tuna', 'cottage cheese',
+         'turkey', 'lentils', 'chickpeas', 'black beans', 'tofu', 'tempeh', 'cheddar', 'apple',
+         'blueberries', 'strawberries', 'pasta', 'bread', 'beef', 'pork loin', 'shrimp', 'cod']
+BRANDS = [f'brand{i}' for i in range(200)]
+
+QUERIES = ['chi', 'chicken', 'chicken br', 'chiken', 'brown ri', 'gr yog', 'yogrt', 'salmon smoked', 'x']
+
+def food_names(count, seed=0):
+    rng = random.Random(seed)
+    combos = itertools.product(BRANDS, ADJECTIVES, BASES)
+    names = [f'{brand} {adjective} {base}'.title() for brand, adjective, base in itertools.islice(combos, count)]
+    rng.shuffle(names)
+    return names
+
+def run(count, repeat):
+    from backend.app import db
+    from backend.models.nutrition import FoodDatabase
+    from backend.food_search import food_index
+
+    app = make_app()
+    with app.app_context():
+        rows = [{'name': name, 'calories': 100, 'protein': 10, 'carbs': 10, 'fats': 1} for name in food_names(count)]
+        db.session.execute(FoodDatabase.__table__.insert(), rows)
+        db.session.commit()
+
+        start = time.perf_counter()
+        food_index.rebuild(db.session)
+        print(f'index build for {count} foods: {(time.perf_counter() - start) * 1000:.0f}ms')
+
+    # Both paths run the same way: inside an app context, loading and serializing the returned rows
+    def timed(search):
+        def call():
+            with app.app_context():
+                return [food.to_dict() for food in search()]
+        return call
+
+    for query in QUERIES:
+        indexed = timed(lambda: food_index.search_foods(db.session, query))
+        scan = timed(lambda: FoodDatabase.query.filter(FoodDatabase.name.ilike(f'%{query}%')).limit(20).all())
+
+        fast, slow = summarize(measure(indexed, repeat=repeat)), summarize(measure(scan, repeat=repeat))
+        top = [food['name'] for food in indexed()[:2]]
+        print(f'{query!r:>16}  index p50={fast["p50_ms"]:7.2f}ms p95={fast["p95_ms"]:7.2f}ms  '
+              f'ilike p50={slow["p50_ms"]:7.2f}ms p95={slow["p95_ms"]:7.2f}ms  top={top}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--foods', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+    run(args.foods, args.repeat)
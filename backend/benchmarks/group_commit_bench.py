@@ -0,0 +1,80 @@
+"""Single-entry POST throughput with and without group commit.
+
+    python -m backend.benchmarks.group_commit_bench --writers 16 --windows 0 2 5 --synchronous FULL NORMAL
+
+Writer threads (one user each) POST workouts for --seconds. 'off' commits
+every request on its own; 'window=N' enables GROUP_COMMIT with an N ms
+window. The table shows inserts/s and the latency each request saw, so the
+throughput gain can be weighed against the added wait.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+
+from backend.benchmarks.common import make_app, create_user, summarize
+
+def run_once(synchronous, window, seconds, writers):
+    os.environ['SQLITE_SYNCHRONOUS'] = synchronous
+    os.environ['GROUP_COMMIT_ENABLED'] = '0' if window is None else '1'
+    os.environ['GROUP_COMMIT_WINDOW_MS'] = str(window or 0)
+    app = make_app()
+    client = app.test_client()
+    accounts = [create_user(app) for _ in range(writers)]
+
+    committer = app.extensions['group_commit']
+    before = committer.stats()
+    stop = threading.Event()
+    latencies = []
+    errors = []
+
+    def write(headers):
+        payload = {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 30,
+                   'caloriesBurned': 300, 'date': '2024-01-01'}
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.post('/api/workouts', json=payload, headers=headers)
+            if response.status_code == 201:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors.append(response.get_json().get('error', response.status_code))
+
+    threads = [threading.Thread(target=write, args=(headers,)) for _, headers in accounts]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    stats = summarize(latencies or [0])
+    after = committer.stats()
+    batches = after['batches'] - before['batches']
+    grouped = after['writes'] - before['writes']
+    with app.app_context():
+        from backend.app import db
+        from backend.models.workout import Workout
+        stored = db.session.query(Workout).count()
+    committer.shutdown()
+
+    label = 'off' if window is None else f'window={window}ms'
+    batch = f'  avg batch={grouped / batches:.1f}' if batches else ''
+    print(f'{synchronous:>6} {label:>12}: {len(latencies) / seconds:7.1f} inserts/s  p50={stats["p50_ms"]:.2f}ms  '
+          f'p99={stats["p99_ms"]:.2f}ms{batch}  errors={len(errors)}'
+          + (f' e.g. {errors[0]!r}' if errors else ''))
+    assert stored == len(latencies), f'{stored} rows stored for {len(latencies)} successful requests'
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--writers', type=int, default=16)
+    parser.add_argument('--windows', type=float, nargs='+', default=[0, 2, 5], help='group commit windows in ms')
+    parser.add_argument('--synchronous', nargs='+', default=['FULL', 'NORMAL'], help='SQLITE_SYNCHRONOUS values')
+    args = parser.parse_args()
+    # Lock waits under contention would otherwise flood the output with slow-query warnings
+    logging.getLogger('backend.sql').setLevel(logging.ERROR)
+    for synchronous in args.synchronous:
+        run_once(synchronous, None, args.seconds, args.writers)
+        for window in args.windows:
+            run_once(synchronous, window, args.seconds, args.writers)
@@ -0,0 +1,329 @@
+"""Mixed-workload load test across every API blueprint, with JSON baselines.
+
+    python -m backend.benchmarks.load_suite --sizes 10 1000 100000 --save-baseline baseline.json
+    python -m backend.benchmarks.load_suite --sizes 10 1000 100000 --baseline baseline.json
+
+For each history size (entries per table for every synthetic user) a fresh
+SQLite database is seeded and worker threads replay a weighted mix of auth,
+user, workout, nutrition, goal, progress, dashboard and sync requests through the
+app factory. Throughput and p50/p95/p99 latency are reported per operation.
+Each operation is also run once under assert_no_n_plus_one(). With
+--baseline, the run exits non-zero when an operation's p95 (or the overall
+throughput) is worse than the baseline by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+from backend.benchmarks.common import make_app, create_user, seed_history, summarize
+
+PASSWORD = 'benchmark'  # create_user's password
+
+class UserState:
+    def __init__(self, user_id, email, headers):
+        self.user_id = user_id
+        self.email = email
+        self.headers = headers
+        self.refresh_headers = None
+        self.workouts = []
+        self.nutrition = []
+        self.goals = []
+        self.etag = None
+        self.sync_token = ''
+
+def _day(rng):
+    return (date.today() - timedelta(days=rng.randrange(30))).isoformat()
+
+def _expect(response, *statuses):
+    if response.status_code not in statuses:
+        raise AssertionError(f'{response.request.method} {response.request.path} -> '
+                             f'{response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response
+
+def dashboard_stats(client, user, rng):
+    _expect(client.get('/api/dashboard/stats', headers=user.headers), 200)
+
+def list_workouts(client, user, rng):
+    response = _expect(client.get('/api/workouts?limit=50', headers=user.headers), 200)
+    user.etag = response.headers.get('ETag')
+
+def revalidate_workouts(client, user, rng):
+    headers = dict(user.headers)
+    if user.etag:
+        headers['If-None-Match'] = user.etag
+    _expect(client.get('/api/workouts?limit=50', headers=headers), 200, 304)
+
+def list_nutrition(client, user, rng):
+    _expect(client.get('/api/nutrition?limit=50', headers=user.headers), 200)
+
+def list_progress(client, user, rng):
+    _expect(client.get('/api/progress?limit=50', headers=user.headers), 200)
+
+def list_goals(client, user, rng):
+    _expect(client.get('/api/goals', headers=user.headers), 200)
+
+def sync_changes(client, user, rng):
+    response = _expect(client.get(f'/api/sync?since={user.sync_token}', headers=user.headers), 200)
+    user.sync_token = response.get_json()['token']
+
+def get_profile(client, user, rng):
+    _expect(client.get('/api/user/profile', headers=user.headers), 200)
+
+def update_profile(client, user, rng):
+    _expect(client.put('/api/user/profile', json={'weight': round(rng.uniform(60, 90), 1)}, headers=user.headers), 200)
+
+def search_foods(client, user, rng):
+    term = rng.choice(['chick', 'appl', 'rice', 'banan', 'oat', 'salmn', 'brocoli'])
+    _expect(client.get(f'/api/nutrition/foods?search={term}', headers=user.headers), 200)
+
+def create_workout(client, user, rng):
+    response = _expect(client.post('/api/workouts', json={
+        'exerciseName': 'Running', 'exerciseType': 'cardio', 'duration': rng.randint(10, 90),
+        'caloriesBurned': rng.randint(50, 900), 'date': _day(rng)
+    }, headers=user.headers), 201)
+    user.workouts.append(response.get_json()['id'])
+
+def update_workout(client, user, rng):
+    if not user.workouts:
+        return create_workout(client, user, rng)
+    workout_id = rng.choice(user.workouts)
+    _expect(client.put(f'/api/workouts/{workout_id}', json={'duration': rng.randint(10, 90)}, headers=user.headers), 200)
+
+def create_nutrition(client, user, rng):
+    response = _expect(client.post('/api/nutrition', json={
+        'foodName': 'Oats', 'calories': rng.randint(50, 900), 'protein': 10, 'carbs': 30, 'fats': 5,
+        'serving': 1, 'date': _day(rng), 'mealType': rng.choice(['breakfast', 'lunch', 'dinner', 'snack'])
+    }, headers=user.headers), 201)
+    user.nutrition.append(response.get_json()['id'])
+
+def delete_nutrition(client, user, rng):
+    if not user.nutrition:
+        return create_nutrition(client, user, rng)
+    entry_id = user.nutrition.pop(rng.randrange(len(user.nutrition)))
+    _expect(client.delete(f'/api/nutrition/{entry_id}', headers=user.headers), 200)
+
+def create_progress(client, user, rng):
+    _expect(client.post('/api/progress', json={
+        'date': _day(rng), 'weight': round(rng.uniform(60, 90), 1), 'steps': rng.randint(0, 20000),
+        'distance': round(rng.uniform(0, 15), 2), 'activeMinutes': rng.randint(0, 120)
+    }, headers=user.headers), 201)
+
+def create_goal(client, user, rng):
+    response = _expect(client.post('/api/goals', json={
+        'title': 'Run more', 'targetValue': 100, 'unit': 'km', 'category': 'cardio',
+        'targetDate': (date.today() + timedelta(days=90)).isoformat()
+    }, headers=user.headers), 201)
+    user.goals.append(response.get_json()['id'])
+
+def update_goal(client, user, rng):
+    if not user.goals:
+        return create_goal(client, user, rng)
+    goal_id = rng.choice(user.goals)
+    _expect(client.put(f'/api/goals/{goal_id}', json={'currentValue': rng.randint(0, 100)}, headers=user.headers), 200)
+
+def login(client, user, rng):
+    response = _expect(client.post('/api/auth/login', json={'email': user.email, 'password': PASSWORD}), 200)
+    user.refresh_headers = {'Authorization': f'Bearer {response.get_json()["refresh_token"]}'}
+
+def refresh(client, user, rng):
+    if user.refresh_headers is None:
+        return login(client, user, rng)
+    _expect(client.post('/api/auth/refresh', headers=user.refresh_headers), 200)
+
+def register(client, user, rng):
+    _expect(client.post('/api/auth/register', json={
+        'email': f'{uuid.uuid4().hex}@load.local', 'name': 'Load User', 'password': PASSWORD
+    }), 201)
+
+# Operation -> relative weight; reads dominate, as they do for the frontend
+MIX = {
+    dashboard_stats: 15,
+    list_workouts: 12,
+    list_nutrition: 10,
+    list_progress: 8,
+    get_profile: 8,
+    search_foods: 6,
+    create_workout: 6,
+    create_nutrition: 6,
+    list_goals: 5,
+    revalidate_workouts: 5,
+    sync_changes: 4,
+    create_progress: 4,
+    update_workout: 3,
+    delete_nutrition: 2,
+    create_goal: 2,
+    update_goal: 2,
+    update_profile: 2,
+    login: 1,
+    refresh: 1,
+    register: 1,
+}
+
+def check_queries(app, user):
+    """Run every operation once under assert_no_n_plus_one(); returns failure messages."""
+    from backend.instrumentation import assert_no_n_plus_one
+
+    client = app.test_client()
+    rng = random.Random(0)
+    failures = []
+    for operation in MIX:
+        try:
+            with assert_no_n_plus_one():
+                operation(client, user, rng)
+        except AssertionError as e:
+            failures.append(f'{operation.__name__}: {e}')
+    return failures
+
+def run_size(size, users, threads, requests, seed):
+    from backend.migrations import init_database
+
+    app = make_app()
+    with app.app_context():
+        init_database()  # sample foods for search
+
+    states = []
+    for _ in range(users):
+        email = f'{uuid.uuid4().hex}@load.local'
+        user_id, headers = create_user(app, email)
+        seed_history(app, user_id, size, seed=seed)
+        states.append(UserState(user_id, email, headers))
+
+    query_failures = check_queries(app, states[0])
+
+    operations = list(MIX)
+    weights = [MIX[operation] for operation in operations]
+    latencies = {operation.__name__: [] for operation in operations}
+    errors = []
+    lock = threading.Lock()
+
+    def worker(index):
+        client = app.test_client()
+        rng = random.Random(seed * 1000 + index)
+        mine = states[index::threads] or states
+        samples = []
+        for _ in range(requests // threads):
+            operation = rng.choices(operations, weights)[0]
+            user = rng.choice(mine)
+            start = time.perf_counter()
+            try:
+                operation(client, user, rng)
+            except AssertionError as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            samples.append((operation.__name__, (time.perf_counter() - start) * 1000))
+        with lock:
+            for name, elapsed in samples:
+                latencies[name].append(elapsed)
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    completed = sum(len(samples) for samples in latencies.values())
+    return {
+        'throughput_rps': round(completed / elapsed, 2),
+        'requests': completed,
+        'errors': len(errors),
+        'error_examples': errors[:5],
+        'query_failures': query_failures,
+        'overall': summarize([value for samples in latencies.values() for value in samples] or [0]),
+        'operations': {name: {'count': len(samples), **summarize(samples)}
+                       for name, samples in sorted(latencies.items()) if samples},
+    }
+
+def compare(results, baseline, threshold, min_ms):
+    """Regression messages for operations whose p95 or overall throughput got worse than allowed."""
+    regressions = []
+    for size, current in results.items():
+        previous = baseline.get('results', {}).get(size)
+        if previous is None:
+            continue
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append(f'size {size}: throughput {current["throughput_rps"]} req/s '
+                               f'< baseline {previous["throughput_rps"]} req/s')
+        for name, stats in current['operations'].items():
+            before = previous['operations'].get(name)
+            if before is None:
+                continue
+            limit = before['p95_ms'] * (1 + threshold) + min_ms
+            if stats['p95_ms'] > limit:
+                regressions.append(f'size {size}: {name} p95 {stats["p95_ms"]:.2f}ms > '
+                                   f'baseline {before["p95_ms"]:.2f}ms (limit {limit:.2f}ms)')
+    return regressions
+
+def print_report(size, result):
+    overall = result['overall']
+    print(f'\n== {size} entries/table: {result["throughput_rps"]:.1f} req/s, p50={overall["p50_ms"]:.2f}ms '
+          f'p95={overall["p95_ms"]:.2f}ms p99={overall["p99_ms"]:.2f}ms, errors={result["errors"]}')
+    print(f'{"operation":>20} {"count":>6} {"p50":>9} {"p95":>9} {"p99":>9}')
+    for name, stats in result['operations'].items():
+        print(f'{name:>20} {stats["count"]:>6} {stats["p50_ms"]:>8.2f}ms {stats["p95_ms"]:>8.2f}ms {stats["p99_ms"]:>8.2f}ms')
+    for message in result['error_examples']:
+        print(f'  error: {message}')
+    for message in result['query_failures']:
+        print(f'  query check: {message}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--users', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000, help='operations per size')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--hash-rounds', type=int, default=1000,
+                        help='pbkdf2 iterations, kept low so logins do not dominate the mix')
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--baseline', metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='absolute p95 slack per operation')
+    args = parser.parse_args()
+
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2'
+    os.environ['PASSWORD_HASH_ROUNDS'] = str(args.hash_rounds)
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args.users, args.threads, args.requests, args.seed)
+        print_report(size, results[str(size)])
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'users': args.users,
+            'threads': args.threads,
+            'requests': args.requests,
+            'seed': args.seed,
+            'hash_rounds': args.hash_rounds,
+        },
+        'results': results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f'\nSaved baseline to {args.save_baseline}')
+
+    failed = any(result['errors'] or result['query_failures'] for result in results.values())
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold, args.min_ms)
+        for message in regressions:
+            print(f'REGRESSION {message}')
+        if not regressions:
+            print(f'\nNo regressions beyond {args.threshold:.0%} of {args.baseline}')
+        failed = failed or bool(regressions)
+
+    sys.exit(1 if failed else 0)
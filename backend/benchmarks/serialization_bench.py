@@ -0,0 +1,67 @@
+"""List endpoint serialization: ORM objects + stdlib json versus column rows + orjson.
+
+    python -m backend.benchmarks.serialization_bench --rows 10000
+
+Each variant renders the full GET /api/workouts payload for one user inside
+a request context; the outputs are checked to be byte-identical
+(the seeded entries are ASCII and finite, where the two encoders agree).
+"""
+import argparse
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+from backend.benchmarks.common import make_app, create_user, seed_history, measure, summarize
+
+def run(rows, repeat):
+    from backend.json_provider import OrjsonProvider, orjson
+    from backend.models.workout import Workout
+    from backend.pagination import paginate, page_response
+    from backend.serializers import row_columns, serialize_rows
+
+    app = make_app()
+    user_id, _ = create_user(app)
+    seed_history(app, user_id, rows)
+
+    providers = {'stdlib': DefaultJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    def orm_rows():
+        workouts, cursor = paginate(Workout.query.filter_by(user_id=user_id), Workout.date, Workout.id)
+        return [workout.to_dict() for workout in workouts], cursor
+
+    def column_rows():
+        query = Workout.query.filter_by(user_id=user_id).with_entities(*row_columns(Workout))
+        found, cursor = paginate(query, Workout.date, Workout.id)
+        return serialize_rows(Workout, found), cursor
+
+    variants = [('orm + stdlib', orm_rows, 'stdlib'), ('columns + stdlib', column_rows, 'stdlib')]
+    if 'orjson' in providers:
+        variants += [('orm + orjson', orm_rows, 'orjson'), ('columns + orjson', column_rows, 'orjson')]
+
+    bodies = {}
+    baseline = None
+    with app.test_request_context('/api/workouts'):
+        for name, build, provider in variants:
+            def render():
+                app.json = providers[provider]
+                response = page_response(*build())
+                bodies[name] = response.get_data()
+                app.extensions['sqlalchemy'].session.remove()
+
+            stats = summarize(measure(render, repeat=repeat, warmup=2))
+            baseline = baseline or stats['mean_ms']
+            print(f'{name:>18}: mean={stats["mean_ms"]:8.2f}ms  p95={stats["p95_ms"]:8.2f}ms  '
+                  f'({baseline / stats["mean_ms"]:.1f}x)  {len(bodies[name]) / 1024:.0f} KiB')
+
+    first = next(iter(bodies.values()))
+    assert all(body == first for body in bodies.values()), 'variants disagree'
+    print(f'{len(json.loads(first))} rows, byte-identical payloads across {len(bodies)} variants')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
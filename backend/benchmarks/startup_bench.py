@@ -0,0 +1,23 @@
+"""App factory startup time, with and without database initialization.
+
+    python -m backend.benchmarks.startup_bench --repeat 20
+"""
+import argparse
+
+from backend.benchmarks.common import make_app, measure, summarize
+
+def run(repeat):
+    from backend.app import create_app
+
+    # An already initialized database, as on any restart after the first deploy
+    make_app()
+
+    for label, auto_init in (('no database work', False), ('AUTO_INIT_DB', True)):
+        stats = summarize(measure(lambda: create_app({'AUTO_INIT_DB': auto_init}), repeat=repeat, warmup=2))
+        print(f'{label:>17}: mean={stats["mean_ms"]:.2f}ms  p95={stats["p95_ms"]:.2f}ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,55 @@
+"""Delta sync latency against history size.
+
+    python -m backend.benchmarks.sync_bench --sizes 100 10000 100000 --changes 20
+
+For each size, seeds that many entries per table, takes a sync token, then
+creates, updates and deletes `--changes` entries. "delta" syncs from that
+token; its latency should stay flat however large the history is. "full" is
+the first page of an initial sync, for comparison.
+"""
+import argparse
+from datetime import date
+
+from backend.benchmarks.common import make_app, create_user, seed_history, measure, summarize
+
+def run(sizes, changes, repeat):
+    for size in sizes:
+        app = make_app()
+        client = app.test_client()
+        user_id, headers = create_user(app)
+        seed_history(app, user_id, size)
+
+        def sync(token=''):
+            response = client.get(f'/api/sync?since={token}', headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            return response.get_json()
+
+        token = sync()['token']
+        while True:
+            page = client.get(f'/api/sync?since={token}&limit=5000', headers=headers).get_json()
+            token = page['token']
+            if not page['hasMore']:
+                break
+
+        entry = {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': date.today().isoformat()}
+        for _ in range(changes):
+            created = client.post('/api/workouts', json=entry, headers=headers).get_json()
+            client.put(f'/api/workouts/{created["id"]}', json={'duration': 25}, headers=headers)
+            created = client.post('/api/workouts', json=entry, headers=headers).get_json()
+            client.delete(f'/api/workouts/{created["id"]}', headers=headers)
+
+        delta = sync(token)
+        assert len(delta['workouts']) == changes and len(delta['deleted']['workouts']) == changes, delta
+
+        for name, since in (('delta', token), ('full', '')):
+            stats = summarize(measure(lambda: sync(since), repeat=repeat))
+            print(f'{size:>7} entries {name:>5}: mean={stats["mean_ms"]:.2f}ms  '
+                  f'p50={stats["p50_ms"]:.2f}ms  p95={stats["p95_ms"]:.2f}ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    parser.add_argument('--changes', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    run(args.sizes, args.changes, args.repeat)
@@ -0,0 +1,176 @@
+from flask import current_app, request
+from backend.app import db
+from backend.changes import mark_changed
+from backend.rollups import record_rows
+from backend.goal_progress import track_rows
+from backend.jobs import job_queue
+from datetime import datetime
+from sqlalchemy import insert
+import json
+import logging
+import math
+import os
+import shutil
+import uuid
+
+logger = logging.getLogger('backend.bulk')
+
+CHUNK_SIZE = 500
+NDJSON_MIMETYPES = {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}
+
+class BulkImportError(ValueError):
+    pass
+
+_REQUIRED = object()
+
+def _present(data, name, default):
+    """data[name], or None when it is missing or null and `default` applies."""
+    value = data.get(name)
+    if value is None and default is _REQUIRED:
+        raise BulkImportError(f"Missing field '{name}'")
+    return value
+
+def text_field(data, name, default=_REQUIRED, max_length=None):
+    value = _present(data, name, default)
+    if value is None:
+        return default
+    if not isinstance(value, str) or (default is _REQUIRED and not value.strip()):
+        raise BulkImportError(f"'{name}' must be a non-empty string" if default is _REQUIRED else f"'{name}' must be a string")
+    if max_length and len(value) > max_length:
+        raise BulkImportError(f"'{name}' must be at most {max_length} characters")
+    return value
+
+def number_field(data, name, default=_REQUIRED, integer=False):
+    value = _present(data, name, default)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise BulkImportError(f"'{name}' must be a number")
+    if integer:
+        if value != int(value):
+            raise BulkImportError(f"'{name}' must be a whole number")
+        return int(value)
+    return value
+
+def date_field(data, name):
+    value = _present(data, name, _REQUIRED)
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise BulkImportError(f"'{name}' must be a date (YYYY-MM-DD)")
+
+def _iter_lines(stream, block_size=64 * 1024):
+    pending = b''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+def ndjson_items(lines):
+    """Yield (item, error) pairs from NDJSON lines, skipping blank ones."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError as e:
+            yield None, f'Invalid JSON: {e}'
+
+def read_items():
+    """Yield (item, error) pairs from a JSON array body or an NDJSON stream."""
+    if request.mimetype in NDJSON_MIMETYPES:
+        yield from ndjson_items(_iter_lines(request.stream))
+        return
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        raise BulkImportError('Expected a JSON array of entries or an NDJSON body')
+    for item in data:
+        yield item, None
+
+def _describe(error):
+    if isinstance(error, KeyError):
+        return f"Missing field '{error.args[0]}'"
+    return str(error)
+
+def bulk_insert(model, resource, user_id, parse, chunk_size=CHUNK_SIZE, items=None):
+    """Validate request items (or `items`, as (item, error) pairs) with `parse` and insert them chunk by chunk.
+
+    Every chunk is a single executemany INSERT plus its rollup updates, committed
+    together. Returns one result per item in request order.
+    """
+    results = []
+    chunk = []
+
+    def flush():
+        if not chunk:
+            return
+        rows = [values for _, values in chunk]
+        try:
+            db.session.execute(insert(model.__table__), rows)
+            record_rows(model, rows)
+            track_rows(model, rows)
+            mark_changed(user_id, resource)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception('Bulk insert of %d %s entries failed', len(chunk), resource)
+            results.extend({'index': index, 'status': 'error', 'error': 'Could not save entry'} for index, _ in chunk)
+        else:
+            results.extend({'index': index, 'status': 'created', 'id': values['id']} for index, values in chunk)
+        chunk.clear()
+
+    created_at = datetime.utcnow()
+    for index, (item, error) in enumerate(read_items() if items is None else items):
+        if error is None:
+            try:
+                if not isinstance(item, dict):
+                    raise BulkImportError('Entry must be a JSON object')
+                values = parse(item)
+            except (KeyError, ValueError, TypeError) as e:
+                error = _describe(e)
+        if error is not None:
+            results.append({'index': index, 'status': 'error', 'error': error})
+            continue
+
+        values.update(id=str(uuid.uuid4()), user_id=user_id, created_at=created_at)
+        chunk.append((index, values))
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+
+    results.sort(key=lambda result: result['index'])
+    created = sum(1 for result in results if result['status'] == 'created')
+    return {'created': created, 'failed': len(results) - created, 'results': results}
+
+def upload_path(name):
+    return os.path.join(current_app.config['JOBS_RESULT_DIR'], 'uploads', name)
+
+def bulk_insert_later(resource, user_id):
+    """Spool the request's items to an NDJSON file and queue a 'bulk-import' job for it (the `?async=1` variant).
+
+    NDJSON bodies are copied as they arrive; the job payload only names the file.
+    """
+    name = f'{uuid.uuid4().hex}.ndjson'
+    path = upload_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        with open(path, 'wb') as out:
+            if request.mimetype in NDJSON_MIMETYPES:
+                shutil.copyfileobj(request.stream, out, 64 * 1024)
+            else:
+                for item, _ in read_items():
+                    out.write(json.dumps(item).encode() + b'\n')
+        return job_queue.enqueue('bulk-import', {'resource': resource, 'userId': user_id, 'upload': name},
+                                 user_id=user_id)
+    except BaseException:
+        os.remove(path)
+        raise
@@ -0,0 +1,214 @@
+from flask import g, has_request_context
+from collections import OrderedDict
+from importlib import import_module
+import threading
+import time
+
+class CacheBackend:
+    """Interface for dashboard cache storage.
+
+    Values are plain JSON-compatible dicts so a shared store (Redis, memcached)
+    can serialize them and invalidations reach every worker.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        return 0
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+def _load_backend(path, app):
+    module_name, _, attr = path.partition(':')
+    factory = getattr(import_module(module_name), attr)
+    return factory(app)
+
+class StatsCache:
+    """Caches computed dashboard stats per user.
+
+    Configured through DASHBOARD_CACHE_TTL (seconds), DASHBOARD_CACHE_SIZE
+    (entries kept by the in-process backend) and DASHBOARD_CACHE_BACKEND, an
+    optional 'module:factory' path returning a CacheBackend for a shared store.
+
+    Entries carry the resource versions read before the stats were computed
+    and only hit for the same versions, so a reader that finishes after a
+    concurrent write committed (and invalidated the entry) cannot leave its
+    pre-commit stats behind for later requests.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 60
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DASHBOARD_CACHE_TTL', 60)
+        app.config.setdefault('DASHBOARD_CACHE_SIZE', 10000)
+        app.config.setdefault('DASHBOARD_CACHE_BACKEND', None)
+
+        self.ttl = app.config['DASHBOARD_CACHE_TTL']
+        backend_path = app.config['DASHBOARD_CACHE_BACKEND']
+        if backend_path:
+            self.backend = _load_backend(backend_path, app)
+        else:
+            self.backend = MemoryCache(max_size=app.config['DASHBOARD_CACHE_SIZE'])
+        app.extensions['dashboard_cache'] = self
+
+    def _key(self, user_id):
+        return f'dashboard:{user_id}'
+
+    def get(self, user_id, day, versions):
+        entry = self.backend.get(self._key(user_id)) if self.backend is not None else None
+        # Weekly totals depend on the current date, so yesterday's entry is stale
+        hit = entry is not None and entry['day'] == day.isoformat() and entry.get('versions') == versions
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry['stats'] if hit else None
+
+    def set(self, user_id, day, versions, stats):
+        """Cache `stats`, computed from data at least as new as `versions` (read before computing)."""
+        if self.backend is not None:
+            entry = {'day': day.isoformat(), 'versions': versions, 'stats': stats}
+            self.backend.set(self._key(user_id), entry, self.ttl)
+
+    def invalidate(self, user_id):
+        if self.backend is not None:
+            self.backend.delete(self._key(user_id))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hitRate': round(hits / lookups, 4) if lookups else 0.0,
+            'size': len(self.backend) if self.backend is not None else 0
+        }
+
+class UserCache:
+    """Two-level cache of user profile dicts.
+
+    Lookups are memoized for the current request in `flask.g`, then in a
+    short-lived per-process LRU (USER_CACHE_TTL seconds, USER_CACHE_SIZE
+    entries) so hot endpoints rarely need the users row.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryCache()
+        self.ttl = 30
+        self.request_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_TTL', 30)
+        app.config.setdefault('USER_CACHE_SIZE', 10000)
+
+        self.ttl = app.config['USER_CACHE_TTL']
+        self.backend = MemoryCache(max_size=app.config['USER_CACHE_SIZE'])
+        app.extensions['user_cache'] = self
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, user_id, loader):
+        """Return the cached profile for `user_id`, calling `loader()` on a miss."""
+        local = g.setdefault('user_cache', {}) if has_request_context() else {}
+        if user_id in local:
+            self._count('request_hits')
+            return local[user_id]
+
+        profile = self.backend.get(user_id) if self.ttl else None
+        if profile is not None:
+            self._count('hits')
+        else:
+            self._count('misses')
+            profile = loader()
+            if profile is not None and self.ttl:
+                self.backend.set(user_id, profile, self.ttl)
+
+        local[user_id] = profile
+        return profile
+
+    def invalidate(self, user_id):
+        self.backend.delete(user_id)
+        if has_request_context():
+            g.get('user_cache', {}).pop(user_id, None)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            request_hits, hits, misses = self.request_hits, self.hits, self.misses
+        lookups = request_hits + hits + misses
+        return {
+            'requestHits': request_hits,
+            'hits': hits,
+            'misses': misses,
+            'hitRate': round((request_hits + hits) / lookups, 4) if lookups else 0.0,
+            'size': len(self.backend)
+        }
@@ -0,0 +1,47 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.extensions import db, dashboard_cache, user_cache
+from backend.replicas import replica_router
+from backend.versions import bump_versions
+from backend.sync import stamp_changes
+
+DASHBOARD_RESOURCES = {'workouts', 'nutrition', 'progress'}
+
+def mark_changed(user_id, resource):
+    """Record that `resource` changed for `user_id` in the current transaction.
+
+    The resource's version counter is bumped in the same transaction, and
+    caches are invalidated once it commits, so a concurrent request cannot
+    repopulate them from data that is about to be replaced.
+    """
+    db.session.info.setdefault('changed', set()).add((user_id, resource))
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    changed = session.info.get('changed')
+    # Savepoint commits fire before_commit too; only bump for the real commit
+    if changed and not session.in_nested_transaction():
+        bump_versions(session, changed)
+        stamp_changes(session, changed)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    # Releasing a savepoint fires after_commit too; keep the changes for the real commit
+    if session.in_nested_transaction():
+        return
+    changed = session.info.pop('changed', None)
+    if not changed:
+        return
+    for user_id, resource in changed:
+        replica_router.record_write(user_id)
+        if resource in DASHBOARD_RESOURCES:
+            dashboard_cache.invalidate(user_id)
+        elif resource == 'profile':
+            user_cache.invalidate(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    # A savepoint rollback leaves the outer transaction's changes pending
+    if not session.in_nested_transaction():
+        session.info.pop('changed', None)
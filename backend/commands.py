@@ -0,0 +1,169 @@
+import click
+
+def register_commands(app):
+    @app.cli.command('migrate')
+    def migrate():
+        """Create missing tables and indexes."""
+        from backend.migrations import upgrade
+        for step in upgrade():
+            click.echo(step)
+        click.echo('Database is up to date.')
+
+    @app.cli.command('seed')
+    def seed():
+        """Load the sample food database and demo user if missing."""
+        from backend.seed_data import seed_sample_data
+        seed_sample_data()
+
+    @app.cli.command('init-db')
+    def init_db():
+        """One-time setup: migrate the schema, then seed sample data."""
+        from backend.migrations import init_database
+        for step in init_database():
+            click.echo(step)
+        click.echo('Database initialized.')
+
+    @app.cli.command('check-indexes')
+    def check_indexes():
+        """Fail if a hot query is not served by an index (SQLite EXPLAIN QUERY PLAN)."""
+        from backend.migrations import check_index_coverage
+        problems = check_index_coverage()
+        for name, plan in problems:
+            click.echo(f'{name}: ' + ' | '.join(plan), err=True)
+        if problems:
+            raise SystemExit(1)
+        click.echo('All hot queries use an index.')
+
+    @app.cli.command('db-config')
+    def db_config():
+        """Show the effective SQLite pragmas or connection pool settings."""
+        from backend.app import db
+        from backend.database import describe_engine
+        for name, value in describe_engine(db.engine).items():
+            click.echo(f'{name}: {value}')
+
+    @app.cli.command('sync-replicas')
+    def sync_replicas():
+        """Copy a SQLite primary onto the SQLite DATABASE_REPLICA_URLS (local testing)."""
+        from sqlalchemy.engine import make_url
+        from backend.replicas import sync_sqlite_replicas
+        urls = [app.config['SQLALCHEMY_DATABASE_URI'], *app.config['DATABASE_REPLICA_URLS']]
+        if len(urls) == 1 or any(make_url(url).get_backend_name() != 'sqlite' for url in urls):
+            raise click.ClickException('Needs a SQLite primary and at least one SQLite replica')
+        sync_sqlite_replicas(make_url(urls[0]).database, [make_url(url).database for url in urls[1:]])
+        click.echo(f'Synced {len(urls) - 1} replica(s)')
+
+    @app.cli.command('rebuild-rollups')
+    @click.option('--user-id', default=None, help='Only rebuild this user.')
+    def rebuild_rollups(user_id):
+        """Recompute daily summaries from raw workout, nutrition and progress entries."""
+        from backend.rollups import rebuild_daily_summaries
+        rows = rebuild_daily_summaries(user_id)
+        click.echo(f'Rebuilt {rows} daily summaries')
+
+    @app.cli.command('check-rollups')
+    @click.option('--user-id', default=None, help='Only check this user.')
+    def check_rollups(user_id):
+        """Fail if any daily summary disagrees with the raw entries."""
+        from backend.rollups import find_inconsistencies
+        problems = find_inconsistencies(user_id)
+        for uid, day, column, stored, expected in problems:
+            click.echo(f'{uid} {day} {column}: stored={stored} expected={expected}', err=True)
+        if problems:
+            raise SystemExit(1)
+        click.echo('Daily summaries match raw entries.')
+
+    @app.cli.command('recompute-goals')
+    @click.option('--user-id', default=None, help='Only recompute this user.')
+    def recompute_goals_command(user_id):
+        """Recompute the current value and status of goals bound to a metric from raw entries."""
+        from backend.goal_progress import recompute_goals
+        goals = recompute_goals(user_id)
+        click.echo(f'Recomputed {goals} goals')
+
+    @app.cli.command('grant-admin')
+    @click.argument('email')
+    @click.option('--revoke', is_flag=True, help='Remove admin access instead.')
+    def grant_admin(email, revoke):
+        """Grant (or revoke) access to /api/admin for an existing account."""
+        from backend.app import db
+        from backend.models.user import User
+        user = User.query.filter(db.func.lower(User.email) == email.strip().lower()).first()
+        if user is None:
+            raise click.ClickException(f'No account with email {email}')
+        user.is_admin = not revoke
+        db.session.commit()
+        click.echo(f"{user.email} {'is no longer' if revoke else 'is now'} an admin")
+
+    @app.cli.command('run-jobs')
+    @click.option('--workers', type=int, default=None, help='Defaults to JOBS_WORKERS (at least 1).')
+    def run_jobs(workers):
+        """Run background job workers in the foreground until interrupted (SIGINT/SIGTERM)."""
+        import signal
+        import threading
+        from backend.jobs import job_queue
+        job_queue.workers = workers or job_queue.workers or 1
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        job_queue.start(app)
+        click.echo(f'{job_queue.workers} {job_queue.mode} worker(s) running as {job_queue.worker_id}')
+        try:
+            while not stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        click.echo('Shutting down; waiting for running jobs...')
+        job_queue.shutdown()
+
+    @app.cli.command('purge-jobs')
+    @click.option('--days', default=7, show_default=True, help='Delete finished jobs older than this.')
+    def purge_jobs(days):
+        """Delete finished jobs, their result files and any upload a cancelled import left behind."""
+        import json
+        import os
+        from datetime import datetime, timedelta
+        from backend.app import db
+        from backend.bulk import upload_path
+        from backend.models.job import Job
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        jobs = Job.query.filter(Job.status.in_(('succeeded', 'failed', 'cancelled')), Job.finished_at < cutoff).all()
+        for job in jobs:
+            result = job.to_dict()['result']
+            if isinstance(result, dict) and 'file' in result:
+                path = os.path.join(app.config['JOBS_RESULT_DIR'], result['file'])
+                if os.path.exists(path):
+                    os.remove(path)
+            upload = json.loads(job.payload or '{}').get('upload')
+            if upload and os.path.exists(upload_path(upload)):
+                os.remove(upload_path(upload))
+            db.session.delete(job)
+        db.session.commit()
+        click.echo(f'Purged {len(jobs)} jobs')
+
+    @app.cli.command('load-foods')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson', 'json']), default=None,
+                  help='Source format; guessed from the file extension by default.')
+    @click.option('--batch-size', default=5000, show_default=True, help='Records per transaction.')
+    @click.option('--resume', is_flag=True, help='Skip the records committed by an interrupted run.')
+    def load_foods_command(path, fmt, batch_size, resume):
+        """Stream a CSV/NDJSON/JSON nutrient dump into the food database.
+
+        Records need name and calories; protein, carbs and fats default to 0.
+        Foods are deduplicated by name (case and whitespace insensitive) and
+        existing ones are updated in place.
+        """
+        from backend.food_loader import load_foods, FoodLoadError
+
+        def report(stats):
+            rate = stats['records'] / stats['elapsed'] if stats['elapsed'] else 0
+            click.echo(f"{stats['records']:,} records  {stats['inserted']:,} inserted  "
+                       f"{stats['updated']:,} updated  {stats['invalid']:,} invalid  ({rate:,.0f} records/s)")
+
+        try:
+            stats = load_foods(path, fmt=fmt, batch_size=batch_size, resume=resume, report=report)
+        except FoodLoadError as e:
+            raise click.ClickException(str(e))
+        for error in stats['errors']:
+            click.echo(error, err=True)
+        click.echo(f"Done in {stats['elapsed']:.1f}s.")
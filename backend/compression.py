@@ -0,0 +1,147 @@
+from flask import request
+import threading
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/csv',
+    'text/html',
+    'text/plain',
+    'text/css',
+}
+
+class _Gzip:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _Brotli:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class Compressor:
+    """Negotiated gzip/brotli compression for responses, applied in after_request.
+
+    Buffered bodies under COMPRESS_MIN_SIZE bytes, 304s, responses that already
+    have a Content-Encoding and non-text mimetypes are sent as they are.
+    Streamed bodies are compressed chunk by chunk and flushed after each one,
+    so clients still receive data as it is produced.
+    """
+
+    def __init__(self, app=None):
+        self.min_size = 500
+        self.level = 6
+        self.brotli_quality = 4
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)
+
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        self.level = app.config['COMPRESS_LEVEL']
+        self.brotli_quality = app.config['COMPRESS_BROTLI_QUALITY']
+        app.after_request(self.after_request)
+        app.extensions['compression'] = self
+
+    def _encoding(self):
+        offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+        return request.accept_encodings.best_match(offered)
+
+    def _encoder(self, encoding):
+        if encoding == 'br':
+            return _Brotli(self.brotli_quality)
+        return _Gzip(self.level)
+
+    def _record(self, bytes_in, bytes_out, cpu_seconds, response=False):
+        with self._lock:
+            self.responses += int(response)
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.cpu_seconds += cpu_seconds
+
+    def after_request(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._encoding()
+        if encoding is None or request.method == 'HEAD':
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), self._encoder(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            start = time.thread_time()
+            encoder = self._encoder(encoding)
+            compressed = encoder.compress(body) + encoder.finish()
+            self._record(len(body), len(compressed), time.thread_time() - start, response=True)
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _stream(self, chunks, encoder):
+        self._record(0, 0, 0.0, response=True)
+        for chunk in chunks:
+            start = time.thread_time()
+            data = encoder.compress(chunk) + encoder.flush()
+            self._record(len(chunk), len(data), time.thread_time() - start)
+            if data:
+                yield data
+        start = time.thread_time()
+        tail = encoder.finish()
+        self._record(0, len(tail), time.thread_time() - start)
+        yield tail
+
+    def stats(self):
+        with self._lock:
+            return {
+                'responses': self.responses,
+                'bytesIn': self.bytes_in,
+                'bytesOut': self.bytes_out,
+                'bytesSaved': self.bytes_in - self.bytes_out,
+                'ratio': round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None,
+                'cpuSeconds': round(self.cpu_seconds, 6)
+            }
+
+compressor = Compressor()
@@ -0,0 +1,83 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Applied to every new SQLite connection; see configure_engine()
+SQLITE_DEFAULTS = {
+    'SQLITE_JOURNAL_MODE': 'WAL',
+    'SQLITE_SYNCHRONOUS': 'NORMAL',
+    'SQLITE_BUSY_TIMEOUT': 5000,        # ms a writer waits for the lock before 'database is locked'
+    'SQLITE_MMAP_SIZE': 256 * 1024 * 1024,
+    'SQLITE_CACHE_SIZE': -64000,        # negative = KiB, so roughly 64 MB per connection
+}
+
+POOL_DEFAULTS = {
+    'DB_POOL_SIZE': 10,
+    'DB_MAX_OVERFLOW': 20,
+    'DB_POOL_RECYCLE': 1800,
+    'DB_POOL_PRE_PING': True,
+}
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+def sqlite_pragmas(config):
+    return [
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('busy_timeout', int(config['SQLITE_BUSY_TIMEOUT'])),
+        ('mmap_size', int(config['SQLITE_MMAP_SIZE'])),
+        ('cache_size', int(config['SQLITE_CACHE_SIZE'])),
+    ]
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database.
+
+    Explicit SQLALCHEMY_ENGINE_OPTIONS entries win over the derived ones.
+    """
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        # The driver's own lock timeout, in seconds; busy_timeout takes over once connected
+        options = {'connect_args': {'timeout': int(config['SQLITE_BUSY_TIMEOUT']) / 1000}}
+    else:
+        options = {
+            'pool_size': int(config['DB_POOL_SIZE']),
+            'max_overflow': int(config['DB_MAX_OVERFLOW']),
+            'pool_recycle': int(config['DB_POOL_RECYCLE']),
+            'pool_pre_ping': bool(config['DB_POOL_PRE_PING']),
+        }
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+def _apply_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+    return on_connect
+
+def configure_engine(app, db):
+    """Set engine options before db.init_app(app), then hook SQLite pragmas onto the engines."""
+    for key, value in {**SQLITE_DEFAULTS, **POOL_DEFAULTS}.items():
+        app.config.setdefault(key, value)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+    db.init_app(app)
+
+    with app.app_context():
+        engines = db.engines.values()
+    pragmas = sqlite_pragmas(app.config)
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', _apply_pragmas(pragmas))
+
+def describe_engine(engine):
+    """Effective pragmas (SQLite) or pool settings, for `flask db-config`."""
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as connection:
+            return {
+                name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+                for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size')
+            }
+    return {'pool': engine.pool.status()}
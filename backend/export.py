@@ -0,0 +1,92 @@
+from flask import Response, request, stream_with_context
+import csv
+import io
+import json
+import zlib
+
+BATCH_SIZE = 1000
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+class ExportError(ValueError):
+    pass
+
+def _ndjson_chunks(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) >= BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def _csv_chunks(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _gzip_chunks(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_options(args):
+    """(format, compression) from the request arguments."""
+    fmt = args.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        raise ExportError(f"Unsupported format '{fmt}', expected one of: {', '.join(FORMATS)}")
+    compress = args.get('compress')
+    if compress not in (None, 'gzip'):
+        raise ExportError("Unsupported compression, expected 'gzip'")
+    return fmt, compress
+
+def export_chunks(model, user_id, sort_column, fmt, compress=None):
+    """Every row of `model` owned by `user_id` as NDJSON or CSV text chunks (gzipped bytes with compress='gzip').
+
+    Rows are fetched in batches of BATCH_SIZE with yield_per, so memory stays
+    flat regardless of history length.
+    """
+    query = (model.query
+             .filter_by(user_id=user_id)
+             .order_by(sort_column, model.id)
+             .yield_per(BATCH_SIZE))
+    rows = (item.to_dict() for item in query)
+
+    if fmt == 'csv':
+        chunks = _csv_chunks(rows, list(model().to_dict()))
+    else:
+        chunks = _ndjson_chunks(rows)
+    if compress == 'gzip':
+        chunks = _gzip_chunks(chunks)
+    return chunks
+
+def export_response(model, user_id, sort_column, filename):
+    """Stream every row of `model` owned by `user_id` as NDJSON or CSV; `?compress=gzip` gzips the stream."""
+    fmt, compress = export_options(request.args)
+    chunks = export_chunks(model, user_id, sort_column, fmt, compress)
+
+    headers = {'Content-Disposition': f'attachment; filename="{filename}.{fmt}"'}
+    if compress == 'gzip':
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(chunks), mimetype=FORMATS[fmt], headers=headers)
+
+def export_later(resource, user_id):
+    """Queue an 'export' job writing the file that GET /export would stream; fetched from /api/jobs/<id>/result."""
+    from backend.jobs import job_queue
+    fmt, compress = export_options(request.args)
+    return job_queue.enqueue('export', {'resource': resource, 'userId': user_id, 'format': fmt, 'compress': compress},
+                             user_id=user_id)
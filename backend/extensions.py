@@ -1,5 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from backend.cache import StatsCache, UserCache
+from backend.replicas import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
+dashboard_cache = StatsCache()
+user_cache = UserCache()
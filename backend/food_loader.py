@@ -0,0 +1,206 @@
+from backend.app import db
+from backend.models.nutrition import FoodDatabase, normalize_food_name
+from sqlalchemy import bindparam, insert, select, update
+import csv
+import json
+import math
+import os
+import re
+import time
+
+BATCH_SIZE = 5000
+NAME_LENGTH = FoodDatabase.__table__.c.name.type.length
+FORMATS = ('csv', 'ndjson', 'json')
+MAX_ITEM_SIZE = 1 << 20  # characters one item of a JSON array may span before it is reported as malformed
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+class FoodLoadError(ValueError):
+    pass
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'ndjson'
+    if extension in FORMATS:
+        return extension
+    raise FoodLoadError(f"Can't tell the format of {path}, pass --format")
+
+def _iter_json_array(handle, block_size=1 << 20, max_item_size=MAX_ITEM_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = handle.read(block_size)
+    index = _SEPARATORS.match(buffer).end()
+    if buffer[index:index + 1] != '[':
+        raise FoodLoadError('JSON source must be an array of objects')
+    index += 1
+    dropped = 0  # characters trimmed off the front of the buffer, for error positions
+    while True:
+        index = _SEPARATORS.match(buffer, index).end()
+        if buffer[index:index + 1] == ']':
+            return
+        try:
+            if index == len(buffer):
+                raise ValueError('end of buffer')
+            item, index = decoder.raw_decode(buffer, index)
+        except ValueError as e:
+            if len(buffer) - index > max_item_size:
+                raise FoodLoadError(f'Malformed JSON item at character {dropped + index}: {e}')
+            block = handle.read(block_size)
+            if not block:
+                raise FoodLoadError(f'Truncated JSON array at character {dropped + index}')
+            # Only trim when refilling, so parsing an item never copies the buffer
+            buffer = buffer[index:] + block
+            dropped += index
+            index = 0
+            continue
+        yield item
+
+class InvalidRecord(ValueError):
+    """Stands in for a source line that is not valid JSON, so it is counted like other invalid records."""
+
+def iter_records(handle, fmt):
+    """Stream raw records from an open text file without loading it whole."""
+    if fmt == 'csv':
+        yield from csv.DictReader(handle)
+    elif fmt == 'ndjson':
+        for line in handle:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield InvalidRecord(f'invalid JSON: {e}')
+    elif fmt == 'json':
+        yield from _iter_json_array(handle)
+    else:
+        raise FoodLoadError(f"Unsupported format '{fmt}'")
+
+def _number(record, field, cast, required=False):
+    value = record.get(field)
+    if value in (None, ''):
+        if required:
+            raise ValueError(f"missing '{field}'")
+        return cast(0)
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"'{field}' must be a finite number")
+    value = cast(value)
+    if value < 0:
+        raise ValueError(f"'{field}' must not be negative")
+    return value
+
+def clean_record(record):
+    """Validate one source record into food_database column values."""
+    if isinstance(record, InvalidRecord):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError('record is not an object')
+    name = ' '.join(str(record.get('name') or '').split())
+    if not name:
+        raise ValueError("missing 'name'")
+    if len(name) > NAME_LENGTH:
+        raise ValueError(f"'name' is longer than {NAME_LENGTH} characters")
+    return {
+        'name': name,
+        'name_key': normalize_food_name(name),
+        'calories': _number(record, 'calories', int, required=True),
+        'protein': _number(record, 'protein', float),
+        'carbs': _number(record, 'carbs', float),
+        'fats': _number(record, 'fats', float),
+    }
+
+def upsert_batch(rows):
+    """Insert or update a batch of cleaned rows keyed by name_key; returns (inserted, updated)."""
+    by_key = {row['name_key']: row for row in rows}  # last occurrence wins
+    table = FoodDatabase.__table__
+    existing = db.session.execute(
+        select(table.c.id, table.c.name_key).where(table.c.name_key.in_(list(by_key)))
+    ).all()
+
+    updates = [{'food_id': food_id, **by_key[key]} for food_id, key in existing]
+    found = {key for _, key in existing}
+    inserts = [row for key, row in by_key.items() if key not in found]
+
+    if updates:
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('food_id')).values(
+                name=bindparam('name'), calories=bindparam('calories'), protein=bindparam('protein'),
+                carbs=bindparam('carbs'), fats=bindparam('fats')
+            ),
+            updates
+        )
+    if inserts:
+        db.session.execute(insert(table), inserts)
+    db.session.commit()
+    return len(inserts), len(found)
+
+class _Checkpoint:
+    """Remembers how many source records were committed, for --resume."""
+
+    def __init__(self, path):
+        self.path = path + '.progress'
+        stat = os.stat(path)
+        self.source = {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path) as handle:
+            state = json.load(handle)
+        if state.get('source') != self.source:
+            raise FoodLoadError('Source file changed since the last run; remove the .progress file to start over')
+        return state['records']
+
+    def save(self, records):
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump({'source': self.source, 'records': records}, handle)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def load_foods(path, fmt=None, batch_size=BATCH_SIZE, resume=False, report=None):
+    """Stream `path` into food_database in batched upserts.
+
+    Progress is checkpointed after every committed batch; with `resume` the
+    records committed by an interrupted run are skipped. `report` is called
+    with a stats dict after each batch.
+    """
+    fmt = fmt or detect_format(path)
+    checkpoint = _Checkpoint(path)
+    skip = checkpoint.load() if resume else 0
+    stats = {'records': skip, 'inserted': 0, 'updated': 0, 'invalid': 0, 'errors': [], 'elapsed': 0.0}
+    started = time.perf_counter()
+    batch = []
+
+    def flush():
+        inserted, updated = upsert_batch(batch)
+        stats['inserted'] += inserted
+        stats['updated'] += updated
+        stats['elapsed'] = time.perf_counter() - started
+        checkpoint.save(stats['records'])
+        batch.clear()
+        if report:
+            report(stats)
+
+    with open(path, newline='' if fmt == 'csv' else None, encoding='utf-8') as handle:
+        for position, record in enumerate(iter_records(handle, fmt)):
+            if position < skip:
+                continue
+            stats['records'] = position + 1
+            try:
+                batch.append(clean_record(record))
+            except (TypeError, ValueError) as e:
+                stats['invalid'] += 1
+                if len(stats['errors']) < 20:
+                    stats['errors'].append(f'record {position + 1}: {e}')
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+    checkpoint.clear()
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
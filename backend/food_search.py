@@ -0,0 +1,292 @@
+from backend.models.nutrition import FoodDatabase
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import repeat
+from operator import itemgetter
+from sqlalchemy import event, func, select
+import heapq
+import re
+import threading
+import time
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+EXACT, PREFIX, SUBSTRING = 3.0, 2.0, 1.0
+MAX_PREFIX_TOKENS = 200
+MIN_SUBSTRING_LENGTH = 3
+MAX_FUZZY_CANDIDATES = 2000
+MAX_RANKED_CANDIDATES = 300
+FULL_REBUILD_RATIO = 0.1
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+def _trigrams(token):
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _max_edits(token):
+    return 1 if len(token) <= 5 else 2
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it is certain to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class _Snapshot:
+    def __init__(self):
+        self.names = {}                      # food id -> lowercased name
+        self.order = {}                      # food id -> (name length, id): shorter names rank first among equals
+        self.tokens = {}                     # food id -> distinct tokens of the name
+        self.vocabulary = []                 # sorted distinct tokens
+        self.postings = defaultdict(list)    # token -> food ids, in `order`
+        self.leading = defaultdict(list)     # first token of the name -> food ids, in `order`
+        self.trigrams = defaultdict(set)     # trigram -> tokens
+        self.max_id = 0
+        self.revisions = 0                   # sum of FoodDatabase.revision over the indexed rows
+
+    def add(self, food_id, name, keep_sorted=True):
+        """Index one food; with keep_sorted=False the caller runs sort() once all are added."""
+        def place(ids):
+            if keep_sorted:
+                insort(ids, food_id, key=self.order.__getitem__)
+            else:
+                ids.append(food_id)
+
+        self.names[food_id] = name.lower()
+        self.order[food_id] = (len(name), food_id)
+        self.max_id = max(self.max_id, food_id)
+        tokens = tokenize(name)
+        if tokens:
+            place(self.leading[tokens[0]])
+        self.tokens[food_id] = tuple(set(tokens))
+        for token in self.tokens[food_id]:
+            if token not in self.postings:
+                if keep_sorted:
+                    self.vocabulary.insert(bisect_left(self.vocabulary, token), token)
+                else:
+                    self.vocabulary.append(token)
+                for gram in _trigrams(token):
+                    self.trigrams[gram].add(token)
+            place(self.postings[token])
+
+    def sort(self):
+        self.vocabulary.sort()
+        for ids in (*self.postings.values(), *self.leading.values()):
+            ids.sort(key=self.order.__getitem__)
+
+class FoodSearchIndex:
+    """In-memory token index over FoodDatabase names.
+
+    Matches are ranked exact token > token prefix > substring of a token
+    (terms of 3+ characters) > typo (edit distance 1-2, found through token
+    trigrams). The index holds only ids and names; the nutrient columns of
+    the returned page are loaded from the database.
+
+    Writes in this process mark the index stale immediately. Other writers
+    (bulk loaders, other workers) are picked up by a count / max(id) /
+    sum(revision) check at most every FOOD_SEARCH_REFRESH_SECONDS. New rows
+    are appended incrementally; updates (every UPDATE bumps the row's
+    revision), deletes and large loads rebuild the index.
+    """
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 30
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._stale = False
+        self._attached = False
+        self._lock = threading.RLock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FOOD_SEARCH_REFRESH_SECONDS', 30)
+        self.refresh_seconds = app.config['FOOD_SEARCH_REFRESH_SECONDS']
+        self._snapshot = None  # built from this app's database on first search
+        if not self._attached:
+            self.attach()
+        app.extensions['food_index'] = self
+
+    def invalidate(self):
+        self._stale = True
+
+    def _load(self, session, after_id=0):
+        query = (select(FoodDatabase.id, FoodDatabase.name, FoodDatabase.revision)
+                 .where(FoodDatabase.id > after_id)
+                 .order_by(FoodDatabase.id)
+                 .execution_options(yield_per=10000))
+        return session.execute(query)
+
+    def rebuild(self, session):
+        snapshot = _Snapshot()
+        for food_id, name, revision in self._load(session):
+            snapshot.add(food_id, name, keep_sorted=False)
+            snapshot.revisions += revision
+        snapshot.sort()
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            self._stale = False
+
+    def refresh(self, session, force=False):
+        with self._lock:
+            due = time.monotonic() - self._checked_at >= self.refresh_seconds
+            if self._snapshot is None:
+                return self.rebuild(session)
+            if not (force or self._stale or due):
+                return
+
+            count, max_id, revisions = session.execute(select(
+                func.count(), func.coalesce(func.max(FoodDatabase.id), 0), func.coalesce(func.sum(FoodDatabase.revision), 0)
+            )).one()
+            snapshot = self._snapshot
+            indexed = len(snapshot.names)
+            added = count - indexed
+            appended_only = added >= 0 and max_id >= snapshot.max_id and revisions == snapshot.revisions
+            if not appended_only or added > max(1000, indexed * FULL_REBUILD_RATIO):
+                return self.rebuild(session)
+
+            if max_id > snapshot.max_id:
+                for food_id, name, revision in self._load(session, after_id=snapshot.max_id):
+                    snapshot.add(food_id, name)
+                    snapshot.revisions += revision
+                if len(snapshot.names) != count:
+                    # Rows were deleted as well as added
+                    return self.rebuild(session)
+            self._checked_at = time.monotonic()
+            self._stale = False
+
+    def _expand(self, snapshot, term):
+        """Return {token: score} for index tokens matching one query term."""
+        matches = {}
+        if term in snapshot.postings:
+            matches[term] = EXACT
+
+        start = bisect_left(snapshot.vocabulary, term)
+        for token in snapshot.vocabulary[start:start + MAX_PREFIX_TOKENS]:
+            if not token.startswith(term):
+                break
+            if token != term:
+                # Closer completions rank higher
+                matches[token] = PREFIX - (len(token) - len(term)) / 100
+        if len(term) >= MIN_SUBSTRING_LENGTH:
+            # A token containing the term has all of its inner trigrams
+            grams = [snapshot.trigrams.get(term[i:i + 3], set()) for i in range(len(term) - 2)]
+            for token in set.intersection(*grams):
+                if term in token and token not in matches:
+                    matches[token] = SUBSTRING
+        if matches:
+            return matches
+
+        limit = _max_edits(term)
+        grams = _trigrams(term)
+        shared = defaultdict(int)
+        for gram in grams:
+            for token in snapshot.trigrams.get(gram, ()):
+                shared[token] += 1
+        candidates = heapq.nlargest(MAX_FUZZY_CANDIDATES, shared.items(), key=lambda item: item[1])
+        for token, _ in candidates:
+            distance = _edit_distance(term, token, limit)
+            if distance <= limit:
+                matches[token] = 1.0 - distance / (limit + 1)
+        return matches
+
+    def search(self, session, text, limit=20):
+        """Return ranked FoodDatabase ids for `text`."""
+        self.refresh(session)
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        with self._lock:
+            snapshot = self._snapshot
+            expansions = [self._expand(snapshot, term) for term in terms]
+            if not all(expansions):
+                return []
+            phrase = ' '.join(terms)
+            first = expansions[0]
+            # Candidates come from the most selective term; check the others first to reject early
+            expansions.sort(key=lambda matches: sum(len(snapshot.postings[token]) for token in matches))
+            checks = expansions[1:] + expansions[:1]
+            scores = self._collect(snapshot, self._sources(snapshot, expansions, first), checks, phrase, limit)
+            order = snapshot.order
+            return sorted(scores, key=lambda food_id: (-scores[food_id], order[food_id]))[:limit]
+
+    def _sources(self, snapshot, expansions, first):
+        """(bound, food ids) lists that together hold every match, highest bound first.
+
+        The postings of each token of the most selective term, shortest name
+        first, plus the foods whose name starts with a match of the first
+        term (they get the phrase bonus). `bound` is the best score a food in
+        the list can reach, so once enough results beat it the rest of the
+        lists can be skipped.
+        """
+        best = sum(max(matches.values()) for matches in expansions)
+        selective = expansions[0]
+        sources = [(score + best - max(selective.values()), snapshot.postings[token]) for token, score in selective.items()]
+        # Only an exact or prefix match of the first term can start the name
+        sources += [(score + 1.0 + best - max(first.values()), snapshot.leading.get(token, ()))
+                    for token, score in first.items() if score > SUBSTRING]
+        sources.sort(key=itemgetter(0), reverse=True)
+        return sources
+
+    def _collect(self, snapshot, sources, checks, phrase, limit):
+        """Score candidates from `sources` until the top `limit` can no longer change, or MAX_RANKED_CANDIDATES match.
+
+        Foods tied on score with the last result may be cut in list order
+        rather than by name length.
+        """
+        names, tokens, zeros = snapshot.names, snapshot.tokens, repeat(0.0)
+        scores = {}
+        seen = set()
+        top = []  # min-heap of the best `limit` scores so far
+        for bound, ids in sources:
+            for food_id in ids:
+                # The bound and the scores add the same floats in different orders
+                if len(top) == limit and top[0] >= bound - 1e-9:
+                    return scores
+                if food_id in seen:
+                    continue
+                seen.add(food_id)
+                # Each term's best token in the name; every term has to match something
+                score = 0.0
+                for matches in checks:
+                    best = max(map(matches.get, tokens[food_id], zeros))
+                    if not best:
+                        break
+                    score += best
+                else:
+                    score += names[food_id].startswith(phrase)
+                    scores[food_id] = score
+                    if len(top) < limit:
+                        heapq.heappush(top, score)
+                    elif score > top[0]:
+                        heapq.heapreplace(top, score)
+                    if len(scores) >= MAX_RANKED_CANDIDATES:
+                        return scores
+        return scores
+
+    def search_foods(self, session, text, limit=20):
+        """Search and load the matching FoodDatabase rows in rank order."""
+        ids = self.search(session, text, limit)
+        if not ids:
+            return []
+        foods = {food.id: food for food in session.query(FoodDatabase).filter(FoodDatabase.id.in_(ids))}
+        return [foods[food_id] for food_id in ids if food_id in foods]
+
+    def attach(self):
+        """Mark the index stale whenever the ORM writes a food in this process."""
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(FoodDatabase, name, lambda mapper, connection, target: self.invalidate())
+        self._attached = True
+
+food_index = FoodSearchIndex()
@@ -0,0 +1,202 @@
+from backend.app import db
+from backend.changes import mark_changed
+from backend.models.goal import Goal
+from backend.models.workout import Workout
+from backend.models.nutrition import NutritionEntry
+from backend.models.progress import ProgressEntry
+from datetime import datetime
+from sqlalchemy import and_, bindparam, case, func, not_, or_, select, update
+
+# Goal metric -> (entry model, column summed over the goal's window; None counts entries)
+GOAL_METRICS = {
+    'weight': (ProgressEntry, ProgressEntry.weight),
+    'steps': (ProgressEntry, ProgressEntry.steps),
+    'distance': (ProgressEntry, ProgressEntry.distance),
+    'active_minutes': (ProgressEntry, ProgressEntry.active_minutes),
+    'workouts': (Workout, None),
+    'workout_minutes': (Workout, Workout.duration),
+    'calories_burned': (Workout, Workout.calories_burned),
+    'calories_consumed': (NutritionEntry, NutritionEntry.calories),
+}
+
+# Metrics whose current value is the latest entry in the window rather than a sum
+LATEST_METRICS = {'weight'}
+
+goal_table = Goal.__table__
+
+class GoalMetricError(ValueError):
+    pass
+
+def validate_metric(metric):
+    if metric is not None and metric not in GOAL_METRICS:
+        raise GoalMetricError(f"Unknown metric '{metric}', expected one of: {', '.join(GOAL_METRICS)}")
+    return metric
+
+def _metrics_for(model):
+    return [metric for metric, (source, _) in GOAL_METRICS.items() if source is model]
+
+def _value(entry, key):
+    return entry.get(key) if isinstance(entry, dict) else getattr(entry, key)
+
+def _reached():
+    c = goal_table.c
+    # A goal that starts above its target (losing weight) is reached from above
+    return case((c.start_value > c.target_value, c.current_value <= c.target_value),
+                else_=c.current_value >= c.target_value)
+
+def _update_status(goal_ids):
+    """Complete active goals that reached their target, and reopen automatically completed ones that no longer do."""
+    c = goal_table.c
+    db.session.execute(
+        update(goal_table).where(c.id.in_(goal_ids), c.status == 'active', _reached())
+        .values(status='completed', completed_at=datetime.utcnow())
+    )
+    db.session.execute(
+        update(goal_table).where(c.id.in_(goal_ids), c.status == 'completed', c.completed_at.isnot(None), not_(_reached()))
+        .values(status='active', completed_at=None)
+    )
+
+def _latest(goal, entries):
+    """The entry with the latest date inside the goal's window that has a value, or None."""
+    _, column = GOAL_METRICS[goal.metric]
+    found = None
+    for entry in entries:
+        if _value(entry, column.key) is not None and (found is None or _value(entry, 'date') >= _value(found, 'date')):
+            found = entry
+    return found
+
+def _apply(model, user_id, entries, sign):
+    c = goal_table.c
+    goals = db.session.execute(
+        select(c.id, c.metric, c.start_date, c.target_date, c.value_date)
+        .where(c.user_id == user_id, c.metric.in_(_metrics_for(model)), c.start_date.isnot(None))
+    ).all()
+    if not goals:
+        return
+
+    deltas = []
+    latest = []
+    stale = []
+    for goal in goals:
+        inside = [entry for entry in entries if goal.start_date <= _value(entry, 'date') <= goal.target_date]
+        if not inside:
+            continue
+        _, column = GOAL_METRICS[goal.metric]
+        if goal.metric in LATEST_METRICS:
+            entry = _latest(goal, inside)
+            if entry is None:
+                continue
+            if sign > 0:
+                latest.append({'goal_id': goal.id, 'value': _value(entry, column.key), 'day': _value(entry, 'date')})
+            elif goal.value_date is not None and _value(entry, 'date') >= goal.value_date:
+                stale.append(goal.id)
+        else:
+            total = sum(1 if column is None else (_value(entry, column.key) or 0) for entry in inside)
+            if total:
+                deltas.append({'goal_id': goal.id, 'delta': sign * total})
+
+    if deltas:
+        db.session.execute(
+            update(goal_table).where(c.id == bindparam('goal_id'))
+            .values(current_value=func.coalesce(c.current_value, 0) + bindparam('delta')),
+            deltas
+        )
+    if latest:
+        db.session.execute(
+            update(goal_table)
+            .where(c.id == bindparam('goal_id'), or_(c.value_date.is_(None), c.value_date <= bindparam('day')))
+            .values(current_value=bindparam('value'), value_date=bindparam('day'),
+                    start_value=func.coalesce(c.start_value, bindparam('value'))),
+            latest
+        )
+    if stale:
+        # The latest weigh-in is going away; fall back to the one before it
+        _recompute(c.id.in_(stale), exclude=[_value(entry, 'id') for entry in entries])
+
+    touched = [row['goal_id'] for row in deltas + latest] + stale
+    if touched:
+        _update_status(touched)
+        mark_changed(user_id, 'goals')
+
+def track_entry(entry):
+    """Add a workout, nutrition or progress entry to the metric goals whose window contains it."""
+    _apply(type(entry), entry.user_id, [entry], 1)
+
+def untrack_entry(entry):
+    """Remove an entry's current values from the goals it counts towards.
+
+    Call alongside retract_entry(): before deleting an entry, and before
+    changing one followed by track_entry() once the new values are set.
+    """
+    _apply(type(entry), entry.user_id, [entry], -1)
+
+def track_rows(model, rows):
+    """Add many entries, given as column dicts, with one executemany UPDATE per kind of change."""
+    by_user = {}
+    for row in rows:
+        by_user.setdefault(row['user_id'], []).append(row)
+    for user_id, user_rows in by_user.items():
+        _apply(model, user_id, user_rows, 1)
+
+def _recompute(*conditions, exclude=()):
+    """Recompute current_value for the goals matching `conditions` from raw entries; returns their ids."""
+    c = goal_table.c
+    updates = []
+    for metric, (source, column) in GOAL_METRICS.items():
+        in_window = and_(source.user_id == c.user_id, source.date >= c.start_date, source.date <= c.target_date)
+        if metric in LATEST_METRICS:
+            weighed = select(source).where(in_window, column.isnot(None))
+            if exclude:
+                weighed = weighed.where(source.id.notin_(exclude))
+            newest = weighed.order_by(source.date.desc(), source.created_at.desc()).limit(1)
+            oldest = weighed.order_by(source.date, source.created_at).limit(1)
+            query = select(
+                c.id, c.start_value,
+                newest.with_only_columns(column).scalar_subquery(),
+                newest.with_only_columns(source.date).scalar_subquery(),
+                oldest.with_only_columns(column).scalar_subquery(),
+            ).where(c.metric == metric, *conditions)
+            for goal_id, start_value, value, day, first in db.session.execute(query):
+                start_value = first if start_value is None else start_value
+                updates.append({'goal_id': goal_id, 'value': start_value if value is None else value,
+                                'day': day, 'start': start_value})
+        else:
+            amount = func.count(source.id) if column is None else func.coalesce(func.sum(column), 0)
+            query = (select(c.id, c.start_value, amount).select_from(goal_table)
+                     .outerjoin(source, in_window).where(c.metric == metric, *conditions).group_by(c.id))
+            for goal_id, start_value, value in db.session.execute(query):
+                updates.append({'goal_id': goal_id, 'value': value, 'day': None,
+                                'start': 0 if start_value is None else start_value})
+
+    if updates:
+        db.session.execute(
+            update(goal_table).where(c.id == bindparam('goal_id'))
+            .values(current_value=bindparam('value'), value_date=bindparam('day'), start_value=bindparam('start')),
+            updates
+        )
+        _update_status([row['goal_id'] for row in updates])
+    return [row['goal_id'] for row in updates]
+
+def recompute_goal(goal):
+    """Recompute one goal after its metric, window or target changed; call before committing."""
+    db.session.flush()
+    if goal.metric is not None:
+        _recompute(goal_table.c.id == goal.id)
+        db.session.refresh(goal)
+
+def recompute_goals(user_id=None, batch_size=500):
+    """Recompute every metric goal from raw entries, for one user or everyone; returns goals updated."""
+    c = goal_table.c
+    query = select(c.user_id).where(c.metric.isnot(None)).distinct()
+    if user_id:
+        query = query.where(c.user_id == user_id)
+    user_ids = db.session.execute(query).scalars().all()
+
+    updated = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        updated += len(_recompute(c.user_id.in_(batch)))
+        for uid in batch:
+            mark_changed(uid, 'goals')
+        db.session.commit()
+    return updated
@@ -0,0 +1,205 @@
+from backend.extensions import db
+from backend.changes import mark_changed
+from backend.rollups import record_entry
+from backend.goal_progress import track_entry
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from flask import current_app
+import atexit
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger('backend.group_commit')
+
+class GroupCommitTimeout(RuntimeError):
+    """The write waited GROUP_COMMIT_TIMEOUT seconds without being picked up and was not saved."""
+
+class GroupCommitter:
+    """Coalesces single-entry writes from concurrent requests into shared transactions.
+
+    With GROUP_COMMIT_ENABLED off, write() applies and commits in the request
+    as before. With it on, requests hand their write to one committer thread,
+    which gathers up to GROUP_COMMIT_MAX_BATCH writes arriving within
+    GROUP_COMMIT_WINDOW_MS of the first, opens one transaction, runs each
+    write inside its own SAVEPOINT in it and commits them together, so a
+    batch costs one fsync. A write that fails only rolls back its savepoint
+    and only its request sees the error; if the shared COMMIT fails, nothing
+    of the batch is kept and the writes are retried one transaction each.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.window = 0.002
+        self.max_batch = 64
+        self.timeout = 10
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+        self.batches = 0
+        self.writes = 0
+        self.fallbacks = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('GROUP_COMMIT_ENABLED', False)
+        app.config.setdefault('GROUP_COMMIT_WINDOW_MS', 2)
+        app.config.setdefault('GROUP_COMMIT_MAX_BATCH', 64)
+        app.config.setdefault('GROUP_COMMIT_TIMEOUT', 10)
+
+        self.enabled = app.config['GROUP_COMMIT_ENABLED']
+        self.window = app.config['GROUP_COMMIT_WINDOW_MS'] / 1000
+        self.max_batch = app.config['GROUP_COMMIT_MAX_BATCH']
+        self.timeout = app.config['GROUP_COMMIT_TIMEOUT']
+        app.extensions['group_commit'] = self
+
+    def write(self, apply, render):
+        """Run `apply()` (session changes) and commit; returns `render()`, evaluated after the flush.
+
+        Both callables may run on the committer thread, so they must only
+        touch the session through `db.session` and not read the request.
+        """
+        if not self.enabled:
+            apply()
+            db.session.flush()
+            result = render()
+            db.session.commit()
+            return result
+
+        self._ensure_started()
+        future = Future()
+        self._queue.put((apply, render, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            if future.cancel():
+                raise GroupCommitTimeout(f'Write not saved: not committed within {self.timeout}s')
+            # Its batch is already running, so wait for the outcome instead of guessing it
+            return future.result()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._app = current_app._get_current_object()
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                unit = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if unit is None:
+                self._queue.put(None)
+                break
+            batch.append(unit)
+        # A unit its request gave up on is dropped; the others can no longer be cancelled
+        return [unit for unit in batch if unit[2].set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            if not batch:
+                continue
+            with self._app.app_context():
+                try:
+                    self._commit_batch(batch)
+                except Exception as e:
+                    logger.exception('Group commit failed')
+                    db.session.rollback()
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+    def _begin(self):
+        # pysqlite only sends BEGIN before the first INSERT/UPDATE, so the
+        # savepoints below would otherwise each commit on their own
+        connection = db.session.connection()
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    def _commit_batch(self, batch):
+        results = []
+        self._begin()
+        for apply, render, future in batch:
+            # Changes marked by a write whose savepoint rolls back must not be bumped
+            changed = set(db.session.info.get('changed', ()))
+            try:
+                with db.session.begin_nested():
+                    apply()
+                    db.session.flush()
+                    results.append((future, render()))
+            except Exception as e:
+                db.session.info['changed'] = changed
+                future.set_exception(e)
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.warning('Group commit of %d writes failed; committing them one by one', len(results))
+            self._commit_each([unit for unit in batch if not unit[2].done()])
+            with self._lock:
+                self.fallbacks += 1
+            return
+
+        for future, result in results:
+            future.set_result(result)
+        with self._lock:
+            self.batches += 1
+            self.writes += len(results)
+
+    def _commit_each(self, units):
+        for apply, render, future in units:
+            try:
+                apply()
+                db.session.flush()
+                result = render()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self):
+        """Commit what is queued, then stop the committer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        atexit.unregister(self.shutdown)
+        self._queue.put(None)
+        thread.join(self.timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'batches': self.batches,
+                'writes': self.writes,
+                'averageBatch': round(self.writes / self.batches, 2) if self.batches else None,
+                'fallbacks': self.fallbacks
+            }
+
+group_committer = GroupCommitter()
+
+def save_entry(entry, resource):
+    """Insert a new workout, nutrition or progress entry with its rollup and goal updates; returns its dict."""
+    def apply():
+        db.session.add(entry)
+        record_entry(entry)
+        track_entry(entry)
+        mark_changed(entry.user_id, resource)
+
+    return group_committer.write(apply, entry.to_dict)
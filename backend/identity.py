@@ -0,0 +1,31 @@
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+from backend.app import db
+from backend.extensions import user_cache
+from backend.models.user import User
+
+# Safe to expose in a signed (but readable) token
+CLAIM_FIELDS = ('name', 'email')
+
+def _load_profile(user_id):
+    user = db.session.get(User, user_id)
+    return user.to_dict() if user else None
+
+def get_user_profile(user_id):
+    """The user's to_dict() payload, served from the request or process cache when possible."""
+    return user_cache.get(user_id, lambda: _load_profile(user_id))
+
+def user_claims(user):
+    """Extra access token claims for `user` when JWT_EMBED_USER_CLAIMS is on."""
+    if not current_app.config.get('JWT_EMBED_USER_CLAIMS'):
+        return {}
+    return {field: getattr(user, field) for field in CLAIM_FIELDS}
+
+def is_admin():
+    """Whether the caller's account has been granted admin access.
+
+    Read from the database on every call rather than from the token or the
+    profile cache, so a revoked grant takes effect immediately.
+    """
+    user = db.session.get(User, get_jwt_identity())
+    return bool(user and user.is_admin)
@@ -0,0 +1,218 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+import bisect
+import logging
+import threading
+import time
+
+logger = logging.getLogger('backend.sql')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.series = defaultdict(lambda: [[0] * (len(buckets) + 1), 0.0, 0])
+
+    def observe(self, labels, value):
+        counts, _, _ = series = self.series[labels]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+class Instrumentation:
+    """Per-request timing, SQL and ORM counters, exported at /metrics.
+
+    Every request records its latency by endpoint, the number and total time
+    of SQL statements it ran and how many ORM objects it loaded. Statements
+    slower than METRICS_SLOW_QUERY_MS are logged to `backend.sql`, and a
+    request that repeats one statement METRICS_N_PLUS_ONE_THRESHOLD times or
+    more is logged as a likely N+1.
+    """
+
+    def __init__(self, app=None):
+        self.slow_query_seconds = 0.2
+        self.n_plus_one_threshold = 10
+        self._lock = threading.Lock()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(QUERY_COUNT_BUCKETS)
+        self.requests = Counter()
+        self.sql_seconds = Counter()
+        self.orm_loads = Counter()
+        self.slow_queries = 0
+        self.n_plus_one = Counter()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_SLOW_QUERY_MS', 200)
+        app.config.setdefault('METRICS_N_PLUS_ONE_THRESHOLD', 10)
+        app.config.setdefault('METRICS_TOKEN', None)
+
+        self.slow_query_seconds = app.config['METRICS_SLOW_QUERY_MS'] / 1000
+        self.n_plus_one_threshold = app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+
+        db = app.extensions['sqlalchemy']
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+                event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self._metrics_view)
+        app.extensions['instrumentation'] = self
+
+    def _start(self):
+        g.metrics = {'start': time.perf_counter(), 'statements': 0, 'sql_seconds': 0.0,
+                     'orm_loads': 0, 'sql': Counter()}
+
+    def _finish(self, response):
+        metrics = g.pop('metrics', None)
+        if metrics is None:
+            return response
+        elapsed = time.perf_counter() - metrics['start']
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+
+        repeated = [(sql, count) for sql, count in metrics['sql'].items() if count >= self.n_plus_one_threshold]
+        for sql, count in repeated:
+            logger.warning('Possible N+1 in %s: %d x %s', endpoint, count, sql[:200])
+
+        with self._lock:
+            self.latency.observe((endpoint, method), elapsed)
+            self.statements.observe((endpoint, method), metrics['statements'])
+            self.requests[(endpoint, method, str(response.status_code))] += 1
+            self.sql_seconds[(endpoint, method)] += metrics['sql_seconds']
+            self.orm_loads[(endpoint, method)] += metrics['orm_loads']
+            if repeated:
+                self.n_plus_one[(endpoint, method)] += 1
+
+        response.headers['Server-Timing'] = (f'app;dur={elapsed * 1000:.1f}, '
+                                             f'db;dur={metrics["sql_seconds"] * 1000:.1f};desc="{metrics["statements"]} queries"')
+        return response
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def _metrics_view(self):
+        token = current_app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(self.render(), mimetype='text/plain', headers={'Cache-Control': 'no-store'})
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            _histogram(lines, 'http_request_duration_seconds', 'Request latency by endpoint.', self.latency)
+            _histogram(lines, 'db_statements_per_request', 'SQL statements issued per request.', self.statements)
+            _counter(lines, 'http_requests_total', 'Requests by endpoint and status.',
+                     self.requests, ('endpoint', 'method', 'status'))
+            _counter(lines, 'db_statement_seconds_total', 'Time spent in SQL statements.', self.sql_seconds)
+            _counter(lines, 'orm_objects_loaded_total', 'ORM instances loaded from rows.', self.orm_loads)
+            _counter(lines, 'n_plus_one_requests_total', 'Requests that repeated one statement past the threshold.',
+                     self.n_plus_one)
+            _counter(lines, 'db_slow_statements_total', 'Statements slower than METRICS_SLOW_QUERY_MS.',
+                     {(): self.slow_queries}, ())
+
+        for name, stats in _component_stats().items():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'{name}_{_snake(key)} {value}')
+        return '\n'.join(lines) + '\n'
+
+instrumentation = Instrumentation()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    for recorder in _recorders:
+        recorder.append(statement)
+    if has_request_context():
+        metrics = g.get('metrics')
+        if metrics is not None:
+            metrics['statements'] += 1
+            metrics['sql_seconds'] += elapsed
+            metrics['sql'][statement] += 1
+    if elapsed >= instrumentation.slow_query_seconds:
+        instrumentation.record_slow_query()
+        logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement[:500])
+
+@event.listens_for(Mapper, 'load')
+def _count_orm_load(target, context):
+    if has_request_context():
+        metrics = g.get('metrics')
+        if metrics is not None:
+            metrics['orm_loads'] += 1
+
+_recorders = []
+
+@contextmanager
+def capture_queries():
+    """Collect the SQL statements executed inside the block (any thread) into a list."""
+    statements = []
+    _recorders.append(statements)
+    try:
+        yield statements
+    finally:
+        _recorders.remove(statements)
+
+@contextmanager
+def assert_no_n_plus_one(max_repeats=3, max_queries=None):
+    """Fail if a statement runs more than `max_repeats` times, or more than `max_queries` run.
+
+        with assert_no_n_plus_one(max_queries=4):
+            client.get('/api/dashboard/stats', headers=headers)
+    """
+    with capture_queries() as statements:
+        yield statements
+    repeated = {sql: count for sql, count in Counter(statements).items() if count > max_repeats}
+    if repeated:
+        sql, count = max(repeated.items(), key=lambda item: item[1])
+        raise AssertionError(f'Statement ran {count} times (N+1?): {sql[:200]}')
+    if max_queries is not None and len(statements) > max_queries:
+        raise AssertionError(f'{len(statements)} queries, expected at most {max_queries}')
+
+def _component_stats():
+    extensions = current_app.extensions
+    stats = {}
+    for name, key in (('dashboard_cache', 'dashboard_cache'), ('user_cache', 'user_cache'),
+                      ('compression', 'compression'), ('jobs', 'jobs'), ('group_commit', 'group_commit')):
+        if key in extensions:
+            stats[name] = extensions[key].stats()
+    return stats
+
+def _snake(name):
+    return ''.join(f'_{char.lower()}' if char.isupper() else char for char in name)
+
+def _labels(names, values):
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+
+def _histogram(lines, name, help_text, histogram, names=('endpoint', 'method')):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for labels, (counts, total, count) in sorted(histogram.series.items()):
+        label_text = _labels(names, labels)
+        cumulative = 0
+        for bound, bucket in zip((*histogram.buckets, '+Inf'), counts):
+            cumulative += bucket
+            lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{label_text}}} {total}')
+        lines.append(f'{name}_count{{{label_text}}} {count}')
+
+def _counter(lines, name, help_text, values, names=('endpoint', 'method')):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for labels, value in sorted(values.items()):
+        label_text = _labels(names, labels)
+        lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
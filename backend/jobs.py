@@ -0,0 +1,320 @@
+from backend.extensions import db
+from backend.models.job import Job
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app, jsonify
+from sqlalchemy import select, update
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+
+logger = logging.getLogger('backend.jobs')
+
+# Job kind -> (handler, default max attempts); filled by @task in backend/tasks.py
+TASKS = {}
+
+job_table = Job.__table__
+
+def task(kind, max_attempts=3):
+    """Register `fn(payload, job_id)` as the handler for jobs of `kind`; its return value is stored as JSON."""
+    def register(fn):
+        TASKS[kind] = (fn, max_attempts)
+        return fn
+    return register
+
+def _load_tasks():
+    import backend.tasks  # noqa: F401  registers the built-in tasks
+
+def run_task(kind, payload, job_id):
+    _load_tasks()
+    fn, _ = TASKS[kind]
+    return fn(payload, job_id)
+
+_process_app = None
+
+def _run_in_process(config, kind, payload, job_id):
+    """Worker process entry point: build an app once per process and run the task inside it."""
+    global _process_app
+    if _process_app is None:
+        from backend.app import create_app
+        _process_app = create_app(config)
+    with _process_app.app_context():
+        return run_task(kind, payload, job_id)
+
+def accepted(job):
+    """202 response pointing at the job's status URL."""
+    return jsonify(job.to_dict()), 202, {'Location': f'/api/jobs/{job.id}'}
+
+class JobQueue:
+    """Persistent background jobs, stored in the `jobs` table and run by a worker pool.
+
+    Workers start with the first request (or the first enqueue), claim due
+    jobs with a conditional UPDATE so several processes can share one
+    queue, and run them in threads or, with JOBS_MODE=process, in spawned
+    worker processes. A failed job is retried after JOBS_RETRY_DELAY
+    seconds, doubling each time, until it runs out of attempts. Running jobs
+    are heartbeated; a job whose worker has been silent for
+    JOBS_LEASE_SECONDS is requeued. On shutdown workers stop claiming, get
+    JOBS_SHUTDOWN_TIMEOUT seconds to finish, and unfinished jobs are
+    requeued (or failed, if they are not safe to retry).
+    """
+
+    def __init__(self, app=None):
+        self.workers = 2
+        self.mode = 'thread'
+        self.poll_interval = 1.0
+        self.retry_delay = 5
+        self.lease = 300
+        self.shutdown_timeout = 30
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._running = set()
+        self._app = None
+        self._pool = None
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_WORKERS', 2)
+        app.config.setdefault('JOBS_MODE', 'thread')
+        app.config.setdefault('JOBS_POLL_INTERVAL', 1.0)
+        app.config.setdefault('JOBS_RETRY_DELAY', 5)
+        app.config.setdefault('JOBS_LEASE_SECONDS', 300)
+        app.config.setdefault('JOBS_SHUTDOWN_TIMEOUT', 30)
+        app.config.setdefault('JOBS_RESULT_DIR', os.path.join(app.instance_path, 'jobs'))
+
+        self.mode = app.config['JOBS_MODE']
+        if self.mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown JOBS_MODE '{self.mode}', expected 'thread' or 'process'")
+        self.workers = app.config['JOBS_WORKERS']
+        self.poll_interval = app.config['JOBS_POLL_INTERVAL']
+        self.retry_delay = app.config['JOBS_RETRY_DELAY']
+        self.lease = app.config['JOBS_LEASE_SECONDS']
+        self.shutdown_timeout = app.config['JOBS_SHUTDOWN_TIMEOUT']
+        if self.workers:
+            app.before_request(self._ensure_started)
+        app.extensions['jobs'] = self
+
+    def _ensure_started(self):
+        if not self._threads:
+            self.start(current_app._get_current_object())
+
+    def start(self, app):
+        with self._lock:
+            if self._threads or not self.workers:
+                return
+            self._app = app
+            self._stop.clear()
+            if self.mode == 'process':
+                # spawn, not fork: the web process is multi-threaded
+                context = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, args=(app,), name=f'job-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            heartbeat = threading.Thread(target=self._heartbeat, args=(app,), name='job-heartbeat', daemon=True)
+            heartbeat.start()
+            self._threads.append(heartbeat)
+            atexit.register(self.shutdown)
+
+    def enqueue(self, kind, payload=None, user_id=None, max_attempts=None, delay=0):
+        """Store a job and wake a worker; commits the current session and returns the Job."""
+        _load_tasks()
+        if kind not in TASKS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        job = Job(
+            kind=kind,
+            user_id=user_id,
+            payload=json.dumps(payload or {}),
+            max_attempts=max_attempts or TASKS[kind][1],
+            run_at=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        db.session.add(job)
+        db.session.commit()
+        if self.workers and not self._threads:
+            self.start(current_app._get_current_object())
+        self._wake.set()
+        return job
+
+    def _claim(self):
+        c = job_table.c
+        now = datetime.utcnow()
+        candidates = db.session.execute(
+            select(c.id).where(c.status == 'queued', c.run_at <= now).order_by(c.run_at, c.created_at).limit(self.workers)
+        ).scalars().all()
+        for job_id in candidates:
+            claimed = db.session.execute(
+                update(job_table).where(c.id == job_id, c.status == 'queued')
+                .values(status='running', locked_by=self.worker_id, heartbeat_at=now, started_at=now,
+                        attempts=c.attempts + 1)
+            ).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.execute(
+                    select(c.id, c.kind, c.payload, c.attempts, c.max_attempts).where(c.id == job_id)
+                ).one()
+        db.session.commit()
+        return None
+
+    def _work(self, app):
+        while not self._stop.is_set():
+            job = None
+            with app.app_context():
+                try:
+                    job = self._claim()
+                except Exception:
+                    logger.exception('Could not claim a job')
+                    db.session.rollback()
+                if job is not None:
+                    self._execute(app, job)
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _execute(self, app, job):
+        with self._lock:
+            self._running.add(job.id)
+        try:
+            payload = json.loads(job.payload or '{}')
+            if self._pool is not None:
+                config = {
+                    'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'],
+                    'JOBS_RESULT_DIR': app.config['JOBS_RESULT_DIR'],
+                    'JOBS_WORKERS': 0,
+                }
+                result = self._pool.submit(_run_in_process, config, job.kind, payload, job.id).result()
+            else:
+                result = run_task(job.kind, payload, job.id)
+        except Exception as e:
+            db.session.rollback()
+            self._failed(job, e)
+        else:
+            self._finished(job, result)
+        finally:
+            with self._lock:
+                self._running.discard(job.id)
+
+    def _owned(self, job_id):
+        c = job_table.c
+        return update(job_table).where(c.id == job_id, c.locked_by == self.worker_id, c.status == 'running')
+
+    def _finished(self, job, result):
+        db.session.execute(self._owned(job.id).values(
+            status='succeeded', result=json.dumps(result), error=None, locked_by=None, finished_at=datetime.utcnow()
+        ))
+        db.session.commit()
+        with self._lock:
+            self.succeeded += 1
+
+    def _failed(self, job, error):
+        now = datetime.utcnow()
+        message = f'{type(error).__name__}: {error}'
+        if job.attempts < job.max_attempts:
+            delay = self.retry_delay * 2 ** (job.attempts - 1)
+            logger.warning('Job %s (%s) failed, retrying in %ss: %s', job.id, job.kind, delay, message)
+            values = {'status': 'queued', 'run_at': now + timedelta(seconds=delay)}
+            counter = 'retried'
+        else:
+            logger.error('Job %s (%s) failed after %d attempts: %s', job.id, job.kind, job.attempts, message)
+            values = {'status': 'failed', 'finished_at': now}
+            counter = 'failed'
+        db.session.execute(self._owned(job.id).values(error=message, locked_by=None, **values))
+        db.session.commit()
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _heartbeat(self, app):
+        interval = max(self.lease / 3, 1)
+        while True:
+            with app.app_context():
+                try:
+                    self._beat()
+                    self.requeue_expired()
+                except Exception:
+                    logger.exception('Job heartbeat failed')
+                    db.session.rollback()
+            if self._stop.wait(interval):
+                return
+
+    def _beat(self):
+        with self._lock:
+            running = list(self._running)
+        if running:
+            c = job_table.c
+            db.session.execute(
+                update(job_table).where(c.id.in_(running), c.locked_by == self.worker_id)
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            db.session.commit()
+
+    def requeue_expired(self):
+        """Requeue running jobs whose worker stopped heartbeating, failing those out of attempts."""
+        c = job_table.c
+        now = datetime.utcnow()
+        expired = (c.status == 'running', c.heartbeat_at < now - timedelta(seconds=self.lease))
+        db.session.execute(
+            update(job_table).where(*expired, c.attempts >= c.max_attempts)
+            .values(status='failed', error='Worker stopped responding', locked_by=None, finished_at=now)
+        )
+        db.session.execute(update(job_table).where(*expired).values(status='queued', locked_by=None, run_at=now))
+        db.session.commit()
+
+    def shutdown(self, timeout=None):
+        """Stop claiming jobs and wait for running ones; whatever is still running afterwards is released."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        atexit.unregister(self.shutdown)
+        self._stop.set()
+        self._wake.set()
+        deadline = time.monotonic() + (self.shutdown_timeout if timeout is None else timeout)
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        with self._lock:
+            unfinished = list(self._running)
+        if unfinished:
+            c = job_table.c
+            with self._app.app_context():
+                owned = (c.id.in_(unfinished), c.locked_by == self.worker_id, c.status == 'running')
+                # A job that is not safe to retry may have done part of its work
+                db.session.execute(
+                    update(job_table).where(*owned, c.max_attempts <= 1)
+                    .values(status='failed', error='Interrupted by shutdown', locked_by=None,
+                            finished_at=datetime.utcnow())
+                )
+                db.session.execute(
+                    update(job_table).where(*owned)
+                    .values(status='queued', locked_by=None, attempts=c.attempts - 1, run_at=datetime.utcnow())
+                )
+                db.session.commit()
+            logger.warning('Released %d unfinished job(s) on shutdown', len(unfinished))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': len(self._threads) - 1 if self._threads else 0,
+                'running': len(self._running),
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'retried': self.retried
+            }
+
+job_queue = JobQueue()
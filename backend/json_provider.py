@@ -0,0 +1,47 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Responses have the same shape and field names as the stdlib provider's:
+    sorted keys, compact separators and a trailing newline. Dates and
+    datetimes are handed to Flask's default hook so they keep the HTTP date
+    format; anything else orjson can't encode goes there too. The bytes are
+    not always identical: non-ASCII text is sent as UTF-8 instead of \\u
+    escapes, and NaN/Infinity become null instead of the non-standard
+    literals the stdlib writes.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj, 0).decode()
+
+    def _encode(self, obj, extra_options):
+        options = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | extra_options
+        return orjson.dumps(obj, default=self.default, option=options)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._encode(obj, (orjson.OPT_INDENT_2 if pretty else 0) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json(app):
+    """Install the provider named by JSON_PROVIDER: 'auto', 'orjson' or 'stdlib'."""
+    app.config.setdefault('JSON_PROVIDER', 'auto')
+    choice = app.config['JSON_PROVIDER']
+    if choice not in ('auto', 'orjson', 'stdlib'):
+        raise ValueError(f"Unknown JSON_PROVIDER '{choice}'")
+    if choice == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+
+    if choice != 'stdlib' and orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = DefaultJSONProvider(app)
@@ -0,0 +1,232 @@
+from backend.app import db
+from backend.models.workout import Workout
+from backend.models.nutrition import NutritionEntry
+from backend.models.progress import ProgressEntry
+from backend.models.goal import Goal
+from backend.models.daily_summary import DailySummary
+from backend.models.tombstone import Tombstone
+from datetime import date, timedelta
+from functools import partial
+from sqlalchemy import String, create_engine, func, inspect, select, tuple_, update
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateColumn
+
+# Indexes superseded by a newer definition; dropped wherever they still exist
+RETIRED_INDEXES = {
+    'workouts': ['ix_workouts_user_id_date'],
+    'nutrition_entries': ['ix_nutrition_entries_user_id_date'],
+    'progress_entries': ['ix_progress_entries_user_id_date'],
+    'goals': ['ix_goals_user_id_created_at'],
+}
+
+def ensure_indexes():
+    """Create any index declared on the models that the database is missing.
+
+    `db.create_all()` only creates indexes together with their table, so
+    databases created before an index was added never get it otherwise.
+    """
+    created = []
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for name in RETIRED_INDEXES.get(table.name, []):
+            if name in existing:
+                db.session.execute(db.text(f'DROP INDEX {name}'))
+        db.session.commit()
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                created.append(index.name)
+
+    return created
+
+def _backfill_food_name_keys():
+    from backend.models.nutrition import FoodDatabase, normalize_food_name
+    table = FoodDatabase.__table__
+    rows = db.session.execute(select(table.c.id, table.c.name)).all()
+    if rows:
+        db.session.execute(
+            update(table).where(table.c.id == db.bindparam('food_id')).values(name_key=db.bindparam('key')),
+            [{'food_id': food_id, 'key': normalize_food_name(name)} for food_id, name in rows]
+        )
+    db.session.commit()
+
+def _backfill_goal_start_dates():
+    table = Goal.__table__
+    rows = db.session.execute(select(table.c.id, table.c.created_at).where(table.c.created_at.isnot(None))).all()
+    if rows:
+        db.session.execute(
+            update(table).where(table.c.id == db.bindparam('goal_id')).values(start_date=db.bindparam('day')),
+            [{'goal_id': goal_id, 'day': created_at.date()} for goal_id, created_at in rows]
+        )
+    db.session.commit()
+
+def _backfill_updated_at(table):
+    db.session.execute(db.text(f'UPDATE {table} SET updated_at = created_at'))
+    db.session.commit()
+
+def _backfill_sync_version(table):
+    # Rows written before sync existed are all part of a client's first sync
+    db.session.execute(db.text(f'UPDATE {table} SET sync_version = 0'))
+    db.session.commit()
+
+# Fills a column added by ensure_columns() on a table that already had rows
+COLUMN_BACKFILLS = {
+    ('food_database', 'name_key'): _backfill_food_name_keys,
+    ('goals', 'start_date'): _backfill_goal_start_dates,
+}
+for _table in ('workouts', 'nutrition_entries', 'progress_entries', 'goals'):
+    COLUMN_BACKFILLS[(_table, 'updated_at')] = partial(_backfill_updated_at, _table)
+    COLUMN_BACKFILLS[(_table, 'sync_version')] = partial(_backfill_sync_version, _table)
+
+def ensure_columns():
+    """Add columns declared on the models that existing tables are missing.
+
+    New columns are added with ALTER TABLE ... ADD COLUMN, so they have to be
+    nullable or carry a server default. Backfills run once every column is
+    in place, since their UPDATEs also set the columns' onupdate values.
+    """
+    added = []
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+            db.session.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+            db.session.commit()
+            added.append((table.name, column.name))
+
+    for key in added:
+        backfill = COLUMN_BACKFILLS.get(key)
+        if backfill:
+            backfill()
+    return [f'{table}.{column}' for table, column in added]
+
+def widen_column_ddl(table, column, dialect):
+    """ALTER TABLE statement that changes `column` to its declared type, or None if the dialect has no syntax for it."""
+    type_ddl = column.type.compile(dialect=dialect)
+    if dialect.name == 'postgresql':
+        return f'ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE {type_ddl}'
+    if dialect.name in ('mysql', 'mariadb'):
+        null = 'NULL' if column.nullable else 'NOT NULL'
+        return f'ALTER TABLE {table.name} MODIFY COLUMN {column.name} {type_ddl} {null}'
+    return None
+
+def widen_columns():
+    """Lengthen VARCHAR columns that are shorter in the database than on the models.
+
+    Neither `db.create_all()` nor `ensure_columns()` touches existing
+    columns, so a widened String(n) would otherwise keep rejecting or
+    truncating long values. SQLite doesn't enforce lengths and is skipped.
+    """
+    dialect = db.engine.dialect
+    if dialect.name == 'sqlite':
+        return []
+    widened = []
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        lengths = {column['name']: getattr(column['type'], 'length', None) for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            current = lengths.get(column.name)
+            if not isinstance(column.type, String) or not column.type.length or not current or current >= column.type.length:
+                continue
+            ddl = widen_column_ddl(table, column, dialect)
+            if ddl is None:
+                continue
+            db.session.execute(db.text(ddl))
+            db.session.commit()
+            widened.append(f'{table.name}.{column.name}')
+    return widened
+
+def upgrade():
+    """Bring the schema up to date; returns a list of human readable steps taken."""
+    from backend.rollups import rebuild_daily_summaries
+
+    steps = []
+    had_rollups = inspect(db.engine).has_table('daily_summary')
+    # Replicas get the schema through replication, not from here
+    db.create_all(bind_key=None)
+    for name in ensure_columns():
+        steps.append(f'Added column {name}')
+    for name in widen_columns():
+        steps.append(f'Widened column {name}')
+    for name in ensure_indexes():
+        steps.append(f'Created index {name}')
+    if not had_rollups:
+        # Existing entries predate the rollup table, so backfill it once
+        rows = rebuild_daily_summaries()
+        steps.append(f'Built {rows} daily summaries')
+    return steps
+
+def init_database():
+    """Migrate the schema and load the sample data; safe to run repeatedly."""
+    from backend.seed_data import seed_sample_data
+    steps = upgrade()
+    seed_sample_data()
+    return steps
+
+def _hot_queries():
+    user_id = '00000000-0000-0000-0000-000000000000'
+    row_id = 'ffffffff-ffff-ffff-ffff-ffffffffffff'
+    week_ago = date.today() - timedelta(days=7)
+    queries = []
+
+    for model, column in ((Workout, Workout.date), (NutritionEntry, NutritionEntry.date),
+                          (ProgressEntry, ProgressEntry.date), (Goal, Goal.created_at)):
+        name = model.__tablename__
+        ordered = select(model).where(model.user_id == user_id).order_by(column.desc(), model.id.desc())
+        queries.append((f'{name}: list', ordered))
+        queries.append((f'{name}: page', ordered.where(tuple_(column, model.id) < tuple_(week_ago, row_id)).limit(51)))
+
+    for model in (Workout, NutritionEntry, ProgressEntry):
+        name = model.__tablename__
+        queries.append((f'{name}: weekly', select(func.count()).select_from(model).where(model.user_id == user_id, model.date >= week_ago)))
+
+    for model in (Workout, NutritionEntry, ProgressEntry, Goal, Tombstone):
+        name = model.__tablename__
+        queries.append((f'{name}: sync', select(model).where(model.user_id == user_id, model.sync_version > 0)
+                        .order_by(model.sync_version, model.id).limit(501)))
+
+    queries.append(('daily_summary: totals', select(func.sum(DailySummary.steps)).where(DailySummary.user_id == user_id)))
+    return queries
+
+def explain_query_plan(statement, connection):
+    sql = str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').all()
+    return [row[-1] for row in rows]
+
+def check_index_coverage():
+    """Return (query name, plan) pairs for hot queries that scan a table or sort in a temp b-tree."""
+    if db.engine.dialect.name != 'sqlite':
+        return []
+
+    problems = []
+    # pysqlite caches prepared statements per connection, and a cached EXPLAIN keeps
+    # reporting the plan from before an index was created, so use a new connection
+    engine = create_engine(db.engine.url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            for name, statement in _hot_queries():
+                plan = explain_query_plan(statement, connection)
+                for step in plan:
+                    full_scan = step.startswith('SCAN') and 'INDEX' not in step
+                    if full_scan or 'TEMP B-TREE' in step:
+                        problems.append((name, plan))
+                        break
+    finally:
+        engine.dispose()
+    return problems
@@ -0,0 +1,35 @@
+from backend.app import db
+
+class DailySummary(db.Model):
+    __tablename__ = 'daily_summary'
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    workout_count = db.Column(db.Integer, nullable=False, default=0)
+    calories_burned = db.Column(db.Integer, nullable=False, default=0)
+    nutrition_count = db.Column(db.Integer, nullable=False, default=0)
+    calories_consumed = db.Column(db.Integer, nullable=False, default=0)
+    protein = db.Column(db.Float, nullable=False, default=0)
+    carbs = db.Column(db.Float, nullable=False, default=0)
+    fats = db.Column(db.Float, nullable=False, default=0)
+    progress_count = db.Column(db.Integer, nullable=False, default=0)
+    steps = db.Column(db.Integer, nullable=False, default=0)
+    distance = db.Column(db.Float, nullable=False, default=0)  # in km
+    active_minutes = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'userId': self.user_id,
+            'date': self.date.isoformat() if self.date else None,
+            'workoutCount': self.workout_count,
+            'caloriesBurned': self.calories_burned,
+            'nutritionCount': self.nutrition_count,
+            'caloriesConsumed': self.calories_consumed,
+            'protein': self.protein,
+            'carbs': self.carbs,
+            'fats': self.fats,
+            'progressCount': self.progress_count,
+            'steps': self.steps,
+            'distance': self.distance,
+            'activeMinutes': self.active_minutes
+        }
@@ -1,9 +1,15 @@
 from backend.app import db
 from datetime import datetime
+from sqlalchemy import null
 import uuid
 
 class Goal(db.Model):
     __tablename__ = 'goals'
+    __table_args__ = (
+        db.Index('ix_goals_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_goals_user_id_metric', 'user_id', 'metric'),
+        db.Index('ix_goals_user_id_sync_version_id', 'user_id', 'sync_version', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -15,7 +21,14 @@ class Goal(db.Model):
     category = db.Column(db.String(50), nullable=False)
     target_date = db.Column(db.Date, nullable=False)
     status = db.Column(db.String(20), default='active')  # active, completed, paused
+    metric = db.Column(db.String(30))  # see backend.goal_progress.GOAL_METRICS; None for manually updated goals
+    start_date = db.Column(db.Date)  # entries from start_date to target_date count towards the goal
+    start_value = db.Column(db.Float)
+    value_date = db.Column(db.Date)  # date of the weigh-in behind current_value (weight goals)
+    completed_at = db.Column(db.DateTime)  # set when the goal was completed automatically
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sync_version = db.Column(db.Integer, onupdate=null())  # stamped on commit, see backend/sync.py
     
     def to_dict(self):
         return {
@@ -29,5 +42,10 @@ class Goal(db.Model):
             'category': self.category,
             'targetDate': self.target_date.isoformat() if self.target_date else None,
             'status': self.status,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
+            'metric': self.metric,
+            'startDate': self.start_date.isoformat() if self.start_date else None,
+            'startValue': self.start_value,
+            'completedAt': self.completed_at.isoformat() if self.completed_at else None,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
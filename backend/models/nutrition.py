@@ -1,9 +1,14 @@
 from backend.app import db
 from datetime import datetime
+from sqlalchemy import null
 import uuid
 
 class NutritionEntry(db.Model):
     __tablename__ = 'nutrition_entries'
+    __table_args__ = (
+        db.Index('ix_nutrition_entries_user_id_date_id', 'user_id', 'date', 'id'),
+        db.Index('ix_nutrition_entries_user_id_sync_version_id', 'user_id', 'sync_version', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -16,6 +21,8 @@ class NutritionEntry(db.Model):
     date = db.Column(db.Date, nullable=False)
     meal_type = db.Column(db.String(20), nullable=False)  # breakfast, lunch, dinner, snack
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sync_version = db.Column(db.Integer, onupdate=null())  # stamped on commit, see backend/sync.py
     
     def to_dict(self):
         return {
@@ -29,18 +36,28 @@ class NutritionEntry(db.Model):
             'serving': self.serving,
             'date': self.date.isoformat() if self.date else None,
             'mealType': self.meal_type,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
 
+def normalize_food_name(name):
+    return ' '.join(name.split()).lower()
+
+def _name_key_default(context):
+    return normalize_food_name(context.get_current_parameters()['name'])
+
 class FoodDatabase(db.Model):
     __tablename__ = 'food_database'
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
+    name_key = db.Column(db.String(100), index=True, default=_name_key_default)  # normalized name used for dedup
     calories = db.Column(db.Integer, nullable=False)  # per 100g
     protein = db.Column(db.Float, default=0)  # per 100g
     carbs = db.Column(db.Float, default=0)  # per 100g
     fats = db.Column(db.Float, default=0)  # per 100g
+    # Bumped by every UPDATE, ORM or Core, so the search index can spot renames from any process
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0', onupdate=db.text('revision + 1'))
     
     def to_dict(self):
         return {
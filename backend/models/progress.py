@@ -1,9 +1,14 @@
 from backend.app import db
 from datetime import datetime
+from sqlalchemy import null
 import uuid
 
 class ProgressEntry(db.Model):
     __tablename__ = 'progress_entries'
+    __table_args__ = (
+        db.Index('ix_progress_entries_user_id_date_id', 'user_id', 'date', 'id'),
+        db.Index('ix_progress_entries_user_id_sync_version_id', 'user_id', 'sync_version', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -14,6 +19,8 @@ class ProgressEntry(db.Model):
     active_minutes = db.Column(db.Integer, default=0)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sync_version = db.Column(db.Integer, onupdate=null())  # stamped on commit, see backend/sync.py
     
     def to_dict(self):
         return {
@@ -25,5 +32,6 @@ class ProgressEntry(db.Model):
             'distance': self.distance,
             'activeMinutes': self.active_minutes,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -0,0 +1,11 @@
+from backend.app import db
+from datetime import datetime
+
+class ResourceVersion(db.Model):
+    """Per-user change counter for a resource ('workouts', 'goals', ...), bumped on every committed write."""
+    __tablename__ = 'resource_versions'
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    resource = db.Column(db.String(32), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
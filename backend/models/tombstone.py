@@ -0,0 +1,15 @@
+from backend.app import db
+from datetime import datetime
+
+class Tombstone(db.Model):
+    """A deleted workout, nutrition entry, progress entry or goal, kept so sync clients learn about the delete."""
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_user_id_sync_version_id', 'user_id', 'sync_version', 'id'),
+    )
+
+    id = db.Column(db.String(36), primary_key=True)  # id of the deleted row
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    resource = db.Column(db.String(32), nullable=False)  # workouts, nutrition, progress or goals
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sync_version = db.Column(db.Integer)  # stamped on commit, see backend/sync.py
@@ -1,5 +1,5 @@
 from backend.app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from backend.passwords import password_hasher
 from datetime import datetime
 import uuid
 
@@ -8,13 +8,14 @@ class User(db.Model):
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     age = db.Column(db.Integer)
     gender = db.Column(db.String(20))
     height = db.Column(db.Float)  # in cm
     weight = db.Column(db.Float)  # in kg
     fitness_goals = db.Column(db.JSON)
+    is_admin = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())  # granted with `flask grant-admin`
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -24,10 +25,13 @@ class User(db.Model):
     progress_entries = db.relationship('ProgressEntry', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -1,9 +1,14 @@
 from backend.app import db
 from datetime import datetime
+from sqlalchemy import null
 import uuid
 
 class Workout(db.Model):
     __tablename__ = 'workouts'
+    __table_args__ = (
+        db.Index('ix_workouts_user_id_date_id', 'user_id', 'date', 'id'),
+        db.Index('ix_workouts_user_id_sync_version_id', 'user_id', 'sync_version', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -16,6 +21,8 @@ class Workout(db.Model):
     date = db.Column(db.Date, nullable=False)
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sync_version = db.Column(db.Integer, onupdate=null())  # stamped on commit, see backend/sync.py
     
     def to_dict(self):
         return {
@@ -29,5 +36,6 @@ class Workout(db.Model):
             'caloriesBurned': self.calories_burned,
             'date': self.date.isoformat() if self.date else None,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -0,0 +1,92 @@
+from flask import request, jsonify
+from sqlalchemy import tuple_
+from datetime import date, datetime, time, timedelta
+from urllib.parse import urlencode
+import base64
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+class PaginationError(ValueError):
+    pass
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise PaginationError(f"Invalid '{name}' date, expected YYYY-MM-DD")
+
+def _is_datetime(column):
+    return getattr(column.type, 'python_type', None) is datetime
+
+def encode_cursor(sort_value, row_id):
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, sort_column):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if _is_datetime(sort_column):
+            return datetime.fromisoformat(sort_value), row_id
+        return date.fromisoformat(sort_value), row_id
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+def apply_date_range(query, sort_column, date_from=None, date_to=None):
+    if date_from:
+        start = _parse_date(date_from, 'from')
+        if _is_datetime(sort_column):
+            start = datetime.combine(start, time.min)
+        query = query.filter(sort_column >= start)
+    if date_to:
+        end = _parse_date(date_to, 'to')
+        if _is_datetime(sort_column):
+            query = query.filter(sort_column < datetime.combine(end + timedelta(days=1), time.min))
+        else:
+            query = query.filter(sort_column <= end)
+    return query
+
+def paginate(query, sort_column, id_column):
+    """Keyset-paginate `query` newest first on (sort_column, id_column).
+
+    Without `limit` or `cursor` in the request the whole (date filtered) result
+    is returned, which keeps the list endpoints backwards compatible.
+    """
+    args = request.args
+    query = apply_date_range(query, sort_column, args.get('from'), args.get('to'))
+    query = query.order_by(sort_column.desc(), id_column.desc())
+
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None and cursor is None:
+        return query.all(), None
+
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_LIMIT
+    except ValueError:
+        raise PaginationError("'limit' must be an integer")
+    if limit < 1 or limit > MAX_LIMIT:
+        raise PaginationError(f"'limit' must be between 1 and {MAX_LIMIT}")
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+def page_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return response
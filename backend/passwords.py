@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import generate_password_hash, check_password_hash
+import bcrypt
+import multiprocessing
+import threading
+
+# Default cost per method: pbkdf2 iterations, bcrypt log2 rounds, scrypt N
+DEFAULT_ROUNDS = {
+    'pbkdf2': 600000,
+    'bcrypt': 12,
+    'scrypt': 32768,
+}
+
+class PasswordHasherBusy(Exception):
+    pass
+
+def hash_password(password, method, rounds):
+    if method == 'bcrypt':
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+    if method == 'scrypt':
+        return generate_password_hash(password, f'scrypt:{rounds}:8:1')
+    if method == 'pbkdf2':
+        return generate_password_hash(password, f'pbkdf2:sha256:{rounds}')
+    raise ValueError(f"Unknown password hash method '{method}'")
+
+def verify_password(password, hashed):
+    if hashed.startswith('$2'):
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    return check_password_hash(hashed, password)
+
+def hash_parameters(hashed):
+    """Return (method, rounds) encoded in a stored hash, or (None, None)."""
+    try:
+        if hashed.startswith('$2'):
+            return 'bcrypt', int(hashed.split('$')[2])
+        spec = hashed.split('$', 1)[0].split(':')
+        if spec[0] == 'scrypt':
+            return 'scrypt', int(spec[1])
+        if spec[0] == 'pbkdf2':
+            method = 'pbkdf2' if spec[1] == 'sha256' else f'pbkdf2:{spec[1]}'
+            return method, int(spec[2]) if len(spec) > 2 else None
+    except (IndexError, ValueError):
+        pass
+    return None, None
+
+class PasswordHasher:
+    """Hashes and verifies passwords, optionally in a bounded process pool.
+
+    PASSWORD_HASH_METHOD (pbkdf2, bcrypt or scrypt) and PASSWORD_HASH_ROUNDS
+    pick the algorithm and cost. With PASSWORD_HASH_WORKERS > 0 the KDF runs
+    in that many worker processes so it doesn't hold the GIL of a web worker;
+    at most PASSWORD_HASH_MAX_PENDING jobs may be queued or running, beyond
+    which PasswordHasherBusy is raised instead of piling up requests.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'pbkdf2'
+        self.rounds = DEFAULT_ROUNDS['pbkdf2']
+        self.workers = 0
+        self.timeout = 30
+        self._slots = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2')
+        app.config.setdefault('PASSWORD_HASH_ROUNDS', None)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', 0)
+        app.config.setdefault('PASSWORD_HASH_MAX_PENDING', 64)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 30)
+
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        if self.method not in DEFAULT_ROUNDS:
+            raise ValueError(f"Unknown PASSWORD_HASH_METHOD '{self.method}'")
+        self.rounds = app.config['PASSWORD_HASH_ROUNDS'] or DEFAULT_ROUNDS[self.method]
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+        app.extensions['password_hasher'] = self
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the web process is multi-threaded
+                context = multiprocessing.get_context('spawn')
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many password operations in progress')
+        try:
+            return self._executor().submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeout:
+            raise PasswordHasherBusy('Password operation timed out')
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.method, self.rounds)
+
+    def verify(self, password, hashed):
+        return self._run(verify_password, password, hashed)
+
+    def needs_rehash(self, hashed):
+        return hash_parameters(hashed) != (self.method, self.rounds)
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+password_hasher = PasswordHasher()
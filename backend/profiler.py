@@ -0,0 +1,136 @@
+from collections import Counter
+from flask import request
+import sys
+import threading
+import time
+
+class ProfilerBusy(Exception):
+    def __init__(self, retry_after):
+        super().__init__('A profile was captured recently or is still running')
+        self.retry_after = retry_after
+
+class SamplingProfiler:
+    """On-demand wall-clock sampler producing collapsed stacks.
+
+    While a capture runs, a background thread reads `sys._current_frames()`
+    every PROFILER_INTERVAL_MS and counts the stacks of threads that are
+    serving a request. Captures either sample every request for a number of
+    seconds, or only the next N requests to one endpoint. Only one capture
+    runs at a time and a new one may start PROFILER_COOLDOWN seconds after
+    the last. With PROFILER_ENABLED off no hooks are installed at all, and
+    while idle they return after one attribute check.
+    """
+
+    def __init__(self, app=None):
+        self.interval = 0.005
+        self.cooldown = 60
+        self.max_seconds = 30
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_started = None
+        self._endpoint = None
+        self._threads = set()
+        self._remaining = 0
+        self._done = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILER_ENABLED', False)
+        app.config.setdefault('PROFILER_INTERVAL_MS', 5)
+        app.config.setdefault('PROFILER_COOLDOWN', 60)
+        app.config.setdefault('PROFILER_MAX_SECONDS', 30)
+
+        self.interval = app.config['PROFILER_INTERVAL_MS'] / 1000
+        self.cooldown = app.config['PROFILER_COOLDOWN']
+        self.max_seconds = app.config['PROFILER_MAX_SECONDS']
+        if app.config['PROFILER_ENABLED']:
+            app.before_request(self._enter)
+            app.teardown_request(self._leave)
+        app.extensions['profiler'] = self
+
+    def _matches(self, endpoint):
+        if self._endpoint == '*':
+            return True
+        return endpoint is not None and (endpoint == self._endpoint or endpoint.endswith('.' + self._endpoint))
+
+    def _enter(self):
+        if self._endpoint is None:
+            return
+        if self._matches(request.endpoint):
+            with self._lock:
+                self._threads.add(threading.get_ident())
+
+    def _leave(self, exc):
+        if self._endpoint is None:
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            if ident not in self._threads:
+                return
+            self._threads.discard(ident)
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self._done.set()
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._running:
+                raise ProfilerBusy(self.max_seconds)
+            if self._last_started is not None and now - self._last_started < self.cooldown:
+                raise ProfilerBusy(int(self.cooldown - (now - self._last_started)) + 1)
+            self._running = True
+            self._last_started = now
+
+    def capture(self, seconds=None, endpoint=None, requests=None):
+        """Sample for `seconds`, or until `requests` requests to `endpoint` finish (capped at max_seconds).
+
+        Returns (collapsed stack lines, number of samples).
+        """
+        self._reserve()
+        stacks = Counter()
+        stop = threading.Event()
+        try:
+            with self._lock:
+                self._threads = set()
+                self._remaining = (requests or 1) if endpoint else float('inf')
+                self._done.clear()
+                self._endpoint = endpoint or '*'
+
+            sampler = threading.Thread(target=self._sample, args=(stacks, stop), name='profiler', daemon=True)
+            sampler.start()
+            limit = min(seconds or self.max_seconds, self.max_seconds)
+            self._done.wait(limit)
+            stop.set()
+            sampler.join()
+        finally:
+            with self._lock:
+                self._endpoint = None
+                self._threads = set()
+                self._running = False
+
+        lines = [f'{stack} {count}' for stack, count in stacks.most_common()]
+        return lines, sum(stacks.values())
+
+    def _sample(self, stacks, stop):
+        while not stop.wait(self.interval):
+            with self._lock:
+                targets = list(self._threads)
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for ident in targets:
+                frame = frames.get(ident)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+profiler = SamplingProfiler()
@@ -0,0 +1,150 @@
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+REPLICA_BIND_PREFIX = 'replica_'
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica engine when a handler asks for it.
+
+    `replica_reads` stores the chosen engine in `session.info['replica']`;
+    flushes (and any session without one) keep using the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get('replica')
+        if replica is not None and bind is None and not self._flushing:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class ReplicaRouter:
+    """Chooses between the primary and the DATABASE_REPLICA_URLS binds.
+
+    A user whose writes committed less than REPLICA_READ_YOUR_WRITES seconds
+    ago reads from the primary, so they never see a replica that is behind
+    their own changes. Writes made through this process are remembered in
+    memory; for the rest, the primary's resource_versions rows say when the
+    user last wrote from any process.
+    """
+
+    def __init__(self, app=None):
+        self.bind_keys = []
+        self.window = 5
+        self._last_write = {}
+        self._lock = threading.Lock()
+        self._sync_thread = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register replica binds; call before db.init_app(app)."""
+        app.config.setdefault('DATABASE_REPLICA_URLS', [])
+        app.config.setdefault('REPLICA_READ_YOUR_WRITES', 5)
+        app.config.setdefault('REPLICA_SIMULATED_LAG', 0)
+
+        urls = app.config['DATABASE_REPLICA_URLS']
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        self.bind_keys = []
+        for index, url in enumerate(urls):
+            key = f'{REPLICA_BIND_PREFIX}{index}'
+            binds[key] = url
+            self.bind_keys.append(key)
+        app.config['SQLALCHEMY_BINDS'] = binds
+        self.window = app.config['REPLICA_READ_YOUR_WRITES']
+        app.extensions['replica_router'] = self
+
+        if urls and app.config['REPLICA_SIMULATED_LAG']:
+            self.start_lag_simulation(app.config['SQLALCHEMY_DATABASE_URI'], urls,
+                                      app.config['REPLICA_SIMULATED_LAG'])
+
+    @property
+    def enabled(self):
+        return bool(self.bind_keys)
+
+    def record_write(self, user_id):
+        with self._lock:
+            self._last_write[user_id] = time.monotonic()
+            if len(self._last_write) > 10000:
+                cutoff = time.monotonic() - self.window
+                self._last_write = {uid: at for uid, at in self._last_write.items() if at > cutoff}
+
+    def wrote_recently(self, user_id, session=None):
+        """Whether `user_id` committed a write within the window, asking the primary through `session` if given."""
+        at = self._last_write.get(user_id)
+        if at is not None and time.monotonic() - at < self.window:
+            return True
+        if session is None:
+            return False
+        from backend.models.resource_version import ResourceVersion
+        table = ResourceVersion.__table__
+        last = session.execute(select(func.max(table.c.updated_at)).where(table.c.user_id == user_id)).scalar()
+        return last is not None and datetime.utcnow() - last < timedelta(seconds=self.window)
+
+    def choose(self, db, user_id=None):
+        """The engine a read-only request should use, or None for the primary."""
+        if not self.bind_keys or (user_id is not None and self.wrote_recently(user_id, db.session)):
+            return None
+        return db.engines[random.choice(self.bind_keys)]
+
+    def start_lag_simulation(self, primary_url, replica_urls, lag):
+        """Copy a SQLite primary onto SQLite replicas every `lag` seconds (local testing only)."""
+        paths = [make_url(url).database for url in (primary_url, *replica_urls)]
+        if any(make_url(url).get_backend_name() != 'sqlite' for url in (primary_url, *replica_urls)):
+            raise ValueError('REPLICA_SIMULATED_LAG needs SQLite primary and replica URLs')
+        if self._sync_thread is not None:
+            return
+
+        def copy_forever():
+            while True:
+                time.sleep(lag)
+                sync_sqlite_replicas(paths[0], paths[1:])
+
+        self._sync_thread = threading.Thread(target=copy_forever, name='replica-lag', daemon=True)
+        self._sync_thread.start()
+
+def sync_sqlite_replicas(primary_path, replica_paths):
+    """Bring SQLite replica files up to date with the primary using the backup API."""
+    source = sqlite3.connect(primary_path)
+    try:
+        for path in replica_paths:
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+    finally:
+        source.close()
+
+replica_router = ReplicaRouter()
+
+def replica_reads(view):
+    """Run a read-only handler against a replica, unless the caller just wrote."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not replica_router.enabled:
+            return view(*args, **kwargs)
+
+        db = current_app.extensions['sqlalchemy']
+        try:
+            user_id = get_jwt_identity()
+        except RuntimeError:
+            user_id = None
+        engine = replica_router.choose(db, user_id)
+        if engine is None:
+            return view(*args, **kwargs)
+
+        db.session.info['replica'] = engine
+        try:
+            return view(*args, **kwargs)
+        finally:
+            db.session.info.pop('replica', None)
+    return wrapper
@@ -0,0 +1,182 @@
+from backend.app import db
+from backend.models.daily_summary import DailySummary
+from backend.models.workout import Workout
+from backend.models.nutrition import NutritionEntry
+from backend.models.progress import ProgressEntry
+from backend.models.user import User
+from collections import defaultdict
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+# Summary column -> source column it sums (None counts entries)
+ROLLUP_SOURCES = {
+    Workout: {
+        'workout_count': None,
+        'calories_burned': Workout.calories_burned,
+    },
+    NutritionEntry: {
+        'nutrition_count': None,
+        'calories_consumed': NutritionEntry.calories,
+        'protein': NutritionEntry.protein,
+        'carbs': NutritionEntry.carbs,
+        'fats': NutritionEntry.fats,
+    },
+    ProgressEntry: {
+        'progress_count': None,
+        'steps': ProgressEntry.steps,
+        'distance': ProgressEntry.distance,
+        'active_minutes': ProgressEntry.active_minutes,
+    },
+}
+
+COUNT_COLUMNS = ('workout_count', 'nutrition_count', 'progress_count')
+SUM_COLUMNS = [name for fields in ROLLUP_SOURCES.values() for name in fields if name not in COUNT_COLUMNS]
+FLOAT_TOLERANCE = 1e-6
+
+summary_table = DailySummary.__table__
+
+def _value(entry, key):
+    value = entry.get(key) if isinstance(entry, dict) else getattr(entry, key)
+    return value or 0
+
+def _entry_deltas(model, entry, sign):
+    deltas = {}
+    for name, column in ROLLUP_SOURCES[model].items():
+        deltas[name] = sign * (1 if column is None else _value(entry, column.key))
+    return deltas
+
+def _apply(user_id, day, deltas, create):
+    where = (summary_table.c.user_id == user_id, summary_table.c.date == day)
+    changes = {name: summary_table.c[name] + delta for name, delta in deltas.items()}
+    result = db.session.execute(update(summary_table).where(*where).values(changes))
+    if result.rowcount or not create:
+        return
+
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(summary_table).values(user_id=user_id, date=day, **deltas))
+    except IntegrityError:
+        # Another transaction created the row first
+        db.session.execute(update(summary_table).where(*where).values(changes))
+
+def _prune(user_id, day):
+    db.session.execute(delete(summary_table).where(
+        summary_table.c.user_id == user_id,
+        summary_table.c.date == day,
+        *(summary_table.c[name] == 0 for name in COUNT_COLUMNS)
+    ))
+
+def record_entry(entry):
+    """Add a workout, nutrition or progress entry to its day's summary."""
+    model = type(entry)
+    _apply(entry.user_id, entry.date, _entry_deltas(model, entry, 1), create=True)
+
+def retract_entry(entry):
+    """Remove an entry's current values from its day's summary.
+
+    Call before deleting an entry, and before changing an entry followed by
+    record_entry() once the new values are set.
+    """
+    model = type(entry)
+    _apply(entry.user_id, entry.date, _entry_deltas(model, entry, -1), create=False)
+    _prune(entry.user_id, entry.date)
+
+def record_rows(model, rows):
+    """Add many entries, given as column dicts, using one executemany UPDATE and INSERT."""
+    totals = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        for name, delta in _entry_deltas(model, row, 1).items():
+            totals[(row['user_id'], row['date'])][name] += delta
+    if not totals:
+        return
+
+    names = list(ROLLUP_SOURCES[model])
+    user_ids = {user_id for user_id, _ in totals}
+    days = {day for _, day in totals}
+    existing = set(db.session.execute(
+        select(summary_table.c.user_id, summary_table.c.date).where(
+            summary_table.c.user_id.in_(user_ids), summary_table.c.date.in_(days)
+        )
+    ).all())
+
+    updates = [
+        {'key_user_id': user_id, 'key_date': day, **{f'delta_{name}': deltas[name] for name in names}}
+        for (user_id, day), deltas in totals.items() if (user_id, day) in existing
+    ]
+    inserts = [
+        {'user_id': user_id, 'date': day, **{name: deltas[name] for name in names}}
+        for (user_id, day), deltas in totals.items() if (user_id, day) not in existing
+    ]
+
+    if updates:
+        db.session.execute(
+            update(summary_table)
+            .where(summary_table.c.user_id == bindparam('key_user_id'), summary_table.c.date == bindparam('key_date'))
+            .values({name: summary_table.c[name] + bindparam(f'delta_{name}') for name in names}),
+            updates
+        )
+    if inserts:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(summary_table), inserts)
+        except IntegrityError:
+            # A concurrent writer created some of these days; fall back to per-day upserts
+            for row in inserts:
+                user_id, day = row.pop('user_id'), row.pop('date')
+                _apply(user_id, day, row, create=True)
+
+def compute_daily_summaries(user_id):
+    """Aggregate raw entries into {date: {column: value}} for one user."""
+    days = defaultdict(lambda: {name: 0 for name in COUNT_COLUMNS + tuple(SUM_COLUMNS)})
+    for model, fields in ROLLUP_SOURCES.items():
+        names = list(fields)
+        columns = [func.count() if column is None else func.coalesce(func.sum(column), 0) for column in fields.values()]
+        query = select(model.date, *columns).where(model.user_id == user_id).group_by(model.date)
+        for day, *values in db.session.execute(query):
+            days[day].update(zip(names, values))
+    return days
+
+def _user_ids(user_id=None):
+    if user_id:
+        return [user_id]
+    return db.session.execute(select(User.id)).scalars().all()
+
+def rebuild_daily_summaries(user_id=None, batch_size=500):
+    """Recompute summaries from raw entries, for one user or everyone."""
+    rebuilt = 0
+    user_ids = _user_ids(user_id)
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        db.session.execute(delete(summary_table).where(summary_table.c.user_id.in_(batch)))
+        rows = []
+        for uid in batch:
+            for day, values in compute_daily_summaries(uid).items():
+                rows.append({'user_id': uid, 'date': day, **values})
+        if rows:
+            db.session.execute(insert(summary_table), rows)
+        db.session.commit()
+        rebuilt += len(rows)
+    return rebuilt
+
+def _differs(stored, expected):
+    if isinstance(stored, float) or isinstance(expected, float):
+        return abs(stored - expected) > FLOAT_TOLERANCE * max(1.0, abs(expected))
+    return stored != expected
+
+def find_inconsistencies(user_id=None):
+    """Compare stored summaries with raw entries; returns (user_id, date, column, stored, expected)."""
+    problems = []
+    zero = {name: 0 for name in COUNT_COLUMNS + tuple(SUM_COLUMNS)}
+    for uid in _user_ids(user_id):
+        expected = compute_daily_summaries(uid)
+        stored = {
+            row.date: {name: getattr(row, name) for name in zero}
+            for row in DailySummary.query.filter_by(user_id=uid)
+        }
+        for day in sorted(set(expected) | set(stored)):
+            want = expected.get(day, zero)
+            have = stored.get(day, zero)
+            for name in zero:
+                if _differs(have[name], want[name]):
+                    problems.append((uid, day, name, have[name], want[name]))
+    return problems
@@ -0,0 +1,64 @@
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.identity import is_admin
+from backend.jobs import job_queue, accepted
+from backend.profiler import profiler, ProfilerBusy
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/profile', methods=['POST'])
+@jwt_required()
+def capture_profile():
+    try:
+        if not current_app.config['PROFILER_ENABLED']:
+            return jsonify({'message': 'Not found'}), 404
+        if not is_admin():
+            return jsonify({'message': 'Admin access required'}), 403
+        
+        data = request.get_json(silent=True) or {}
+        seconds = float(data['seconds']) if 'seconds' in data else None
+        endpoint = data.get('endpoint')
+        requests = int(data['requests']) if 'requests' in data else None
+        if (seconds is not None and seconds <= 0) or (requests is not None and requests < 1):
+            return jsonify({'message': "'seconds' and 'requests' must be positive"}), 400
+        if requests is not None and not endpoint:
+            return jsonify({'message': "'requests' needs an 'endpoint'"}), 400
+        if seconds is None and not endpoint:
+            return jsonify({'message': "Pass 'seconds', or an 'endpoint' and 'requests'"}), 400
+        
+        lines, samples = profiler.capture(seconds=seconds, endpoint=endpoint, requests=requests)
+        
+        return Response(''.join(f'{line}\n' for line in lines), mimetype='text/plain',
+                        headers={'X-Profile-Samples': str(samples)}), 200
+    except ProfilerBusy as e:
+        return jsonify({'message': str(e)}), 429, {'Retry-After': str(e.retry_after)}
+    except (TypeError, ValueError):
+        return jsonify({'message': "'seconds' and 'requests' must be numbers"}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@admin_bp.route('/rollups/rebuild', methods=['POST'])
+@jwt_required()
+def rebuild_rollups():
+    try:
+        if not is_admin():
+            return jsonify({'message': 'Admin access required'}), 403
+        
+        data = request.get_json(silent=True) or {}
+        job = job_queue.enqueue('rebuild-rollups', {'userId': data.get('userId')}, user_id=get_jwt_identity())
+        return accepted(job)
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@admin_bp.route('/goals/recompute', methods=['POST'])
+@jwt_required()
+def recompute_goals():
+    try:
+        if not is_admin():
+            return jsonify({'message': 'Admin access required'}), 403
+        
+        data = request.get_json(silent=True) or {}
+        job = job_queue.enqueue('recompute-goals', {'userId': data.get('userId')}, user_id=get_jwt_identity())
+        return accepted(job)
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
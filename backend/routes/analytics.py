@@ -0,0 +1,83 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.analytics import compute_analytics, parse_range, AnalyticsError, PERIODS
+from backend.replicas import replica_reads
+from backend.versions import conditional
+
+analytics_bp = Blueprint('analytics', __name__)
+
+ANALYTICS_RESOURCES = ('workouts', 'nutrition', 'progress')
+
+def _analytics():
+    user_id = get_jwt_identity()
+    start, end = parse_range(request.args)
+    return compute_analytics(user_id, start, end)
+
+@analytics_bp.route('', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional(*ANALYTICS_RESOURCES, daily=True)
+def get_analytics():
+    try:
+        return jsonify(_analytics()), 200
+    except AnalyticsError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@analytics_bp.route('/trends', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional(*ANALYTICS_RESOURCES, daily=True)
+def get_trends():
+    try:
+        result = _analytics()
+        return jsonify({'from': result['from'], 'to': result['to'], 'days': result['trends']}), 200
+    except AnalyticsError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@analytics_bp.route('/buckets', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional(*ANALYTICS_RESOURCES, daily=True)
+def get_buckets():
+    try:
+        period = request.args.get('period', 'week')
+        if period not in PERIODS:
+            return jsonify({'message': f"'period' must be one of: {', '.join(PERIODS)}"}), 400
+        
+        result = _analytics()
+        return jsonify({'from': result['from'], 'to': result['to'], 'period': period,
+                        'buckets': result['buckets'][period]}), 200
+    except AnalyticsError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@analytics_bp.route('/weight-trend', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional(*ANALYTICS_RESOURCES, daily=True)
+def get_weight_trend():
+    try:
+        result = _analytics()
+        return jsonify({'from': result['from'], 'to': result['to'], **result['weightTrend']}), 200
+    except AnalyticsError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@analytics_bp.route('/calorie-balance', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional(*ANALYTICS_RESOURCES, daily=True)
+def get_calorie_balance():
+    try:
+        result = _analytics()
+        return jsonify({'from': result['from'], 'to': result['to'], **result['calorieBalance']}), 200
+    except AnalyticsError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
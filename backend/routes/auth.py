@@ -2,7 +2,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from backend.models.user import User
 from backend.app import db
-import bcrypt
+from backend.changes import mark_changed
+from backend.passwords import PasswordHasherBusy
+from backend.identity import user_claims
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -28,11 +30,14 @@ def register():
         user.set_password(data['password'])
         
         db.session.add(user)
+        db.session.flush()
+        mark_changed(user.id, 'profile')
         db.session.commit()
         
         # Create tokens
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        claims = user_claims(user)
+        access_token = create_access_token(identity=user.id, additional_claims=claims)
+        refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
         
         return jsonify({
             'message': 'User created successfully',
@@ -41,6 +46,8 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        return jsonify({'message': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -53,8 +60,17 @@ def login():
         if not user or not user.check_password(data['password']):
             return jsonify({'message': 'Invalid credentials'}), 400
         
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        # Upgrade hashes made with an older algorithm or cost
+        if user.password_needs_rehash():
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass  # the next login will retry
+        
+        claims = user_claims(user)
+        access_token = create_access_token(identity=user.id, additional_claims=claims)
+        refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
         
         return jsonify({
             'message': 'Login successful',
@@ -63,6 +79,8 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        return jsonify({'message': 'Server busy, please retry'}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -71,7 +89,12 @@ def login():
 def refresh():
     try:
         current_user_id = get_jwt_identity()
-        new_token = create_access_token(identity=current_user_id)
+        user = db.session.get(User, current_user_id)
+        if not user:
+            return jsonify({'message': 'User not found'}), 404
+        
+        # Reload embedded claims: the refresh token's copy predates any profile update
+        new_token = create_access_token(identity=current_user_id, additional_claims=user_claims(user))
         return jsonify({'access_token': new_token}), 200
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
\ No newline at end of file
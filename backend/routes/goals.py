@@ -2,17 +2,63 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.goal import Goal
 from backend.app import db
-from datetime import datetime
+from backend.changes import mark_changed
+from backend.sync import record_deletion
+from backend.export import export_response, export_later, ExportError
+from backend.jobs import job_queue, accepted
+from backend.goal_progress import recompute_goal, validate_metric, GoalMetricError
+from backend.group_commit import group_committer
+from backend.pagination import paginate, page_response, PaginationError
+from backend.serializers import row_columns, serialize_rows
+from backend.replicas import replica_reads
+from backend.versions import conditional
+from datetime import date, datetime
 
 goals_bp = Blueprint('goals', __name__)
 
 @goals_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@conditional('goals')
 def get_goals():
     try:
         user_id = get_jwt_identity()
-        goals = Goal.query.filter_by(user_id=user_id).order_by(Goal.created_at.desc()).all()
-        return jsonify([goal.to_dict() for goal in goals]), 200
+        query = Goal.query.filter_by(user_id=user_id).with_entities(*row_columns(Goal))
+        rows, next_cursor = paginate(query, Goal.created_at, Goal.id)
+        return page_response(serialize_rows(Goal, rows), next_cursor), 200
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@goals_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_goals():
+    try:
+        user_id = get_jwt_identity()
+        return export_response(Goal, user_id, Goal.created_at, 'goals')
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@goals_bp.route('/export', methods=['POST'])
+@jwt_required()
+def export_goals_later():
+    try:
+        user_id = get_jwt_identity()
+        return accepted(export_later('goals', user_id))
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@goals_bp.route('/recompute', methods=['POST'])
+@jwt_required()
+def recompute_user_goals():
+    try:
+        user_id = get_jwt_identity()
+        return accepted(job_queue.enqueue('recompute-goals', {'userId': user_id}, user_id=user_id))
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -22,6 +68,7 @@ def create_goal():
     try:
         user_id = get_jwt_identity()
         data = request.get_json()
+        start_date = datetime.strptime(data['startDate'], '%Y-%m-%d').date() if data.get('startDate') else date.today()
         
         goal = Goal(
             user_id=user_id,
@@ -32,13 +79,20 @@ def create_goal():
             unit=data['unit'],
             category=data['category'],
             target_date=datetime.strptime(data['targetDate'], '%Y-%m-%d').date(),
-            status=data.get('status', 'active')
+            status=data.get('status', 'active'),
+            metric=validate_metric(data.get('metric')),
+            start_date=start_date,
+            start_value=data.get('startValue')
         )
         
-        db.session.add(goal)
-        db.session.commit()
+        def apply():
+            db.session.add(goal)
+            recompute_goal(goal)
+            mark_changed(user_id, 'goals')
         
-        return jsonify(goal.to_dict()), 201
+        return jsonify(group_committer.write(apply, goal.to_dict)), 201
+    except GoalMetricError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -60,7 +114,7 @@ def update_goal(goal_id):
             goal.description = data['description']
         if 'targetValue' in data:
             goal.target_value = data['targetValue']
-        if 'currentValue' in data:
+        if 'currentValue' in data and not goal.metric:
             goal.current_value = data['currentValue']
         if 'unit' in data:
             goal.unit = data['unit']
@@ -70,10 +124,21 @@ def update_goal(goal_id):
             goal.target_date = datetime.strptime(data['targetDate'], '%Y-%m-%d').date()
         if 'status' in data:
             goal.status = data['status']
+        if 'metric' in data:
+            goal.metric = validate_metric(data['metric'])
+        if 'startDate' in data:
+            goal.start_date = datetime.strptime(data['startDate'], '%Y-%m-%d').date()
+        if 'startValue' in data:
+            goal.start_value = data['startValue']
         
+        if goal.metric and any(key in data for key in ('metric', 'startDate', 'startValue', 'targetValue', 'targetDate')):
+            recompute_goal(goal)
+        mark_changed(user_id, 'goals')
         db.session.commit()
         
         return jsonify(goal.to_dict()), 200
+    except GoalMetricError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -87,7 +152,9 @@ def delete_goal(goal_id):
         if not goal:
             return jsonify({'message': 'Goal not found'}), 404
         
+        record_deletion(goal, 'goals')
         db.session.delete(goal)
+        mark_changed(user_id, 'goals')
         db.session.commit()
         
         return jsonify({'message': 'Goal deleted successfully'}), 200
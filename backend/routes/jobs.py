@@ -0,0 +1,85 @@
+from flask import Blueprint, current_app, jsonify, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.models.job import Job
+from backend.app import db
+from backend.export import FORMATS
+from backend.pagination import paginate, page_response, PaginationError
+from datetime import datetime
+import os
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('', methods=['GET'])
+@jwt_required()
+def get_jobs():
+    try:
+        user_id = get_jwt_identity()
+        jobs, next_cursor = paginate(Job.query.filter_by(user_id=user_id), Job.created_at, Job.id)
+        return page_response([job.to_dict() for job in jobs], next_cursor), 200
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    try:
+        user_id = get_jwt_identity()
+        job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+        
+        if not job:
+            return jsonify({'message': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@jobs_bp.route('/<job_id>/result', methods=['GET'])
+@jwt_required()
+def get_job_result(job_id):
+    try:
+        user_id = get_jwt_identity()
+        job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+        
+        if not job:
+            return jsonify({'message': 'Job not found'}), 404
+        if job.status != 'succeeded':
+            return jsonify({'message': f'Job is {job.status}'}), 409
+        
+        result = job.to_dict()['result'] or {}
+        if 'file' not in result:
+            return jsonify(result), 200
+        
+        path = os.path.join(current_app.config['JOBS_RESULT_DIR'], result['file'])
+        if not os.path.exists(path):
+            return jsonify({'message': 'Result file has been removed'}), 410
+        
+        response = send_file(path, mimetype=FORMATS[result['format']], as_attachment=True,
+                             download_name=result['filename'])
+        if result.get('compress') == 'gzip':
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@jobs_bp.route('/<job_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_job(job_id):
+    try:
+        user_id = get_jwt_identity()
+        # Conditional, so a job a worker has just claimed is not marked cancelled
+        cancelled = Job.query.filter_by(id=job_id, user_id=user_id, status='queued').update(
+            {'status': 'cancelled', 'finished_at': datetime.utcnow()}
+        )
+        db.session.commit()
+        job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+        
+        if not job:
+            return jsonify({'message': 'Job not found'}), 404
+        if not cancelled:
+            return jsonify({'message': f'Only queued jobs can be cancelled; this one is {job.status}'}), 409
+        
+        return jsonify(job.to_dict()), 200
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
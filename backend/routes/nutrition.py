@@ -2,17 +2,68 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.nutrition import NutritionEntry, FoodDatabase
 from backend.app import db
-from datetime import datetime
+from backend.changes import mark_changed
+from backend.sync import record_deletion
+from backend.rollups import retract_entry
+from backend.goal_progress import untrack_entry
+from backend.group_commit import save_entry
+from backend.bulk import bulk_insert, bulk_insert_later, BulkImportError, text_field, number_field, date_field
+from backend.export import export_response, export_later, ExportError
+from backend.jobs import accepted
+from backend.food_search import food_index
+from backend.pagination import paginate, page_response, PaginationError
+from backend.serializers import row_columns, serialize_rows
+from backend.replicas import replica_reads
+from backend.versions import conditional
 
 nutrition_bp = Blueprint('nutrition', __name__)
 
+def nutrition_values(data):
+    return {
+        'food_name': text_field(data, 'foodName', max_length=100),
+        'calories': number_field(data, 'calories', integer=True),
+        'protein': number_field(data, 'protein', 0),
+        'carbs': number_field(data, 'carbs', 0),
+        'fats': number_field(data, 'fats', 0),
+        'serving': number_field(data, 'serving', 1),
+        'date': date_field(data, 'date'),
+        'meal_type': text_field(data, 'mealType', max_length=20)
+    }
+
 @nutrition_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@conditional('nutrition')
 def get_nutrition():
     try:
         user_id = get_jwt_identity()
-        entries = NutritionEntry.query.filter_by(user_id=user_id).order_by(NutritionEntry.date.desc()).all()
-        return jsonify([entry.to_dict() for entry in entries]), 200
+        query = NutritionEntry.query.filter_by(user_id=user_id).with_entities(*row_columns(NutritionEntry))
+        rows, next_cursor = paginate(query, NutritionEntry.date, NutritionEntry.id)
+        return page_response(serialize_rows(NutritionEntry, rows), next_cursor), 200
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@nutrition_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_nutrition():
+    try:
+        user_id = get_jwt_identity()
+        return export_response(NutritionEntry, user_id, NutritionEntry.date, 'nutrition')
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@nutrition_bp.route('/export', methods=['POST'])
+@jwt_required()
+def export_nutrition_later():
+    try:
+        user_id = get_jwt_identity()
+        return accepted(export_later('nutrition', user_id))
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -23,22 +74,25 @@ def create_nutrition_entry():
         user_id = get_jwt_identity()
         data = request.get_json()
         
-        entry = NutritionEntry(
-            user_id=user_id,
-            food_name=data['foodName'],
-            calories=data['calories'],
-            protein=data.get('protein', 0),
-            carbs=data.get('carbs', 0),
-            fats=data.get('fats', 0),
-            serving=data.get('serving', 1),
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-            meal_type=data['mealType']
-        )
+        entry = NutritionEntry(user_id=user_id, **nutrition_values(data))
         
-        db.session.add(entry)
-        db.session.commit()
-        
-        return jsonify(entry.to_dict()), 201
+        return jsonify(save_entry(entry, 'nutrition')), 201
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@nutrition_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_nutrition_entries():
+    try:
+        user_id = get_jwt_identity()
+        if request.args.get('async') == '1':
+            return accepted(bulk_insert_later('nutrition', user_id))
+        result = bulk_insert(NutritionEntry, 'nutrition', user_id, nutrition_values)
+        return jsonify(result), 200
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -52,7 +106,11 @@ def delete_nutrition_entry(entry_id):
         if not entry:
             return jsonify({'message': 'Nutrition entry not found'}), 404
         
+        retract_entry(entry)
+        untrack_entry(entry)
+        record_deletion(entry, 'nutrition')
         db.session.delete(entry)
+        mark_changed(user_id, 'nutrition')
         db.session.commit()
         
         return jsonify({'message': 'Nutrition entry deleted successfully'}), 200
@@ -60,15 +118,16 @@ def delete_nutrition_entry(entry_id):
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
 @nutrition_bp.route('/foods', methods=['GET'])
+@replica_reads
 def get_foods():
     try:
         search = request.args.get('search', '').lower()
-        query = FoodDatabase.query
         
         if search:
-            query = query.filter(FoodDatabase.name.ilike(f'%{search}%'))
+            foods = food_index.search_foods(db.session, search, limit=20)
+        else:
+            foods = FoodDatabase.query.limit(20).all()
         
-        foods = query.limit(20).all()
         return jsonify([food.to_dict() for food in foods]), 200
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
\ No newline at end of file
@@ -2,17 +2,66 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.progress import ProgressEntry
 from backend.app import db
+from backend.changes import mark_changed
+from backend.sync import record_deletion
+from backend.rollups import record_entry, retract_entry
+from backend.goal_progress import track_entry, untrack_entry
+from backend.group_commit import save_entry
+from backend.bulk import bulk_insert, bulk_insert_later, BulkImportError, text_field, number_field, date_field
+from backend.export import export_response, export_later, ExportError
+from backend.jobs import accepted
+from backend.pagination import paginate, page_response, PaginationError
+from backend.serializers import row_columns, serialize_rows
+from backend.replicas import replica_reads
+from backend.versions import conditional
 from datetime import datetime
 
 progress_bp = Blueprint('progress', __name__)
 
+def progress_values(data):
+    return {
+        'date': date_field(data, 'date'),
+        'weight': number_field(data, 'weight', None),
+        'steps': number_field(data, 'steps', 0, integer=True),
+        'distance': number_field(data, 'distance', 0),
+        'active_minutes': number_field(data, 'activeMinutes', 0, integer=True),
+        'notes': text_field(data, 'notes', '')
+    }
+
 @progress_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@conditional('progress')
 def get_progress():
     try:
         user_id = get_jwt_identity()
-        entries = ProgressEntry.query.filter_by(user_id=user_id).order_by(ProgressEntry.date.desc()).all()
-        return jsonify([entry.to_dict() for entry in entries]), 200
+        query = ProgressEntry.query.filter_by(user_id=user_id).with_entities(*row_columns(ProgressEntry))
+        rows, next_cursor = paginate(query, ProgressEntry.date, ProgressEntry.id)
+        return page_response(serialize_rows(ProgressEntry, rows), next_cursor), 200
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@progress_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_progress():
+    try:
+        user_id = get_jwt_identity()
+        return export_response(ProgressEntry, user_id, ProgressEntry.date, 'progress')
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@progress_bp.route('/export', methods=['POST'])
+@jwt_required()
+def export_progress_later():
+    try:
+        user_id = get_jwt_identity()
+        return accepted(export_later('progress', user_id))
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -23,20 +72,25 @@ def create_progress_entry():
         user_id = get_jwt_identity()
         data = request.get_json()
         
-        entry = ProgressEntry(
-            user_id=user_id,
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-            weight=data.get('weight'),
-            steps=data.get('steps', 0),
-            distance=data.get('distance', 0),
-            active_minutes=data.get('activeMinutes', 0),
-            notes=data.get('notes', '')
-        )
-        
-        db.session.add(entry)
-        db.session.commit()
+        entry = ProgressEntry(user_id=user_id, **progress_values(data))
         
-        return jsonify(entry.to_dict()), 201
+        return jsonify(save_entry(entry, 'progress')), 201
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@progress_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_progress_entries():
+    try:
+        user_id = get_jwt_identity()
+        if request.args.get('async') == '1':
+            return accepted(bulk_insert_later('progress', user_id))
+        result = bulk_insert(ProgressEntry, 'progress', user_id, progress_values)
+        return jsonify(result), 200
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -52,6 +106,9 @@ def update_progress_entry(entry_id):
         
         data = request.get_json()
         
+        retract_entry(entry)
+        untrack_entry(entry)
+        
         if 'weight' in data:
             entry.weight = data['weight']
         if 'steps' in data:
@@ -65,6 +122,9 @@ def update_progress_entry(entry_id):
         if 'date' in data:
             entry.date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         
+        record_entry(entry)
+        track_entry(entry)
+        mark_changed(user_id, 'progress')
         db.session.commit()
         
         return jsonify(entry.to_dict()), 200
@@ -81,7 +141,11 @@ def delete_progress_entry(entry_id):
         if not entry:
             return jsonify({'message': 'Progress entry not found'}), 404
         
+        retract_entry(entry)
+        untrack_entry(entry)
+        record_deletion(entry, 'progress')
         db.session.delete(entry)
+        mark_changed(user_id, 'progress')
         db.session.commit()
         
         return jsonify({'message': 'Progress entry deleted successfully'}), 200
@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.sync import changes_since, parse_limit, SyncError
+from backend.replicas import replica_reads
+from backend.versions import conditional
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('', methods=['GET'])
+@jwt_required()
+@replica_reads
+@conditional('workouts', 'nutrition', 'progress', 'goals')
+def get_changes():
+    try:
+        user_id = get_jwt_identity()
+        limit = parse_limit(request.args.get('limit'))
+        return jsonify(changes_since(user_id, request.args.get('since'), limit)), 200
+    except SyncError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
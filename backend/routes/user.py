@@ -2,20 +2,24 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.user import User
 from backend.app import db
+from backend.changes import mark_changed
+from backend.identity import get_user_profile
+from backend.replicas import replica_reads
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_profile():
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        profile = get_user_profile(user_id)
         
-        if not user:
+        if not profile:
             return jsonify({'message': 'User not found'}), 404
         
-        return jsonify(user.to_dict()), 200
+        return jsonify(profile), 200
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -45,8 +49,9 @@ def update_profile():
         if 'fitnessGoals' in data:
             user.fitness_goals = data['fitnessGoals']
         
+        mark_changed(user_id, 'profile')
         db.session.commit()
         
         return jsonify(user.to_dict()), 200
     except Exception as e:
-        return jsonify({'message': 'Server error', 'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
@@ -2,17 +2,68 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.workout import Workout
 from backend.app import db
+from backend.changes import mark_changed
+from backend.sync import record_deletion
+from backend.rollups import record_entry, retract_entry
+from backend.goal_progress import track_entry, untrack_entry
+from backend.group_commit import save_entry
+from backend.bulk import bulk_insert, bulk_insert_later, BulkImportError, text_field, number_field, date_field
+from backend.export import export_response, export_later, ExportError
+from backend.jobs import accepted
+from backend.pagination import paginate, page_response, PaginationError
+from backend.serializers import row_columns, serialize_rows
+from backend.replicas import replica_reads
+from backend.versions import conditional
 from datetime import datetime
 
 workouts_bp = Blueprint('workouts', __name__)
 
+def workout_values(data):
+    return {
+        'exercise_name': text_field(data, 'exerciseName', max_length=100),
+        'exercise_type': text_field(data, 'exerciseType', max_length=50),
+        'sets': number_field(data, 'sets', 1, integer=True),
+        'reps': number_field(data, 'reps', 1, integer=True),
+        'duration': number_field(data, 'duration', integer=True),
+        'calories_burned': number_field(data, 'caloriesBurned', 0, integer=True),
+        'date': date_field(data, 'date'),
+        'notes': text_field(data, 'notes', '')
+    }
+
 @workouts_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@conditional('workouts')
 def get_workouts():
     try:
         user_id = get_jwt_identity()
-        workouts = Workout.query.filter_by(user_id=user_id).order_by(Workout.date.desc()).all()
-        return jsonify([workout.to_dict() for workout in workouts]), 200
+        query = Workout.query.filter_by(user_id=user_id).with_entities(*row_columns(Workout))
+        rows, next_cursor = paginate(query, Workout.date, Workout.id)
+        return page_response(serialize_rows(Workout, rows), next_cursor), 200
+    except PaginationError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@workouts_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_workouts():
+    try:
+        user_id = get_jwt_identity()
+        return export_response(Workout, user_id, Workout.date, 'workouts')
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@workouts_bp.route('/export', methods=['POST'])
+@jwt_required()
+def export_workouts_later():
+    try:
+        user_id = get_jwt_identity()
+        return accepted(export_later('workouts', user_id))
+    except ExportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -23,22 +74,25 @@ def create_workout():
         user_id = get_jwt_identity()
         data = request.get_json()
         
-        workout = Workout(
-            user_id=user_id,
-            exercise_name=data['exerciseName'],
-            exercise_type=data['exerciseType'],
-            sets=data.get('sets', 1),
-            reps=data.get('reps', 1),
-            duration=data['duration'],
-            calories_burned=data.get('caloriesBurned', 0),
-            date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-            notes=data.get('notes', '')
-        )
-        
-        db.session.add(workout)
-        db.session.commit()
+        workout = Workout(user_id=user_id, **workout_values(data))
         
-        return jsonify(workout.to_dict()), 201
+        return jsonify(save_entry(workout, 'workouts')), 201
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+
+@workouts_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_workouts():
+    try:
+        user_id = get_jwt_identity()
+        if request.args.get('async') == '1':
+            return accepted(bulk_insert_later('workouts', user_id))
+        result = bulk_insert(Workout, 'workouts', user_id, workout_values)
+        return jsonify(result), 200
+    except BulkImportError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
@@ -54,6 +108,9 @@ def update_workout(workout_id):
         
         data = request.get_json()
         
+        retract_entry(workout)
+        untrack_entry(workout)
+        
         if 'exerciseName' in data:
             workout.exercise_name = data['exerciseName']
         if 'exerciseType' in data:
@@ -71,6 +128,9 @@ def update_workout(workout_id):
         if 'notes' in data:
             workout.notes = data['notes']
         
+        record_entry(workout)
+        track_entry(workout)
+        mark_changed(user_id, 'workouts')
         db.session.commit()
         
         return jsonify(workout.to_dict()), 200
@@ -87,7 +147,11 @@ def delete_workout(workout_id):
         if not workout:
             return jsonify({'message': 'Workout not found'}), 404
         
+        retract_entry(workout)
+        untrack_entry(workout)
+        record_deletion(workout, 'workouts')
         db.session.delete(workout)
+        mark_changed(user_id, 'workouts')
         db.session.commit()
         
         return jsonify({'message': 'Workout deleted successfully'}), 200
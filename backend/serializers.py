@@ -0,0 +1,39 @@
+from functools import lru_cache
+from sqlalchemy import Date, DateTime, inspect
+
+def _camel(name):
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+@lru_cache(maxsize=None)
+def _fields(model):
+    """(field, attribute, is_date) for each key of `model.to_dict()`, in order.
+
+    to_dict() keys are the camelCased column names, so the mapping is derived
+    rather than repeated here.
+    """
+    attributes = {_camel(attr.key): attr for attr in inspect(model).column_attrs}
+    fields = []
+    for field in model().to_dict():
+        attr = attributes[field]
+        is_date = isinstance(attr.columns[0].type, (Date, DateTime))
+        fields.append((field, attr.class_attribute, is_date))
+    return tuple(fields)
+
+def row_columns(model):
+    """Columns to pass to `query.with_entities()` for `serialize_rows`."""
+    return [attribute for _, attribute, _ in _fields(model)]
+
+def serialize_rows(model, rows):
+    """Turn plain column rows into the same dicts `to_dict()` returns, without loading ORM objects."""
+    fields = _fields(model)
+    names = [field for field, _, _ in fields]
+    dates = [index for index, (_, _, is_date) in enumerate(fields) if is_date]
+    items = []
+    for row in rows:
+        values = list(row)
+        for index in dates:
+            if values[index] is not None:
+                values[index] = values[index].isoformat()
+        items.append(dict(zip(names, values)))
+    return items
@@ -0,0 +1,42 @@
+from backend.app import db
+from backend.models.workout import Workout
+from backend.models.nutrition import NutritionEntry
+from backend.models.progress import ProgressEntry
+from backend.models.daily_summary import DailySummary
+from datetime import datetime, timedelta
+from sqlalchemy import case, func
+
+HISTORY_LIMIT = 30
+
+def _latest(model, user_id, limit=HISTORY_LIMIT):
+    return (model.query
+            .filter_by(user_id=user_id)
+            .order_by(model.date.desc(), model.id.desc())
+            .limit(limit)
+            .all())
+
+def compute_dashboard_stats(user_id, today=None):
+    today = today or datetime.now().date()
+    week_ago = today - timedelta(days=7)
+
+    # Totals come from the per-day rollup, so they cost one row per active day
+    weekly = DailySummary.date >= week_ago
+    (total_workouts, weekly_workouts, total_calories_burned,
+     total_calories_consumed, total_steps) = db.session.query(
+        func.coalesce(func.sum(DailySummary.workout_count), 0),
+        func.coalesce(func.sum(case((weekly, DailySummary.workout_count), else_=0)), 0),
+        func.coalesce(func.sum(case((weekly, DailySummary.calories_burned), else_=0)), 0),
+        func.coalesce(func.sum(case((weekly, DailySummary.calories_consumed), else_=0)), 0),
+        func.coalesce(func.sum(DailySummary.steps), 0)
+    ).filter(DailySummary.user_id == user_id).one()
+
+    return {
+        'totalWorkouts': total_workouts,
+        'weeklyWorkouts': weekly_workouts,
+        'totalCaloriesBurned': total_calories_burned,
+        'totalCaloriesConsumed': total_calories_consumed,
+        'totalSteps': total_steps,
+        'workoutHistory': [w.to_dict() for w in _latest(Workout, user_id)],
+        'nutritionHistory': [n.to_dict() for n in _latest(NutritionEntry, user_id)],
+        'progressHistory': [p.to_dict() for p in _latest(ProgressEntry, user_id)]
+    }
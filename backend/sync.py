@@ -0,0 +1,142 @@
+from backend.extensions import db
+from backend.models.workout import Workout
+from backend.models.nutrition import NutritionEntry
+from backend.models.progress import ProgressEntry
+from backend.models.goal import Goal
+from backend.models.tombstone import Tombstone
+from backend.serializers import row_columns, serialize_rows
+from backend.versions import bump_versions, version_table
+from sqlalchemy import select, tuple_, update
+import base64
+import json
+
+# Synced resource -> model; the order breaks ties between rows stamped with the same version
+SYNC_MODELS = {
+    'workouts': Workout,
+    'nutrition': NutritionEntry,
+    'progress': ProgressEntry,
+    'goals': Goal,
+}
+
+# resource_versions counter handing out each user's sync versions
+SYNC_COUNTER = 'sync'
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+tombstone_table = Tombstone.__table__
+
+# Sync positions are (sync_version, kind, id), kind being an index into SYNC_MODELS or TOMBSTONES
+TOMBSTONES = len(SYNC_MODELS)
+START = (-1, 0, '')
+
+class SyncError(ValueError):
+    pass
+
+def record_deletion(entry, resource):
+    """Leave a tombstone for `entry`, which is being deleted in the current transaction."""
+    db.session.add(Tombstone(id=entry.id, user_id=entry.user_id, resource=resource))
+
+def stamp_changes(session, changed):
+    """Give the rows written in this transaction the user's next sync version; runs in before_commit.
+
+    Writes leave `sync_version` NULL (the column's onupdate). Stamping takes
+    the user's counter row lock, so versions are handed out in commit order
+    and a client never misses a change that commits after it synced.
+    """
+    users = {}
+    for user_id, resource in changed:
+        if resource in SYNC_MODELS:
+            users.setdefault(user_id, set()).add(resource)
+    if not users:
+        return
+
+    session.flush()
+    for user_id, resources in sorted(users.items()):
+        bump_versions(session, {(user_id, SYNC_COUNTER)})
+        version = session.execute(
+            select(version_table.c.version).where(version_table.c.user_id == user_id,
+                                                  version_table.c.resource == SYNC_COUNTER)
+        ).scalar_one()
+        for resource in sorted(resources):
+            table = SYNC_MODELS[resource].__table__
+            # Keep updated_at as written rather than letting its onupdate move it to the stamp time
+            session.execute(
+                update(table).where(table.c.user_id == user_id, table.c.sync_version.is_(None))
+                .values(sync_version=version, updated_at=table.c.updated_at)
+            )
+        session.execute(
+            update(tombstone_table).where(tombstone_table.c.user_id == user_id, tombstone_table.c.sync_version.is_(None))
+            .values(sync_version=version)
+        )
+
+def encode_token(position):
+    payload = json.dumps(list(position), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        version, kind, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(version, int) or not isinstance(kind, int) or not isinstance(row_id, str):
+            raise TypeError
+        return version, kind, row_id
+    except (ValueError, TypeError):
+        raise SyncError("Invalid 'since' token")
+
+def parse_limit(value):
+    if value is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise SyncError("'limit' must be an integer")
+    if limit < 1 or limit > MAX_LIMIT:
+        raise SyncError(f"'limit' must be between 1 and {MAX_LIMIT}")
+    return limit
+
+def _after(table, kind, position):
+    """Rows of `table` that come after `position` in (sync_version, kind, id) order."""
+    version, last_kind, last_id = position
+    c = table.c
+    if kind < last_kind:
+        return c.sync_version > version
+    if kind == last_kind:
+        return tuple_(c.sync_version, c.id) > tuple_(version, last_id)
+    return c.sync_version >= version
+
+def _changed_rows(user_id, kind, table, columns, position, limit):
+    c = table.c
+    query = (select(c.sync_version, c.id, *columns)
+             .where(c.user_id == user_id, _after(table, kind, position))
+             .order_by(c.sync_version, c.id).limit(limit))
+    return [(version, kind, row_id, row) for version, row_id, *row in db.session.execute(query)]
+
+def changes_since(user_id, token=None, limit=DEFAULT_LIMIT):
+    """Rows and deletions after `token` (everything without one), oldest change first, at most `limit` of them.
+
+    Each table is read with one range scan of its (user_id, sync_version, id)
+    index, so the cost follows the number of changes, not the history size.
+    """
+    position = decode_token(token) if token else START
+    found = []
+    for kind, model in enumerate(SYNC_MODELS.values()):
+        found += _changed_rows(user_id, kind, model.__table__, row_columns(model), position, limit + 1)
+    found += _changed_rows(user_id, TOMBSTONES, tombstone_table, [tombstone_table.c.resource], position, limit + 1)
+    found.sort(key=lambda change: change[:3])
+
+    page = found[:limit]
+    rows = {resource: [] for resource in SYNC_MODELS}
+    deleted = {resource: [] for resource in SYNC_MODELS}
+    resources = list(SYNC_MODELS)
+    for _, kind, row_id, row in page:
+        if kind == TOMBSTONES:
+            deleted[row[0]].append(row_id)
+        else:
+            rows[resources[kind]].append(row)
+
+    result = {resource: serialize_rows(model, rows[resource]) for resource, model in SYNC_MODELS.items()}
+    result['deleted'] = deleted
+    result['token'] = encode_token(page[-1][:3] if page else position)
+    result['hasMore'] = len(found) > limit
+    return result
@@ -0,0 +1,66 @@
+from backend.jobs import task
+from flask import current_app
+import contextlib
+import os
+
+def _entry_targets():
+    from backend.models.workout import Workout
+    from backend.models.nutrition import NutritionEntry
+    from backend.models.progress import ProgressEntry
+    from backend.models.goal import Goal
+    from backend.routes.workouts import workout_values
+    from backend.routes.nutrition import nutrition_values
+    from backend.routes.progress import progress_values
+    # resource -> (model, export sort column, bulk parser)
+    return {
+        'workouts': (Workout, Workout.date, workout_values),
+        'nutrition': (NutritionEntry, NutritionEntry.date, nutrition_values),
+        'progress': (ProgressEntry, ProgressEntry.date, progress_values),
+        'goals': (Goal, Goal.created_at, None),
+    }
+
+def result_path(job_id, name):
+    return os.path.join(current_app.config['JOBS_RESULT_DIR'], f'{job_id}-{name}')
+
+# Not retried: chunks committed before a failure would be inserted twice
+@task('bulk-import', max_attempts=1)
+def bulk_import(payload, job_id):
+    from backend.bulk import bulk_insert, ndjson_items, upload_path
+    model, _, parse = _entry_targets()[payload['resource']]
+    if 'items' in payload:  # queued before uploads were spooled to disk
+        return bulk_insert(model, payload['resource'], payload['userId'], parse, items=payload['items'])
+    path = upload_path(payload['upload'])
+    try:
+        with open(path, 'rb') as handle:
+            return bulk_insert(model, payload['resource'], payload['userId'], parse, items=ndjson_items(handle))
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+@task('export')
+def export(payload, job_id):
+    from backend.export import export_chunks
+    model, sort_column, _ = _entry_targets()[payload['resource']]
+    fmt, compress = payload['format'], payload.get('compress')
+    filename = f"{payload['resource']}.{fmt}"
+    path = result_path(job_id, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    size = 0
+    with open(path + '.part', 'wb') as out:
+        for chunk in export_chunks(model, payload['userId'], sort_column, fmt, compress):
+            data = chunk.encode() if isinstance(chunk, str) else chunk
+            out.write(data)
+            size += len(data)
+    os.replace(path + '.part', path)
+    return {'file': os.path.basename(path), 'filename': filename, 'format': fmt, 'compress': compress, 'bytes': size}
+
+@task('rebuild-rollups')
+def rebuild_rollups(payload, job_id):
+    from backend import rollups
+    return {'rows': rollups.rebuild_daily_summaries(payload.get('userId'))}
+
+@task('recompute-goals')
+def recompute_goals(payload, job_id):
+    from backend import goal_progress
+    return {'goals': goal_progress.recompute_goals(payload.get('userId'))}
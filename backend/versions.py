@@ -0,0 +1,98 @@
+from flask import current_app, g, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from backend.app import db
+from backend.models.resource_version import ResourceVersion
+from datetime import date, datetime, time, timezone
+from functools import wraps
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+import hashlib
+
+version_table = ResourceVersion.__table__
+
+def bump_versions(session, changed):
+    """Increment the counter of every (user_id, resource) pair in `changed` within the session's transaction."""
+    now = datetime.utcnow()
+    for user_id, resource in sorted(changed):
+        where = (version_table.c.user_id == user_id, version_table.c.resource == resource)
+        bump = update(version_table).where(*where).values(version=version_table.c.version + 1, updated_at=now)
+        if session.execute(bump).rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(insert(version_table).values(user_id=user_id, resource=resource, version=1, updated_at=now))
+        except IntegrityError:
+            # Another transaction created the row first
+            session.execute(bump)
+
+def current_versions(user_id, resources):
+    """({resource: version}, latest updated_at) for `resources`, in one query."""
+    rows = db.session.execute(
+        select(version_table.c.resource, version_table.c.version, version_table.c.updated_at).where(
+            version_table.c.user_id == user_id, version_table.c.resource.in_(resources)
+        )
+    ).all()
+    versions = {resource: 0 for resource in resources}
+    modified = None
+    for resource, version, updated_at in rows:
+        versions[resource] = version
+        modified = updated_at if modified is None else max(modified, updated_at)
+    return versions, modified
+
+def _start_of_today():
+    """Local midnight as a naive UTC datetime, comparable with updated_at."""
+    return datetime.combine(date.today(), time()).astimezone(timezone.utc).replace(tzinfo=None)
+
+def request_versions(user_id, resources):
+    """The versions @conditional read for this request, or a fresh lookup without it."""
+    versions = g.get('resource_versions')
+    if versions is not None and set(versions) == set(resources):
+        return versions
+    return current_versions(user_id, resources)[0]
+
+def make_etag(user_id, versions, *extra):
+    parts = [user_id, *(f'{resource}={versions[resource]}' for resource in sorted(versions)), *extra]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:24]
+
+def _not_modified(etag, modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return bool(since and modified and modified.replace(microsecond=0, tzinfo=timezone.utc) <= since)
+
+def conditional(*resources, daily=False):
+    """Serve ETag / Last-Modified for a user's GET handler and answer 304 when unchanged.
+
+    The validator is derived from the version counters of `resources` and the
+    query string (plus today's date when `daily`), so a revalidation costs one
+    resource_versions lookup and never touches the entry tables. A `daily`
+    response is also never older than the start of today, so If-Modified-Since
+    revalidation rolls over at the same boundary as the ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            versions, modified = current_versions(user_id, resources)
+            g.resource_versions = versions
+            extra = [request.query_string.decode()]
+            if daily:
+                extra.append(date.today().isoformat())
+                modified = max(filter(None, (modified, _start_of_today())))
+            etag = make_etag(user_id, versions, *extra)
+
+            if _not_modified(etag, modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if modified:
+                response.last_modified = modified.replace(tzinfo=timezone.utc)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
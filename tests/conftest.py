@@ -0,0 +1,44 @@
+import pytest
+
+from backend.app import create_app
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'fitness_tracker.db')
+
+@pytest.fixture
+def app(db_path):
+    from backend.extensions import db
+    from backend.group_commit import group_committer
+    from backend.migrations import upgrade
+
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'JOBS_WORKERS': 0,
+    })
+    with app.app_context():
+        upgrade()
+    yield app
+    group_committer.shutdown()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def user(app):
+    """(user_id, auth headers) for a fresh user."""
+    from backend.extensions import db
+    from backend.models.user import User
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        user = User(email='runner@example.com', name='Runner')
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.commit()
+        return user.id, {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
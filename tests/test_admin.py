@@ -0,0 +1,20 @@
+def _rebuild(client, headers):
+    return client.post('/api/admin/rollups/rebuild', json={}, headers=headers).status_code
+
+def test_admin_access_is_granted_on_the_server_only(app, client, user):
+    _, headers = user
+    cli = app.test_cli_runner()
+
+    assert _rebuild(client, headers) == 403
+
+    assert cli.invoke(args=['grant-admin', 'Runner@Example.com']).exit_code == 0
+    assert _rebuild(client, headers) == 202
+
+    assert cli.invoke(args=['grant-admin', 'runner@example.com', '--revoke']).exit_code == 0
+    assert _rebuild(client, headers) == 403
+
+def test_grant_admin_requires_an_existing_account(app):
+    result = app.test_cli_runner().invoke(args=['grant-admin', 'nobody@example.com'])
+
+    assert result.exit_code != 0
+    assert 'No account' in result.output
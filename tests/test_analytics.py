@@ -0,0 +1,159 @@
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+START, END = date(2026, 2, 1), date(2026, 4, 15)
+
+def _days(first, last):
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+@pytest.fixture
+def entries(client, user):
+    """Random workouts, meals and weigh-ins from a month before START to END, with gaps."""
+    _, headers = user
+    rng = random.Random(7)
+    workouts, meals, progress = [], [], []
+    for day in _days(START - timedelta(days=35), END):
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            workouts.append({'exerciseName': 'Run', 'exerciseType': 'cardio', 'duration': 30,
+                             'caloriesBurned': rng.randint(100, 700), 'date': day.isoformat()})
+        for _ in range(rng.choice((0, 1, 3))):
+            meals.append({'foodName': 'Meal', 'calories': rng.randint(200, 900), 'mealType': 'lunch',
+                          'date': day.isoformat()})
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            entry = {'steps': rng.randint(0, 15000), 'date': day.isoformat()}
+            if rng.random() < 0.7:
+                entry['weight'] = round(rng.uniform(70, 80), 1)
+            progress.append(entry)
+    for resource, items in (('workouts', workouts), ('nutrition', meals), ('progress', progress)):
+        assert client.post(f'/api/{resource}/bulk', json=items, headers=headers).get_json()['failed'] == 0
+    return workouts, meals, progress
+
+def _reference(workouts, meals, progress):
+    """Per-day totals and mean weight, computed without numpy."""
+    daily = defaultdict(lambda: {'caloriesConsumed': 0, 'caloriesBurned': 0, 'steps': 0})
+    weighins = defaultdict(list)
+    for item in workouts:
+        daily[item['date']]['caloriesBurned'] += item['caloriesBurned']
+    for item in meals:
+        daily[item['date']]['caloriesConsumed'] += item['calories']
+    for item in progress:
+        daily[item['date']]['steps'] += item['steps']
+        if 'weight' in item:
+            weighins[item['date']].append(item['weight'])
+    weight = {day: sum(values) / len(values) for day, values in weighins.items()}
+    return daily, weight
+
+def _close(actual, expected, places=2):
+    if expected is None:
+        return actual is None
+    return actual is not None and abs(actual - expected) <= 0.6 * 10 ** -places + 1e-9
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+def _get(client, headers, path, **args):
+    response = client.get(path, query_string={'from': START.isoformat(), 'to': END.isoformat(), **args}, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_rolling_trends_match_a_plain_python_computation(client, user, entries):
+    _, headers = user
+    daily, weight = _reference(*entries)
+    series = {
+        'caloriesConsumed': lambda day: daily[day]['caloriesConsumed'],
+        'caloriesBurned': lambda day: daily[day]['caloriesBurned'],
+        'steps': lambda day: daily[day]['steps'],
+        'weight': lambda day: weight.get(day),
+        'calorieBalance': lambda day: daily[day]['caloriesConsumed'] - daily[day]['caloriesBurned'],
+    }
+
+    rows = _get(client, headers, '/api/analytics/trends')['days']
+
+    assert [row['date'] for row in rows] == [day.isoformat() for day in _days(START, END)]
+    for row in rows:
+        day = date.fromisoformat(row['date'])
+        for field, value in series.items():
+            assert _close(row[field], value(row['date'])), (row['date'], field)
+            for window in (7, 30):
+                trailing = [value((day - timedelta(days=back)).isoformat()) for back in range(window)]
+                assert _close(row[f'{field}Avg{window}'], _mean(trailing)), (row['date'], field, window)
+
+@pytest.mark.parametrize('period', ['week', 'month'])
+def test_buckets_match_a_plain_python_computation(client, user, entries, period):
+    _, headers = user
+    daily, weight = _reference(*entries)
+    groups = defaultdict(list)
+    for day in _days(START, END):
+        key = day - timedelta(days=day.weekday()) if period == 'week' else day.replace(day=1)
+        groups[key.isoformat()].append(day.isoformat())
+
+    result = _get(client, headers, '/api/analytics/buckets', period=period)['buckets']
+
+    assert [bucket['start'] for bucket in result] == sorted(groups)
+    for bucket in result:
+        days = groups[bucket['start']]
+        consumed = sum(daily[day]['caloriesConsumed'] for day in days)
+        burned = sum(daily[day]['caloriesBurned'] for day in days)
+        assert bucket['days'] == len(days)
+        assert bucket['caloriesConsumed'] == consumed
+        assert bucket['caloriesBurned'] == burned
+        assert bucket['steps'] == sum(daily[day]['steps'] for day in days)
+        assert bucket['calorieBalance'] == consumed - burned
+        assert _close(bucket['averageDailyBalance'], (consumed - burned) / len(days))
+        assert _close(bucket['averageWeight'], _mean(weight.get(day) for day in days))
+
+def test_weight_trend_and_calorie_balance_match_a_plain_python_computation(client, user, entries):
+    _, headers = user
+    daily, weight = _reference(*entries)
+    days = [day.isoformat() for day in _days(START, END)]
+    points = [(i, weight[day]) for i, day in enumerate(days) if day in weight]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = (sum((x - mean_x) * (y - mean_y) for x, y in points)
+             / sum((x - mean_x) ** 2 for x, _ in points))
+    intercept = mean_y - slope * mean_x
+
+    trend = _get(client, headers, '/api/analytics/weight-trend')
+
+    assert trend['points'] == len(points)
+    assert _close(trend['slopePerDay'], slope, places=4)
+    assert _close(trend['start']['weight'], intercept)
+    assert _close(trend['end']['weight'], intercept + slope * (len(days) - 1))
+
+    balances = [daily[day]['caloriesConsumed'] - daily[day]['caloriesBurned'] for day in days]
+    logged = [balance for day, balance in zip(days, balances)
+              if daily[day]['caloriesConsumed'] or daily[day]['caloriesBurned']]
+
+    result = _get(client, headers, '/api/analytics/calorie-balance')
+
+    assert result['consumed'] == sum(daily[day]['caloriesConsumed'] for day in days)
+    assert result['burned'] == sum(daily[day]['caloriesBurned'] for day in days)
+    assert result['balance'] == sum(balances)
+    assert _close(result['averageDailyBalance'], sum(balances) / len(days))
+    assert result['loggedDays'] == len(logged)
+    assert _close(result['averageLoggedDayBalance'], sum(logged) / len(logged))
+
+def test_weight_trend_needs_two_weigh_ins(client, user):
+    _, headers = user
+    client.post('/api/progress', json={'date': START.isoformat(), 'weight': 75}, headers=headers)
+
+    trend = _get(client, headers, '/api/analytics/weight-trend')
+
+    assert (trend['points'], trend['slopePerDay'], trend['start']) == (1, None, None)
+
+@pytest.mark.parametrize('args, message', [
+    ({'from': '2026-03-01', 'to': '2026-02-01'}, "'from' must not be after 'to'"),
+    ({'from': '2010-01-01', 'to': '2026-02-01'}, 'Ranges are limited to 3660 days'),
+    ({'from': 'yesterday'}, "Invalid 'from' date, expected YYYY-MM-DD"),
+])
+def test_bad_ranges_are_rejected(client, user, args, message):
+    _, headers = user
+
+    response = client.get('/api/analytics', query_string=args, headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
@@ -0,0 +1,26 @@
+from flask_jwt_extended import decode_token
+
+def test_refresh_reloads_embedded_claims_from_the_user_row(app, client, user):
+    _, headers = user
+    app.config['JWT_EMBED_USER_CLAIMS'] = True
+
+    login = client.post('/api/auth/login', json={'email': 'runner@example.com', 'password': 'password123'})
+    refresh_headers = {'Authorization': f"Bearer {login.get_json()['refresh_token']}"}
+
+    assert client.put('/api/user/profile', json={'name': 'Marathoner'}, headers=headers).status_code == 200
+
+    response = client.post('/api/auth/refresh', headers=refresh_headers)
+    assert response.status_code == 200
+    with app.app_context():
+        claims = decode_token(response.get_json()['access_token'])
+    assert claims['name'] == 'Marathoner'
+    assert claims['email'] == 'runner@example.com'
+
+def test_refresh_leaves_claims_out_unless_enabled(app, client, user):
+    login = client.post('/api/auth/login', json={'email': 'runner@example.com', 'password': 'password123'})
+    refresh_headers = {'Authorization': f"Bearer {login.get_json()['refresh_token']}"}
+
+    response = client.post('/api/auth/refresh', headers=refresh_headers)
+    with app.app_context():
+        claims = decode_token(response.get_json()['access_token'])
+    assert 'name' not in claims and 'email' not in claims
@@ -0,0 +1,68 @@
+import logging
+
+def _workout(**fields):
+    return {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05', **fields}
+
+def test_invalid_items_fail_alone(client, user):
+    _, headers = user
+    items = [
+        _workout(),
+        _workout(caloriesBurned='lots'),
+        _workout(duration=None),
+        _workout(date='05/01/2026'),
+        _workout(sets=2.5),
+        'not an object',
+        _workout(exerciseName=''),
+        _workout(caloriesBurned=150),
+    ]
+
+    result = client.post('/api/workouts/bulk', json=items, headers=headers).get_json()
+
+    assert result['created'] == 2
+    assert [item['status'] for item in result['results']] == ['created'] + ['error'] * 6 + ['created']
+    assert [item.get('error') for item in result['results'][1:7]] == [
+        "'caloriesBurned' must be a number",
+        "Missing field 'duration'",
+        "'date' must be a date (YYYY-MM-DD)",
+        "'sets' must be a whole number",
+        'Entry must be a JSON object',
+        "'exerciseName' must be a non-empty string",
+    ]
+    assert len(client.get('/api/workouts', headers=headers).get_json()) == 2
+
+def test_mixed_ndjson_upload(client, user):
+    _, headers = user
+    body = '\n'.join([
+        '{"foodName": "Oats", "calories": 380, "date": "2026-01-05", "mealType": "breakfast"}',
+        '{"foodName": "Rice", "calories": 130, "protein": "NaN", "date": "2026-01-05", "mealType": "lunch"}',
+        '{"foodName": "Broken"',
+        '{"foodName": "Apple", "calories": 52, "date": "2026-01-05", "mealType": "snack", "protein": null}',
+    ])
+
+    result = client.post('/api/nutrition/bulk', data=body, headers={**headers, 'Content-Type': 'application/x-ndjson'}).get_json()
+
+    assert [item['status'] for item in result['results']] == ['created', 'error', 'error', 'created']
+    assert result['results'][1]['error'] == "'protein' must be a number"
+    assert result['results'][2]['error'].startswith('Invalid JSON')
+
+def test_database_errors_are_not_sent_to_the_client(client, user, monkeypatch, caplog):
+    import backend.bulk as bulk
+
+    def broken(model, rows):
+        raise RuntimeError('INSERT INTO workouts ... secret parameters')
+
+    _, headers = user
+    monkeypatch.setattr(bulk, 'record_rows', broken)
+    with caplog.at_level(logging.ERROR, logger='backend.bulk'):
+        result = client.post('/api/workouts/bulk', json=[_workout(), _workout()], headers=headers).get_json()
+
+    assert result['created'] == 0
+    assert {item['error'] for item in result['results']} == {'Could not save entry'}
+    assert 'secret parameters' in caplog.text
+
+def test_single_create_rejects_invalid_fields(client, user):
+    _, headers = user
+    response = client.post('/api/workouts', json=_workout(duration='long'), headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'message': "'duration' must be a number"}
@@ -0,0 +1,50 @@
+from datetime import date
+
+import backend.routes.dashboard as dashboard_routes
+
+def test_write_during_computation_does_not_leave_stale_stats(client, user, monkeypatch):
+    _, headers = user
+    compute = dashboard_routes.compute_dashboard_stats
+    writes = []
+
+    def compute_then_write(user_id, today):
+        stats = compute(user_id, today)
+        if not writes:
+            # Commits (and invalidates the cache) after the stats above were read
+            writes.append(client.post('/api/workouts', json={
+                'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20,
+                'caloriesBurned': 300, 'date': date.today().isoformat()
+            }, headers=headers).status_code)
+        return stats
+
+    monkeypatch.setattr(dashboard_routes, 'compute_dashboard_stats', compute_then_write)
+    stale = client.get('/api/dashboard/stats', headers=headers)
+    fresh = client.get('/api/dashboard/stats', headers=headers)
+
+    assert writes == [201]
+    assert fresh.get_json() != stale.get_json()
+    assert fresh.headers['ETag'] != stale.headers['ETag']
+    assert client.get('/api/dashboard/stats', headers=headers).get_json() == fresh.get_json()
+
+def test_if_modified_since_revalidation_rolls_over_with_the_day(client, user, monkeypatch):
+    import backend.versions as versions
+
+    _, headers = user
+    client.post('/api/workouts', json={
+        'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': date.today().isoformat()
+    }, headers=headers)
+    first = client.get('/api/dashboard/stats', headers=headers)
+    since = {**headers, 'If-Modified-Since': first.headers['Last-Modified']}
+
+    assert client.get('/api/dashboard/stats', headers=since).status_code == 304
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(versions, 'date', Tomorrow)
+    rolled = client.get('/api/dashboard/stats', headers=since)
+
+    assert rolled.status_code == 200
+    assert rolled.last_modified > first.last_modified
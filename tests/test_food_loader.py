@@ -0,0 +1,69 @@
+import io
+import json
+
+import pytest
+
+from backend.food_loader import FoodLoadError, _iter_json_array, load_foods
+
+def _foods(count):
+    return [{'name': f'Food {i}', 'calories': 100 + i, 'protein': 1.5} for i in range(count)]
+
+def test_json_array_items_spanning_blocks():
+    foods = _foods(50)
+    text = json.dumps(foods, indent=2).replace('},', '} ,\n')
+
+    assert list(_iter_json_array(io.StringIO(text), block_size=7)) == foods
+
+def test_json_array_truncated():
+    text = json.dumps(_foods(3))[:-20]
+
+    with pytest.raises(FoodLoadError, match='Truncated'):
+        list(_iter_json_array(io.StringIO(text), block_size=16))
+
+def test_malformed_json_item_is_reported_without_reading_the_rest():
+    class Source(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    text = '[{"name": "Oats", "calories": 380}, {"name": "Rice" "calories": 130}, ' + ', '.join(
+        json.dumps(food) for food in _foods(5000)) + ']'
+    source = Source(text)
+
+    with pytest.raises(FoodLoadError, match='Malformed JSON item at character 36'):
+        list(_iter_json_array(source, block_size=64, max_item_size=256))
+    assert source.reads < 10
+
+def test_malformed_ndjson_line_is_counted_and_the_load_continues(app, tmp_path):
+    lines = [json.dumps(food) for food in _foods(4)]
+    lines.insert(2, '{"name": "Broken", "calories": ')
+    path = tmp_path / 'foods.ndjson'
+    path.write_text('\n'.join(lines) + '\n')
+
+    with app.app_context():
+        stats = load_foods(str(path), batch_size=2)
+
+    assert stats['records'] == 5
+    assert stats['inserted'] == 4
+    assert stats['invalid'] == 1
+    assert stats['errors'][0].startswith('record 3: invalid JSON')
+
+def test_non_finite_numbers_are_counted_and_the_load_continues(app, tmp_path):
+    path = tmp_path / 'foods.csv'
+    path.write_text('name,calories,protein\n'
+                    'Oats,380,13\n'
+                    'Comet,inf,1\n'
+                    'Star,1e400,1\n'
+                    'Void,100,nan\n'
+                    'Rice,130,2.7\n')
+
+    with app.app_context():
+        stats = load_foods(str(path), batch_size=2)
+
+    assert stats['records'] == 5
+    assert stats['inserted'] == 2
+    assert stats['invalid'] == 3
+    assert [error.split(':')[0] for error in stats['errors']] == ['record 2', 'record 3', 'record 4']
+    assert 'finite' in stats['errors'][2]
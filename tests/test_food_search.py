@@ -0,0 +1,96 @@
+import random
+
+import pytest
+from sqlalchemy import update
+
+from backend.extensions import db
+from backend.food_search import EXACT, PREFIX, SUBSTRING, food_index, tokenize
+from backend.models.nutrition import FoodDatabase
+
+@pytest.fixture
+def foods(app):
+    def add(*names):
+        with app.app_context():
+            db.session.add_all(FoodDatabase(name=name, calories=100) for name in names)
+            db.session.commit()
+    return add
+
+def _search(app, text, limit=20):
+    with app.app_context():
+        return [food.name for food in food_index.search_foods(db.session, text, limit)]
+
+def test_ranking(app, foods):
+    foods('Brown Rice', 'Rice Cakes', 'Ricotta', 'Chicken Breast', 'Chickpeas', 'Smoked Salmon')
+
+    assert _search(app, 'rice') == ['Rice Cakes', 'Brown Rice']
+    assert _search(app, 'ric') == ['Rice Cakes', 'Ricotta', 'Brown Rice']
+    assert _search(app, 'chiken') == ['Chicken Breast']
+    assert _search(app, 'salmon smoked') == ['Smoked Salmon']
+    assert _search(app, 'ken') == ['Chicken Breast']
+    assert _search(app, 'x') == []
+
+def test_renames_are_picked_up(app, foods):
+    foods('Banana', 'Apple')
+    assert _search(app, 'banana') == ['Banana']
+
+    with app.app_context():
+        FoodDatabase.query.filter_by(name='Banana').one().name = 'Plantain'
+        db.session.commit()
+
+    assert _search(app, 'plantain') == ['Plantain']
+    assert _search(app, 'banana') == []
+
+def test_core_updates_from_other_writers_are_picked_up(app, foods):
+    foods('Banana', 'Apple')
+    assert _search(app, 'apple') == ['Apple']
+    table = FoodDatabase.__table__
+
+    with app.app_context():
+        # A Core UPDATE, like the bulk loader's, fires no ORM events
+        db.session.execute(update(table).where(table.c.name == 'Apple').values(name='Pear'))
+        db.session.commit()
+        food_index.refresh_seconds = 0
+
+    assert _search(app, 'pear') == ['Pear']
+    assert _search(app, 'apple') == []
+
+def test_delete_and_insert_in_one_window_rebuilds(app, foods):
+    foods('Banana', 'Apple')
+    assert _search(app, 'banana') == ['Banana']
+
+    with app.app_context():
+        db.session.delete(FoodDatabase.query.filter_by(name='Banana').one())
+        db.session.add(FoodDatabase(name='Mango', calories=60))
+        db.session.commit()
+
+    assert _search(app, 'banana') == []
+    assert _search(app, 'mango') == ['Mango']
+
+def _expected(names, term, limit):
+    """Single-term ranking computed the slow way: score every food."""
+    def score(name):
+        best = 0.0
+        for token in tokenize(name):
+            if token == term:
+                best = max(best, EXACT)
+            elif token.startswith(term):
+                best = max(best, PREFIX - (len(token) - len(term)) / 100)
+            elif len(term) >= 3 and term in token:
+                best = max(best, SUBSTRING)
+        return best + (best > 0 and name.lower().startswith(term))
+
+    ranked = sorted((-score(name), len(name), food_id) for food_id, name in names.items() if score(name))
+    return [(-neg_score, food_id) for neg_score, _, food_id in ranked[:limit]]
+
+def test_early_stop_matches_full_ranking(app, foods):
+    rng = random.Random(7)
+    words = ['chicken', 'chickpea', 'chips', 'chili', 'rice', 'brown', 'bread', 'broccoli', 'apple', 'pineapple']
+    foods(*(' '.join(rng.sample(words, rng.randint(1, 3))).title() for _ in range(2000)))
+
+    with app.app_context():
+        names = dict(db.session.query(FoodDatabase.id, FoodDatabase.name))
+        for term in ('chi', 'chicken', 'br', 'apple', 'ppl', 'rice'):
+            ids = food_index.search(db.session, term, limit=20)
+            expected = _expected(names, term, 20)
+            # Ties on score may be cut in a different order; the scores must agree
+            assert [score for score, _ in expected] == [_expected({i: names[i]}, term, 1)[0][0] for i in ids], term
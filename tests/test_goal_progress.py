@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+import pytest
+
+TODAY = date.today()
+END = (TODAY + timedelta(days=30)).isoformat()
+
+def _day(days_ago):
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+def _workout(days_ago=0):
+    return {'exerciseName': 'Run', 'exerciseType': 'cardio', 'duration': 30, 'caloriesBurned': 200, 'date': _day(days_ago)}
+
+class Api:
+    def __init__(self, client, headers):
+        self.client = client
+        self.headers = headers
+
+    def post(self, path, body):
+        response = self.client.post(path, json=body, headers=self.headers)
+        assert response.status_code in (200, 201), response.get_data(as_text=True)
+        return response.get_json()
+
+    def goal(self, **fields):
+        return self.post('/api/goals', {'title': 'Goal', 'unit': 'u', 'category': 'c', 'targetDate': END, **fields})
+
+    def current(self, goal):
+        goals = self.client.get('/api/goals', headers=self.headers).get_json()
+        return next(item for item in goals if item['id'] == goal['id'])
+
+@pytest.fixture
+def api(client, user):
+    return Api(client, user[1])
+
+def test_sum_goal_follows_creates_updates_and_deletes(api):
+    steps = api.goal(metric='steps', targetValue=20000, startDate=_day(5))
+    api.post('/api/progress', {'date': _day(10), 'steps': 50000})  # before the goal's window
+    first = api.post('/api/progress', {'date': _day(3), 'steps': 12000})
+    second = api.post('/api/progress', {'date': _day(1), 'steps': 9000})
+
+    assert api.current(steps)['currentValue'] == 21000
+    assert api.current(steps)['status'] == 'completed'
+
+    api.client.put(f"/api/progress/{first['id']}", json={'steps': 5000}, headers=api.headers)
+    assert api.current(steps)['currentValue'] == 14000
+    assert api.current(steps)['status'] == 'active'
+
+    api.client.delete(f"/api/progress/{second['id']}", headers=api.headers)
+    assert api.current(steps)['currentValue'] == 5000
+
+def test_weight_goal_tracks_the_latest_weigh_in(api):
+    weight = api.goal(metric='weight', targetValue=79, startValue=82, startDate=_day(7))
+    api.post('/api/progress', {'date': _day(3), 'weight': 80})
+    latest = api.post('/api/progress', {'date': _day(1), 'weight': 78.5})
+    api.post('/api/progress', {'date': _day(2), 'weight': 81})  # older than the latest
+
+    assert api.current(weight)['currentValue'] == 78.5
+    assert api.current(weight)['status'] == 'completed'
+
+    api.client.delete(f"/api/progress/{latest['id']}", headers=api.headers)
+    assert api.current(weight)['currentValue'] == 81
+    assert api.current(weight)['status'] == 'active'
+
+def test_count_goal_includes_bulk_imports(api):
+    workouts = api.goal(metric='workouts', targetValue=3, startDate=_day(7))
+    api.post('/api/workouts', _workout())
+    assert api.post('/api/workouts/bulk', [_workout(), _workout(1)])['created'] == 2
+
+    assert api.current(workouts)['currentValue'] == 3
+    assert api.current(workouts)['completedAt'] is not None
+
+def test_new_goal_counts_existing_entries_and_ignores_current_value(api):
+    api.post('/api/workouts', _workout(1))
+    api.post('/api/workouts', _workout(2))
+
+    goal = api.goal(metric='workout_minutes', targetValue=300, startDate=_day(7), currentValue=999)
+
+    assert goal['currentValue'] == 60
+
+def test_unknown_metric_is_rejected(api):
+    response = api.client.post('/api/goals', json={
+        'title': 'Goal', 'unit': 'u', 'category': 'c', 'targetDate': END, 'targetValue': 1, 'metric': 'bogus'
+    }, headers=api.headers)
+
+    assert response.status_code == 400
+
+def test_recompute_matches_incremental_values(app, api):
+    from backend.extensions import db
+
+    steps = api.goal(metric='steps', targetValue=20000, startDate=_day(5))
+    calories = api.goal(metric='calories_burned', targetValue=1000, startDate=_day(5))
+    api.post('/api/progress', {'date': _day(2), 'steps': 7000})
+    api.post('/api/workouts', _workout(2))
+    expected = [api.current(goal)['currentValue'] for goal in (steps, calories)]
+
+    with app.app_context():
+        db.session.execute(db.text('UPDATE goals SET current_value = 0'))
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=['recompute-goals'])
+
+    assert result.exit_code == 0
+    assert [api.current(goal)['currentValue'] for goal in (steps, calories)] == expected == [7000, 200]
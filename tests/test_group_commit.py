@@ -0,0 +1,171 @@
+import sqlite3
+import threading
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.extensions import db
+from backend.group_commit import GroupCommitter, GroupCommitTimeout, group_committer
+from backend.models.workout import Workout
+
+def _enable(app, **config):
+    app.config.update(GROUP_COMMIT_ENABLED=True, **config)
+    group_committer.init_app(app)
+
+def _count(db_path):
+    """Workouts visible to a separate connection, i.e. committed ones."""
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute('SELECT COUNT(*) FROM workouts').fetchone()[0]
+    finally:
+        connection.close()
+
+def _workout(user_id, name='Rowing'):
+    return Workout(user_id=user_id, exercise_name=name, exercise_type='cardio', duration=20, date=date(2026, 1, 5))
+
+def _write_concurrently(app, applies):
+    """Run group_committer.write() for each apply from its own thread; returns results or exceptions."""
+    results = [None] * len(applies)
+
+    def write(index, apply):
+        with app.app_context():
+            try:
+                results[index] = group_committer.write(apply, lambda: index)
+            except Exception as e:
+                results[index] = e
+
+    threads = [threading.Thread(target=write, args=(index, apply)) for index, apply in enumerate(applies)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_batch_is_invisible_until_the_shared_commit(app, user, db_path):
+    _enable(app, GROUP_COMMIT_WINDOW_MS=200)
+    user_id, _ = user
+    seen = []
+
+    def apply():
+        db.session.add(_workout(user_id))
+        db.session.flush()
+        seen.append(_count(db_path))
+
+    results = _write_concurrently(app, [apply, apply, apply])
+
+    assert results == [0, 1, 2]
+    assert group_committer.stats()['batches'] >= 1
+    assert seen == [0, 0, 0]
+    assert _count(db_path) == 3
+
+def test_failed_shared_commit_keeps_nothing_before_the_fallback(app, user, db_path, monkeypatch):
+    _enable(app, GROUP_COMMIT_WINDOW_MS=200)
+    user_id, _ = user
+    failures = []
+    before_fallback = []
+
+    def fail_once(session):
+        if threading.current_thread().name == 'group-commit' and not failures and not session.in_nested_transaction():
+            failures.append(True)
+            raise RuntimeError('disk full')
+
+    commit_each = GroupCommitter._commit_each
+
+    def spy(self, units):
+        before_fallback.append(_count(db_path))
+        return commit_each(self, units)
+
+    monkeypatch.setattr(GroupCommitter, '_commit_each', spy)
+    event.listen(Session, 'before_commit', fail_once)
+    try:
+        results = _write_concurrently(app, [lambda: db.session.add(_workout(user_id))] * 3)
+    finally:
+        event.remove(Session, 'before_commit', fail_once)
+
+    assert results == [0, 1, 2]
+    assert before_fallback == [0]
+    assert _count(db_path) == 3
+
+def test_failing_write_only_fails_its_own_request(app, user, client):
+    _enable(app, GROUP_COMMIT_WINDOW_MS=50)
+    _, headers = user
+    workout = {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05'}
+    bad_goal = {'title': None, 'targetValue': 5, 'unit': 'x', 'category': 'c', 'targetDate': '2026-12-01'}
+    statuses = []
+
+    def post(path, body):
+        statuses.append((path, client.post(path, json=body, headers=headers).status_code))
+
+    threads = [threading.Thread(target=post, args=('/api/goals', bad_goal))]
+    threads += [threading.Thread(target=post, args=('/api/workouts', workout)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [('/api/goals', 500)] + [('/api/workouts', 201)] * 4
+    assert len(client.get('/api/workouts', headers=headers).get_json()) == 4
+
+def test_timeout_reports_what_happened(app, user, db_path):
+    _enable(app, GROUP_COMMIT_WINDOW_MS=0, GROUP_COMMIT_TIMEOUT=0.2)
+    user_id, _ = user
+    release = threading.Event()
+
+    def slow():
+        db.session.add(_workout(user_id, 'slow'))
+        release.wait(5)
+
+    results = [None, None]
+
+    def write(index, apply):
+        with app.app_context():
+            try:
+                results[index] = group_committer.write(apply, lambda: 'saved')
+            except Exception as e:
+                results[index] = e
+
+    first = threading.Thread(target=write, args=(0, slow))
+    first.start()
+    time.sleep(0.05)
+    # Queued behind the slow batch: gives up before it is picked up, so it is never written
+    write(1, lambda: db.session.add(_workout(user_id, 'queued')))
+    release.set()
+    first.join()
+
+    # The slow write was already running when its wait ran out, so it reports the commit
+    assert results[0] == 'saved'
+    assert isinstance(results[1], GroupCommitTimeout)
+    connection = sqlite3.connect(db_path)
+    assert connection.execute('SELECT exercise_name FROM workouts').fetchall() == [('slow',)]
+    connection.close()
+
+@pytest.mark.parametrize('enabled', [False, True])
+def test_create_returns_the_stored_entry(app, user, client, enabled):
+    if enabled:
+        _enable(app)
+    _, headers = user
+    response = client.post('/api/workouts', json={
+        'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05'
+    }, headers=headers)
+
+    assert response.status_code == 201
+    assert client.get('/api/workouts', headers=headers).get_json() == [response.get_json()]
+
+def test_group_committed_writes_bump_versions_and_sync(app, user, client):
+    _enable(app)
+    _, headers = user
+    listing = client.get('/api/workouts', headers=headers)
+    token = client.get('/api/sync', headers=headers).get_json()['token']
+
+    created = client.post('/api/workouts', json={
+        'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05'
+    }, headers=headers).get_json()
+
+    revalidated = client.get('/api/workouts', headers={**headers, 'If-None-Match': listing.headers['ETag']})
+    assert revalidated.status_code == 200
+    assert revalidated.headers['ETag'] != listing.headers['ETag']
+    delta = client.get(f'/api/sync?since={token}', headers=headers).get_json()
+    assert [row['id'] for row in delta['workouts']] == [created['id']]
@@ -0,0 +1,19 @@
+from backend.extensions import db
+from backend.migrations import check_index_coverage, upgrade
+
+def test_hot_queries_use_indexes(app):
+    with app.app_context():
+        assert check_index_coverage() == []
+
+def test_upgrade_restores_missing_indexes(app):
+    with app.app_context():
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name.endswith('_id') and not index.unique:
+                    db.session.execute(db.text(f'DROP INDEX {index.name}'))
+        db.session.commit()
+        assert check_index_coverage() != []
+
+        upgrade()
+
+        assert check_index_coverage() == []
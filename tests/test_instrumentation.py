@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from backend.extensions import db
+from backend.instrumentation import assert_no_n_plus_one, capture_queries, instrumentation
+
+def _seed(client, headers, days=10):
+    workouts = [{'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': f'2026-01-{day:02d}'}
+                for day in range(1, days + 1)]
+    meals = [{'foodName': 'Oats', 'calories': 380, 'date': f'2026-01-{day:02d}', 'mealType': 'breakfast'}
+             for day in range(1, days + 1)]
+    client.post('/api/workouts/bulk', json=workouts, headers=headers)
+    client.post('/api/nutrition/bulk', json=meals, headers=headers)
+
+def test_read_endpoints_do_not_repeat_statements_per_row(client, user):
+    _, headers = user
+    _seed(client, headers)
+
+    for path in ('/api/workouts', '/api/nutrition', '/api/dashboard/stats', '/api/user/profile'):
+        with assert_no_n_plus_one(max_queries=6):
+            assert client.get(path, headers=headers).status_code == 200
+
+def test_assert_no_n_plus_one_reports_repeats_and_query_budget(app):
+    with app.app_context():
+        with pytest.raises(AssertionError, match=r'Statement ran 4 times \(N\+1\?\): SELECT 1'):
+            with assert_no_n_plus_one(max_repeats=3):
+                for _ in range(4):
+                    db.session.execute(text('SELECT 1'))
+
+        with pytest.raises(AssertionError, match='3 queries, expected at most 2'):
+            with assert_no_n_plus_one(max_queries=2):
+                for number in range(3):
+                    db.session.execute(text(f'SELECT {number}'))
+
+        with capture_queries() as statements:
+            db.session.execute(text('SELECT 1'))
+        assert statements == ['SELECT 1']
+
+def test_requests_are_counted_and_timed(client, user):
+    _, headers = user
+    _seed(client, headers, days=3)
+    key = ('workouts.get_workouts', 'GET')
+    requests_before = instrumentation.requests[(*key, '200')]
+    loads_before = instrumentation.orm_loads[('user.get_profile', 'GET')]
+
+    response = client.get('/api/workouts', headers=headers)
+    client.get('/api/user/profile', headers=headers)
+
+    assert response.headers['Server-Timing'].startswith('app;dur=')
+    assert 'queries"' in response.headers['Server-Timing']
+    assert instrumentation.requests[(*key, '200')] == requests_before + 1
+    assert instrumentation.orm_loads[('user.get_profile', 'GET')] > loads_before
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="workouts.get_workouts",method="GET"}' in metrics
+    assert 'db_statements_per_request_bucket{endpoint="workouts.get_workouts",method="GET",le="+Inf"}' in metrics
+    assert '\ndashboard_cache_hits ' in metrics
+
+def test_repeated_and_slow_statements_are_logged(client, user, monkeypatch, caplog):
+    _, headers = user
+    monkeypatch.setattr(instrumentation, 'n_plus_one_threshold', 1)
+    monkeypatch.setattr(instrumentation, 'slow_query_seconds', 0)
+    flagged_before = instrumentation.n_plus_one[('workouts.get_workouts', 'GET')]
+    slow_before = instrumentation.slow_queries
+
+    with caplog.at_level(logging.WARNING, logger='backend.sql'):
+        client.get('/api/workouts', headers=headers)
+
+    assert any(message.startswith('Possible N+1 in workouts.get_workouts') for message in caplog.messages)
+    assert any(message.startswith('Slow query') for message in caplog.messages)
+    assert instrumentation.n_plus_one[('workouts.get_workouts', 'GET')] == flagged_before + 1
+    assert instrumentation.slow_queries > slow_before
+
+def test_metrics_token_is_required_when_set(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-me'
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-me'}).status_code == 200
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.extensions import db
+from backend.jobs import job_queue, task
+from backend.models.job import Job
+
+calls = []
+release = threading.Event()
+
+@task('test-flaky', max_attempts=2)
+def flaky(payload, job_id):
+    calls.append(job_id)
+    if len(calls) == 1:
+        raise RuntimeError('first attempt fails')
+    return {'attempt': len(calls)}
+
+@task('test-block', max_attempts=3)
+def block(payload, job_id):
+    release.wait(10)
+    return {}
+
+@task('test-block-once', max_attempts=1)
+def block_once(payload, job_id):
+    release.wait(10)
+    return {}
+
+@pytest.fixture
+def jobs(app, tmp_path, monkeypatch):
+    """Run jobs by hand: one claim slot, no worker threads."""
+    app.config['JOBS_RESULT_DIR'] = str(tmp_path / 'jobs')
+    calls.clear()
+    release.clear()
+    monkeypatch.setattr(job_queue, 'workers', 0)
+    return app
+
+def _enqueue(app, kind, **options):
+    with app.app_context():
+        return job_queue.enqueue(kind, {}, **options).id
+
+def _run_next(app, monkeypatch):
+    monkeypatch.setattr(job_queue, 'workers', 1)
+    with app.app_context():
+        job = job_queue._claim()
+        assert job is not None
+        job_queue._execute(app, job)
+    monkeypatch.setattr(job_queue, 'workers', 0)
+
+def _job(app, job_id):
+    with app.app_context():
+        return db.session.get(Job, job_id).to_dict()
+
+def test_failed_job_is_retried_with_backoff(jobs, monkeypatch):
+    monkeypatch.setattr(job_queue, 'retry_delay', 60)
+    job_id = _enqueue(jobs, 'test-flaky')
+
+    _run_next(jobs, monkeypatch)
+    job = _job(jobs, job_id)
+    assert (job['status'], job['attempts']) == ('queued', 1)
+    assert job['error'] == 'RuntimeError: first attempt fails'
+    assert datetime.fromisoformat(job['runAt']) > datetime.utcnow() + timedelta(seconds=50)
+
+    with jobs.app_context():
+        db.session.get(Job, job_id).run_at = datetime.utcnow()
+        db.session.commit()
+    _run_next(jobs, monkeypatch)
+    job = _job(jobs, job_id)
+    assert (job['status'], job['attempts'], job['result']) == ('succeeded', 2, {'attempt': 2})
+
+def test_expired_lease_is_requeued_or_failed(jobs, monkeypatch):
+    retryable = _enqueue(jobs, 'test-block')
+    final = _enqueue(jobs, 'test-block-once')
+    monkeypatch.setattr(job_queue, 'workers', 2)
+    with jobs.app_context():
+        assert job_queue._claim() and job_queue._claim()
+        stale = datetime.utcnow() - timedelta(seconds=job_queue.lease + 1)
+        Job.query.update({'heartbeat_at': stale})
+        db.session.commit()
+        job_queue.requeue_expired()
+
+    assert _job(jobs, retryable)['status'] == 'queued'
+    assert _job(jobs, final)['status'] == 'failed'
+    assert _job(jobs, final)['error'] == 'Worker stopped responding'
+
+def test_shutdown_waits_then_releases_unfinished_jobs(jobs, monkeypatch):
+    monkeypatch.setattr(job_queue, 'workers', 2)
+    monkeypatch.setattr(job_queue, 'poll_interval', 0.05)
+    job_queue.start(jobs)
+    threads = list(job_queue._threads)
+    try:
+        retryable = _enqueue(jobs, 'test-block')
+        final = _enqueue(jobs, 'test-block-once')
+        deadline = time.monotonic() + 5
+        while len(job_queue._running) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(job_queue._running) == 2
+
+        job_queue.shutdown(timeout=0.2)
+    finally:
+        release.set()
+        job_queue.shutdown(timeout=0)
+        for thread in threads:
+            thread.join(5)
+
+    job = _job(jobs, retryable)
+    assert (job['status'], job['attempts']) == ('queued', 0)
+    job = _job(jobs, final)
+    assert (job['status'], job['error']) == ('failed', 'Interrupted by shutdown')
+
+def test_shutdown_lets_quick_jobs_finish(jobs, monkeypatch):
+    monkeypatch.setattr(job_queue, 'workers', 1)
+    monkeypatch.setattr(job_queue, 'poll_interval', 0.05)
+    job_queue.start(jobs)
+    threads = list(job_queue._threads)
+    job_id = _enqueue(jobs, 'test-block')
+    deadline = time.monotonic() + 5
+    while not job_queue._running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    threading.Timer(0.1, release.set).start()
+    job_queue.shutdown(timeout=5)
+    for thread in threads:
+        thread.join(5)
+
+    assert _job(jobs, job_id)['status'] == 'succeeded'
+
+def test_async_bulk_upload_is_spooled_to_disk(jobs, client, user, monkeypatch):
+    _, headers = user
+    body = '{"weight": 70.5, "date": "2026-01-05"}\n{"weight": "heavy", "date": "2026-01-06"}\n'
+
+    response = client.post('/api/progress/bulk?async=1', data=body,
+                           headers={**headers, 'Content-Type': 'application/x-ndjson'})
+    assert response.status_code == 202
+    job_id = response.get_json()['id']
+    with jobs.app_context():
+        payload = db.session.get(Job, job_id).payload
+    uploads = os.path.join(jobs.config['JOBS_RESULT_DIR'], 'uploads')
+    [name] = os.listdir(uploads)
+    assert 'weight' not in payload and name in payload
+    with open(os.path.join(uploads, name)) as handle:
+        assert handle.read() == body
+
+    _run_next(jobs, monkeypatch)
+    job = _job(jobs, job_id)
+    assert job['status'] == 'succeeded'
+    assert [item['status'] for item in job['result']['results']] == ['created', 'error']
+    assert os.listdir(uploads) == []
@@ -0,0 +1,18 @@
+from sqlalchemy.dialects import mysql, postgresql
+
+from backend.migrations import upgrade, widen_column_ddl, widen_columns
+from backend.models.user import User
+
+def test_widen_password_hash_ddl():
+    table = User.__table__
+    column = table.c.password_hash
+
+    assert widen_column_ddl(table, column, postgresql.dialect()) == \
+        'ALTER TABLE users ALTER COLUMN password_hash TYPE VARCHAR(255)'
+    assert widen_column_ddl(table, column, mysql.dialect()) == \
+        'ALTER TABLE users MODIFY COLUMN password_hash VARCHAR(255) NOT NULL'
+
+def test_sqlite_needs_no_widening(app):
+    with app.app_context():
+        assert widen_columns() == []
+        assert not any(step.startswith('Widened') for step in upgrade())
@@ -0,0 +1,68 @@
+import pytest
+
+def _seed(client, headers, dates):
+    items = [{'exerciseName': f'Run {i}', 'exerciseType': 'cardio', 'duration': 30, 'date': day}
+             for i, day in enumerate(dates)]
+    assert client.post('/api/workouts/bulk', json=items, headers=headers).get_json()['created'] == len(dates)
+
+def _pages(client, headers, path, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+        response = client.get(path, query_string=query, headers=headers)
+        assert response.status_code == 200
+        ids += [item['id'] for item in response.get_json()]
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return ids, pages
+        assert f'cursor={cursor}' in response.headers['Link']
+
+def test_cursor_pages_cover_the_full_list_in_order(client, user):
+    _, headers = user
+    # Several entries share a date, so pages must break ties on id
+    _seed(client, headers, ['2026-01-01', '2026-01-02', '2026-01-02', '2026-01-02', '2026-01-03', '2026-01-05', '2026-01-05'])
+
+    full = client.get('/api/workouts', headers=headers).get_json()
+    ids, pages = _pages(client, headers, '/api/workouts', limit=2)
+
+    assert ids == [item['id'] for item in full]
+    assert pages == 4
+    assert [item['date'] for item in full] == sorted((item['date'] for item in full), reverse=True)
+
+def test_goal_cursor_round_trips_timestamps(client, user):
+    _, headers = user
+    for i in range(5):
+        goal = {'title': f'Goal {i}', 'targetValue': 10, 'unit': 'km', 'category': 'cardio', 'targetDate': '2026-12-31'}
+        assert client.post('/api/goals', json=goal, headers=headers).status_code == 201
+
+    full = client.get('/api/goals', headers=headers).get_json()
+    ids, _ = _pages(client, headers, '/api/goals', limit=2)
+
+    assert ids == [item['id'] for item in full]
+
+def test_date_range_applies_with_paging(client, user):
+    _, headers = user
+    _seed(client, headers, ['2026-01-01', '2026-01-02', '2026-01-03', '2026-01-04'])
+
+    response = client.get('/api/workouts', query_string={'from': '2026-01-02', 'to': '2026-01-03', 'limit': 10},
+                          headers=headers)
+
+    assert [item['date'] for item in response.get_json()] == ['2026-01-03', '2026-01-02']
+    assert 'X-Next-Cursor' not in response.headers
+
+@pytest.mark.parametrize('query, message', [
+    ({'cursor': 'not-a-cursor'}, 'Invalid cursor'),
+    ({'cursor': 'WzEsMl0'}, 'Invalid cursor'),  # [1,2]: valid JSON, wrong shape
+    ({'limit': '0'}, "'limit' must be between 1 and 500"),
+    ({'limit': '501'}, "'limit' must be between 1 and 500"),
+    ({'limit': 'ten'}, "'limit' must be an integer"),
+    ({'from': '01/02/2026'}, "Invalid 'from' date, expected YYYY-MM-DD"),
+])
+def test_bad_paging_arguments_are_rejected(client, user, query, message):
+    _, headers = user
+
+    response = client.get('/api/workouts', query_string=query, headers=headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app import create_app
+from backend.replicas import replica_router, sync_sqlite_replicas
+
+@pytest.fixture
+def replica_path(tmp_path):
+    return str(tmp_path / 'replica.db')
+
+@pytest.fixture
+def app(db_path, replica_path):
+    from backend.extensions import db
+    from backend.migrations import upgrade
+
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'DATABASE_REPLICA_URLS': [f'sqlite:///{replica_path}'],
+        'JOBS_WORKERS': 0,
+    })
+    with app.app_context():
+        upgrade()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+def _workout():
+    return {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05'}
+
+def _age_writes(app, seconds):
+    from backend.extensions import db
+    from backend.models.resource_version import ResourceVersion
+
+    with app.app_context():
+        ResourceVersion.query.update({'updated_at': datetime.utcnow() - timedelta(seconds=seconds)})
+        db.session.commit()
+
+def _workouts(client, headers):
+    return client.get('/api/workouts', headers=headers).get_json()
+
+def test_writes_from_another_process_route_reads_to_the_primary(app, client, user, db_path, replica_path):
+    _, headers = user
+    sync_sqlite_replicas(db_path, [replica_path])
+
+    assert client.post('/api/workouts', json=_workout(), headers=headers).status_code == 201
+    # As if the write had been handled by another web process
+    replica_router._last_write.clear()
+
+    assert len(_workouts(client, headers)) == 1
+
+    _age_writes(app, replica_router.window + 1)
+    assert _workouts(client, headers) == []
+
+def test_writes_from_this_process_route_reads_to_the_primary(app, client, user, db_path, replica_path):
+    _, headers = user
+    sync_sqlite_replicas(db_path, [replica_path])
+
+    assert client.post('/api/workouts', json=_workout(), headers=headers).status_code == 201
+    _age_writes(app, replica_router.window + 1)
+
+    assert len(_workouts(client, headers)) == 1
+
+def test_users_without_recent_writes_read_from_a_replica(app, client, user, db_path, replica_path):
+    _, headers = user
+    assert client.post('/api/workouts', json=_workout(), headers=headers).status_code == 201
+    sync_sqlite_replicas(db_path, [replica_path])
+    assert client.post('/api/workouts', json=_workout(), headers=headers).status_code == 201
+    _age_writes(app, replica_router.window + 1)
+    replica_router._last_write.clear()
+
+    assert len(_workouts(client, headers)) == 1
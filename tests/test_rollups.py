@@ -0,0 +1,73 @@
+from datetime import date
+
+from backend.extensions import db
+from backend.models.daily_summary import DailySummary
+from backend.rollups import find_inconsistencies, rebuild_daily_summaries
+
+def _workout(day, calories):
+    return {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': day, 'caloriesBurned': calories}
+
+def _meal(day, calories, protein):
+    return {'foodName': 'Oats', 'calories': calories, 'protein': protein, 'date': day, 'mealType': 'breakfast'}
+
+def _summaries(app, user_id):
+    with app.app_context():
+        return {row.date.isoformat(): row.to_dict() for row in DailySummary.query.filter_by(user_id=user_id)}
+
+def _consistent(app):
+    with app.app_context():
+        return find_inconsistencies() == []
+
+def test_writes_keep_summaries_in_step_with_entries(app, client, user):
+    user_id, headers = user
+    first = client.post('/api/workouts', json=_workout('2026-01-05', 300), headers=headers).get_json()
+    client.post('/api/workouts/bulk', json=[_workout('2026-01-05', 100), _workout('2026-01-06', 50)], headers=headers)
+    client.post('/api/nutrition', json=_meal('2026-01-05', 380, 13.5), headers=headers)
+    client.post('/api/progress', json={'date': '2026-01-05', 'steps': 8000, 'distance': 6.2}, headers=headers)
+
+    day = _summaries(app, user_id)['2026-01-05']
+    assert (day['workoutCount'], day['caloriesBurned']) == (2, 400)
+    assert (day['nutritionCount'], day['caloriesConsumed'], day['protein']) == (1, 380, 13.5)
+    assert (day['progressCount'], day['steps'], day['distance']) == (1, 8000, 6.2)
+    assert _consistent(app)
+
+    # Moving an entry retracts it from the old day and records it on the new one
+    response = client.put(f"/api/workouts/{first['id']}", json={'date': '2026-01-06', 'caloriesBurned': 200}, headers=headers)
+    assert response.status_code == 200
+    summaries = _summaries(app, user_id)
+    assert summaries['2026-01-05']['caloriesBurned'] == 100
+    assert (summaries['2026-01-06']['workoutCount'], summaries['2026-01-06']['caloriesBurned']) == (2, 250)
+    assert _consistent(app)
+
+def test_deleting_the_last_entry_of_a_day_removes_its_summary(app, client, user):
+    user_id, headers = user
+    workout = client.post('/api/workouts', json=_workout('2026-01-07', 300), headers=headers).get_json()
+    assert '2026-01-07' in _summaries(app, user_id)
+
+    assert client.delete(f"/api/workouts/{workout['id']}", headers=headers).status_code == 200
+
+    assert '2026-01-07' not in _summaries(app, user_id)
+    assert _consistent(app)
+
+def test_rebuild_repairs_drifted_summaries(app, client, user):
+    user_id, headers = user
+    client.post('/api/workouts/bulk', json=[_workout('2026-01-05', 300), _workout('2026-01-06', 120)], headers=headers)
+    client.post('/api/nutrition', json=_meal('2026-01-06', 500, 20), headers=headers)
+    expected = _summaries(app, user_id)
+
+    with app.app_context():
+        DailySummary.query.filter_by(user_id=user_id, date=date(2026, 1, 5)).update({'calories_burned': 999})
+        db.session.add(DailySummary(user_id=user_id, date=date(2026, 1, 9), workout_count=1))
+        db.session.commit()
+        problems = find_inconsistencies(user_id)
+    assert sorted((day.isoformat(), column, stored, want) for _, day, column, stored, want in problems) == [
+        ('2026-01-05', 'calories_burned', 999, 300),
+        ('2026-01-09', 'workout_count', 1, 0),
+    ]
+    assert app.test_cli_runner().invoke(args=['check-rollups']).exit_code == 1
+
+    with app.app_context():
+        assert rebuild_daily_summaries() == 2
+
+    assert _summaries(app, user_id) == expected
+    assert app.test_cli_runner().invoke(args=['check-rollups']).exit_code == 0
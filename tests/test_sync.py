@@ -0,0 +1,56 @@
+WORKOUT = {'exerciseName': 'Rowing', 'exerciseType': 'cardio', 'duration': 20, 'date': '2026-01-05'}
+
+def _sync(client, headers, token='', limit=None):
+    url = f'/api/sync?since={token}' + (f'&limit={limit}' if limit else '')
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+def test_updated_at_matches_what_the_write_returned(client, user):
+    _, headers = user
+    created = client.post('/api/workouts', json=WORKOUT, headers=headers).get_json()
+    updated = client.put(f'/api/workouts/{created["id"]}', json={'duration': 30}, headers=headers).get_json()
+
+    assert client.get('/api/workouts', headers=headers).get_json()[0]['updatedAt'] == updated['updatedAt']
+    assert _sync(client, headers)['workouts'][0]['updatedAt'] == updated['updatedAt']
+
+def test_delta_sync_returns_only_changes_and_deletions(client, user):
+    _, headers = user
+    kept = client.post('/api/workouts', json=WORKOUT, headers=headers).get_json()
+    doomed = client.post('/api/workouts', json=WORKOUT, headers=headers).get_json()
+    token = _sync(client, headers)['token']
+
+    client.put(f'/api/workouts/{kept["id"]}', json={'duration': 45}, headers=headers)
+    client.delete(f'/api/workouts/{doomed["id"]}', headers=headers)
+    entry = client.post('/api/nutrition', json={
+        'foodName': 'Oats', 'calories': 300, 'date': '2026-01-05', 'mealType': 'breakfast'
+    }, headers=headers).get_json()
+    delta = _sync(client, headers, token)
+
+    assert [row['duration'] for row in delta['workouts']] == [45]
+    assert [row['id'] for row in delta['nutrition']] == [entry['id']]
+    assert delta['deleted']['workouts'] == [doomed['id']]
+    assert not delta['hasMore']
+
+    caught_up = _sync(client, headers, delta['token'])
+    assert caught_up['token'] == delta['token']
+    assert caught_up['workouts'] == caught_up['nutrition'] == []
+
+def test_pages_cover_every_row_once(client, user):
+    _, headers = user
+    ids = {client.post('/api/workouts', json=WORKOUT, headers=headers).get_json()['id'] for _ in range(7)}
+    seen = []
+    token = ''
+    while True:
+        page = _sync(client, headers, token, limit=3)
+        seen += [row['id'] for row in page['workouts']]
+        token = page['token']
+        if not page['hasMore']:
+            break
+
+    assert sorted(seen) == sorted(ids)
+
+def test_invalid_arguments_are_rejected(client, user):
+    _, headers = user
+    assert client.get('/api/sync?since=garbage', headers=headers).status_code == 400
+    assert client.get('/api/sync?limit=0', headers=headers).status_code == 400